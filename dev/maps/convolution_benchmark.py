@@ -0,0 +1,70 @@
+"""Benchmark the convolution methods of the `FFTConvolver`.
+
+Measures the run time of the "direct", "fft" and "oa" convolution methods
+for square float32 images and kernels of a range of sizes. The resulting
+table is written in ECSV format and can be used to tune the convolution
+cost model on a given machine::
+
+    from gammapy.maps.convolution import ConvolutionCostModel, FFTConvolver
+
+    cost_model = ConvolutionCostModel.read("convolution-benchmark.ecsv")
+    convolver = FFTConvolver(cost_model=cost_model)
+
+Usage::
+
+    python dev/maps/convolution_benchmark.py [filename]
+"""
+import sys
+import timeit
+import numpy as np
+from astropy.table import Table
+from gammapy.maps.convolution import ConvolutionCostModel, FFTConvolver
+
+image_sizes = [16, 32, 64, 128, 256, 512]
+kernel_sizes = [3, 7, 15, 31, 63]
+n_images = [1, 10]
+
+
+def benchmark_convolution(methods=None, repeat=3):
+    """Measure the run time of the convolution methods.
+
+    Returns a table with columns "method", "image_size", "kernel_size",
+    "n_images" and "time" in seconds, the minimum over ``repeat`` runs.
+    """
+    if methods is None:
+        methods = ConvolutionCostModel().methods
+
+    # no kernel cache, so the kernel FFT is included in the timing
+    convolver = FFTConvolver(cache_size=0)
+    random_state = np.random.RandomState(0)
+
+    rows = []
+    for n in n_images:
+        for image_size in image_sizes:
+            data = random_state.random_sample((n, image_size, image_size))
+            data = data.astype(np.float32)
+            for kernel_size in kernel_sizes:
+                kernel = np.ones((kernel_size, kernel_size), dtype=np.float32)
+                for method in methods:
+                    timer = timeit.Timer(
+                        lambda: convolver.convolve(data, kernel, method=method)
+                    )
+                    time = min(timer.repeat(repeat=repeat, number=1))
+                    rows.append((method, image_size, kernel_size, n, time))
+
+    names = ["method", "image_size", "kernel_size", "n_images", "time"]
+    table = Table(rows=rows, names=names)
+    table["time"].unit = "s"
+    return table
+
+
+def main():
+    filename = sys.argv[1] if len(sys.argv) > 1 else "convolution-benchmark.ecsv"
+    table = benchmark_convolution()
+    table.write(filename, overwrite=True)
+    print(ConvolutionCostModel.from_table(table))
+    print(f"Wrote {filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""Benchmark the compiled summed fit statistics against the NumPy implementations.
+
+Compares ``cash_sum_cython``, ``cstat_sum_cython`` and ``wstat_sum_cython``
+from ``gammapy.stats`` with summing the per bin statistic arrays of ``cash``,
+``cstat`` and ``wstat``, with and without a mask, for a range of array sizes.
+Arrays below the parallel threshold of the compiled kernels (1e5 elements)
+are summed serially, larger ones with OpenMP if the extension was built with
+it. The number of threads can be set with the ``OMP_NUM_THREADS`` environment
+variable.
+
+Usage::
+
+    python dev/stats/fit_statistics_benchmark.py
+"""
+from timeit import Timer
+import numpy as np
+from gammapy import stats
+
+sizes = [int(1e3), int(1e5), int(1e7)]
+
+
+def make_data(size, random_state=0):
+    random_state = np.random.RandomState(random_state)
+    mu_sig = random_state.uniform(0, 5, size)
+    return dict(
+        n_on=random_state.poisson(mu_sig + 1).astype(float),
+        n_off=random_state.poisson(5, size).astype(float),
+        alpha=np.full(size, 0.2),
+        mu_sig=mu_sig,
+        mask=random_state.uniform(size=size) > 0.3,
+    )
+
+
+def numpy_statements(data, masked):
+    mask = data["mask"] if masked else Ellipsis
+    n_on, n_off, alpha, mu_sig = (
+        data["n_on"],
+        data["n_off"],
+        data["alpha"],
+        data["mu_sig"],
+    )
+    return {
+        "cash": lambda: stats.cash(n_on, mu_sig)[mask].sum(),
+        "cstat": lambda: stats.cstat(n_on, mu_sig)[mask].sum(),
+        "wstat": lambda: np.nan_to_num(stats.wstat(n_on, n_off, alpha, mu_sig))[
+            mask
+        ].sum(),
+    }
+
+
+def cython_statements(data, masked):
+    mask = data["mask"] if masked else None
+    n_on, n_off, alpha, mu_sig = (
+        data["n_on"],
+        data["n_off"],
+        data["alpha"],
+        data["mu_sig"],
+    )
+    return {
+        "cash": lambda: stats.cash_sum_cython(n_on, mu_sig, mask=mask),
+        "cstat": lambda: stats.cstat_sum_cython(n_on, mu_sig, mask=mask),
+        "wstat": lambda: stats.wstat_sum_cython(n_on, n_off, alpha, mu_sig, mask=mask),
+    }
+
+
+def best_time(statement, size):
+    number = max(1, int(1e6 / size))
+    timer = Timer(statement)
+    return min(timer.repeat(repeat=5, number=number)) / number
+
+
+def main():
+    print(
+        "{:>6} {:>10} {:>7} {:>12} {:>12} {:>8} {:>10}".format(
+            "stat", "size", "mask", "numpy [ms]", "cython [ms]", "speedup", "rel diff"
+        )
+    )
+    for size in sizes:
+        data = make_data(size)
+        for masked in [False, True]:
+            numpy_ = numpy_statements(data, masked)
+            cython_ = cython_statements(data, masked)
+            for name in ["cash", "cstat", "wstat"]:
+                time_numpy = best_time(numpy_[name], size)
+                time_cython = best_time(cython_[name], size)
+                ref, value = numpy_[name](), cython_[name]()
+                print(
+                    "{:>6} {:>10} {:>7} {:12.4f} {:12.4f} {:8.1f} {:10.1e}".format(
+                        name,
+                        size,
+                        str(masked),
+                        1e3 * time_numpy,
+                        1e3 * time_cython,
+                        time_numpy / time_cython,
+                        abs(value - ref) / abs(ref),
+                    )
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -161,6 +161,8 @@ class GeomConfig(GammapyBaseConfig):
 class DatasetsConfig(GammapyBaseConfig):
     type: ReductionTypeEnum = ReductionTypeEnum.spectrum
     stack: bool = True
+    n_jobs: int = 1
+    cache_dir: Path = None
     geom: GeomConfig = GeomConfig()
     map_selection: List[MapSelectionEnum] = MapDatasetMaker.available_selection
     background: BackgroundConfig = BackgroundConfig()
@@ -1,6 +1,10 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Session class driving the high-level interface API"""
+import hashlib
 import logging
+import os
+from functools import partial
+from multiprocessing import Pool
 import numpy as np
 from astropy import units as u
 from astropy.coordinates import SkyCoord
@@ -9,7 +13,7 @@ from regions import CircleSkyRegion
 import yaml
 from gammapy.analysis.config import AnalysisConfig
 from gammapy.cube import MapDataset, MapDatasetMaker, SafeMaskMaker
-from gammapy.data import DataStore
+from gammapy.data import DataStore, DataStoreObservation
 from gammapy.maps import Map, MapAxis, WcsGeom
 from gammapy.modeling import Datasets, Fit
 from gammapy.modeling.models import SkyModels
@@ -27,6 +31,9 @@ __all__ = ["Analysis"]
 
 log = logging.getLogger(__name__)
 
+# increase when the reduction changes in a way not covered by the cache key
+_CACHE_VERSION = "1"
+
 
 class Analysis:
     """Config-driven high-level analysis interface.
@@ -253,30 +260,47 @@ class Analysis:
         maker_safe_mask = SafeMaskMaker(methods=["offset-max"], offset_max=offset_max)
         stacked = MapDataset.create(geom=geom, name="stacked", **geom_irf)
 
-        if self.config.datasets.stack:
-            for obs in self.observations:
-                log.info(f"Processing observation {obs.obs_id}")
-                cutout = stacked.cutout(obs.pointing_radec, width=2 * offset_max)
-                dataset = maker.run(cutout, obs)
-                dataset = maker_safe_mask.run(dataset, obs)
-                if "background" in self.config.datasets.map_selection:
-                    dataset.background_model.name = f"bkg_{dataset.name}"
-                    # TODO remove this once dataset and model have unique identifiers
-                log.debug(dataset)
-                stacked.stack(dataset)
-            datasets = [stacked]
+        make_dataset = partial(
+            _make_map_dataset,
+            maker=maker,
+            maker_safe_mask=maker_safe_mask,
+            rename_background="background" in self.config.datasets.map_selection,
+            cache_dir=self.config.datasets.cache_dir,
+        )
+        # the cutouts are generated lazily, so only the ones being processed are
+        # kept in memory. Only their geometries are used by the makers.
+        cutouts = (
+            (stacked.cutout(obs.pointing_radec, width=2 * offset_max), obs)
+            for obs in self.observations
+        )
+
+        n_jobs = self.config.datasets.n_jobs
+        if n_jobs > 1:
+            log.info(f"Processing observations in parallel with {n_jobs} processes.")
+            pool = Pool(processes=n_jobs)
+            # imap preserves the order of the observations, so the stacked
+            # result is identical to the one of the serial processing
+            results = pool.imap(make_dataset, cutouts)
         else:
+            pool = None
+            results = map(make_dataset, cutouts)
+
+        try:
             datasets = []
-            for obs in self.observations:
-                log.info(f"Processing observation {obs.obs_id}")
-                cutout = stacked.cutout(obs.pointing_radec, width=2 * offset_max)
-                dataset = maker.run(cutout, obs)
-                dataset = maker_safe_mask.run(dataset, obs)
-                if "background" in self.config.datasets.map_selection:
-                    dataset.background_model.name = f"bkg_{dataset.name}"
-                    # TODO remove this once dataset and model have unique identifiers
+            for dataset in results:
                 log.debug(dataset)
-                datasets.append(dataset)
+                if self.config.datasets.stack:
+                    stacked.stack(dataset)
+                else:
+                    datasets.append(dataset)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        if self.config.datasets.stack:
+            datasets = [stacked]
+
         self.datasets = Datasets(datasets)
 
     def _spectrum_extraction(self):
@@ -342,3 +366,99 @@ class Analysis:
             interp="log",
             node_type="edges",
         )
+
+
+def _make_map_dataset(
+    cutout_observation, maker, maker_safe_mask, rename_background, cache_dir=None
+):
+    """Reduce a single observation to a `MapDataset`.
+
+    Defined at module level, so that it can be sent to worker processes.
+    If ``cache_dir`` is given, the reduced dataset is read from or written
+    to the cache directory, see `_map_dataset_cache_key`.
+    """
+    cutout, observation = cutout_observation
+    name = f"obs_{observation.obs_id}"
+
+    filename = None
+    if cache_dir is not None:
+        key = _map_dataset_cache_key(cutout, observation, maker, maker_safe_mask)
+        if key is not None:
+            filename = make_path(cache_dir) / f"{key}.fits"
+
+    if filename is not None and filename.exists():
+        log.info(f"Reading cached dataset for observation {observation.obs_id}")
+        dataset = MapDataset.read(filename, name=name)
+    else:
+        log.info(f"Processing observation {observation.obs_id}")
+        dataset = maker.run(cutout, observation)
+        dataset = maker_safe_mask.run(dataset, observation)
+
+        if filename is not None:
+            filename.parent.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first, so that concurrent runs
+            # never read a partially written file
+            filename_tmp = filename.with_suffix(f".{os.getpid()}.tmp")
+            dataset.write(filename_tmp, overwrite=True)
+            os.replace(filename_tmp, filename)
+
+    if rename_background:
+        dataset.background_model.name = f"bkg_{dataset.name}"
+        # TODO remove this once dataset and model have unique identifiers
+    return dataset
+
+
+def _map_dataset_cache_key(cutout, observation, maker, maker_safe_mask):
+    """Cache key of the dataset reduced from an observation.
+
+    The key is a hash of the observation ID and index table entry, the size
+    and modification time of the observation files, the options of the makers
+    and the geometries of the cutout. For observations that are not read from
+    a `~gammapy.data.DataStore` no key can be computed and None is returned.
+    """
+    if not isinstance(observation, DataStoreObservation):
+        return None
+
+    data_store = observation.data_store
+    obs_id = observation.obs_id
+
+    items = [_CACHE_VERSION, str(obs_id), str(observation.obs_info)]
+
+    obs_filter = observation.obs_filter
+    items += [repr(obs_filter.time_filter), repr(obs_filter.event_filters)]
+
+    hdu_table = data_store.hdu_table
+    for idx in np.nonzero(hdu_table["OBS_ID"] == obs_id)[0]:
+        location = hdu_table.location_info(idx)
+        path = location.path()
+        stat = path.stat()
+        items += [str(path), location.hdu_name]
+        items += [str(stat.st_size), str(stat.st_mtime_ns)]
+
+    for obj in [maker, maker_safe_mask]:
+        items.append(obj.__class__.__name__)
+        for attr, value in sorted(vars(obj).items()):
+            if isinstance(value, (set, frozenset)):
+                value = sorted(value)
+            items.append(f"{attr}={value!r}")
+
+    maps = [cutout.counts, cutout.exposure]
+    if cutout.psf is not None:
+        maps.append(cutout.psf.psf_map)
+    if cutout.edisp is not None:
+        maps.append(cutout.edisp.edisp_map)
+
+    for m in maps:
+        if m is None:
+            continue
+        geom = m.geom
+        items += [geom.wcs.to_header_string(), repr(geom.npix)]
+        for axis in geom.axes:
+            items += [axis.name, str(axis.unit), axis.interp, repr(list(axis.edges))]
+
+    hash_ = hashlib.sha256()
+    for item in items:
+        hash_.update(item.encode())
+        hash_.update(b"\0")
+
+    return f"obs_{obs_id}_{hash_.hexdigest()[:32]}"
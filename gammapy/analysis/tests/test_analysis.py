@@ -1,7 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from pathlib import Path
 import pytest
-from numpy.testing import assert_allclose
+from numpy.testing import assert_allclose, assert_equal
 import astropy.units as u
 from astropy.coordinates import SkyCoord
 from regions import CircleSkyRegion
@@ -215,6 +215,52 @@ def test_exclusion_region(tmp_path):
     assert len(analysis.datasets) == 2
 
 
+@requires_data()
+def test_analysis_3d_parallel():
+    config = get_example_config("3d")
+    analysis = Analysis(config)
+    analysis.get_observations()
+    analysis.get_datasets()
+    stacked = analysis.datasets["stacked"]
+
+    analysis.config.datasets.n_jobs = 2
+    analysis.get_datasets()
+    stacked_parallel = analysis.datasets["stacked"]
+
+    assert_equal(stacked_parallel.counts.data, stacked.counts.data)
+    assert_equal(stacked_parallel.exposure.data, stacked.exposure.data)
+    assert_equal(
+        stacked_parallel.background_model.map.data, stacked.background_model.map.data
+    )
+    assert_equal(stacked_parallel.psf.psf_map.data, stacked.psf.psf_map.data)
+    assert_equal(stacked_parallel.edisp.edisp_map.data, stacked.edisp.edisp_map.data)
+    assert_equal(stacked_parallel.mask_safe.data, stacked.mask_safe.data)
+
+
+@requires_data()
+def test_analysis_3d_cache(tmp_path):
+    config = get_example_config("3d")
+    config.datasets.stack = False
+    config.datasets.cache_dir = tmp_path
+    analysis = Analysis(config)
+    analysis.get_observations()
+    analysis.get_datasets()
+    datasets = analysis.datasets
+
+    assert len(list(tmp_path.glob("obs_*.fits"))) == len(datasets)
+
+    analysis.get_datasets()
+
+    for dataset, cached in zip(datasets, analysis.datasets):
+        assert cached.name == dataset.name
+        assert cached.background_model.name == dataset.background_model.name
+        assert_equal(cached.counts.data, dataset.counts.data)
+        assert_equal(cached.exposure.data, dataset.exposure.data)
+        assert_equal(cached.psf.psf_map.data, dataset.psf.psf_map.data)
+        assert_equal(cached.edisp.edisp_map.data, dataset.edisp.edisp_map.data)
+        assert_equal(cached.mask_safe.data, dataset.mask_safe.data)
+
+
 @requires_dependency("iminuit")
 @requires_data()
 def test_analysis_1d_stacked():
@@ -30,6 +30,7 @@ def test_config_default_types():
     assert isinstance(config.datasets.geom.axes.energy_true.max, Quantity)
     assert isinstance(config.fit.fit_range.min, Quantity)
     assert isinstance(config.fit.fit_range.max, Quantity)
+    assert config.datasets.n_jobs == 1
 
 
 def test_config_not_default_types():
@@ -1,22 +1,30 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import numpy as np
-from astropy.coordinates import SkyOffsetFrame
-from gammapy.data import FixedPointingInfo
+from astropy.coordinates import AltAz, EarthLocation, SkyCoord, SkyOffsetFrame
+from astropy.time import Time
+from astropy.units import Quantity
+from gammapy.data import FixedPointingInfo, PointingInfo
 from gammapy.maps import WcsNDMap
 from gammapy.utils.coordinates import sky_to_fov
+from .utils import _evaluate_grouped, _split_chunks
 
-__all__ = ["make_map_background_irf"]
+__all__ = ["make_map_background_irf", "make_maps_background_irf"]
 
 
-def make_map_background_irf(pointing, ontime, bkg, geom, oversampling=None):
+def make_map_background_irf(
+    pointing, ontime, bkg, geom, oversampling=None, n_time_bins=1
+):
     """Compute background map from background IRFs.
 
     Parameters
     ----------
-    pointing : `~gammapy.data.FixedPointingInfo` or `~astropy.coordinates.SkyCoord`
+    pointing : `~gammapy.data.FixedPointingInfo`, `~gammapy.data.PointingInfo` or `~astropy.coordinates.SkyCoord`
         Observation pointing
 
         - If a ``FixedPointingInfo`` is passed, FOV coordinates are properly computed.
+        - If a ``PointingInfo`` is passed, the pointing is interpolated from the
+          pointing table, which takes into account that the pointing might change
+          slightly over the observation duration.
         - If a ``SkyCoord`` is passed, FOV frame rotation is not taken into account.
     ontime : `~astropy.units.Quantity`
         Observation ontime. i.e. not corrected for deadtime
@@ -27,21 +35,16 @@ def make_map_background_irf(pointing, ontime, bkg, geom, oversampling=None):
         Reference geometry
     oversampling: int
         Oversampling factor in energy, used for the background model evaluation.
+    n_time_bins : int
+        Number of equal time intervals of the observation, for which the
+        background IRF is evaluated and averaged. This handles the rotation
+        of the FoV during the observation. Not used if a ``SkyCoord`` is passed.
 
     Returns
     -------
     background : `~gammapy.maps.WcsNDMap`
         Background predicted counts sky cube in reco energy
     """
-    # TODO:
-    #  This implementation can be improved in two ways:
-    #  1. Create equal time intervals between TSTART and TSTOP and sum up the
-    #  background IRF for each interval. This is instead of multiplying by
-    #  the total ontime. This then handles the rotation of the FoV.
-    #  2. Use the pointing table (does not currently exist in CTA files) to
-    #  obtain the RA DEC and time for each interval. This then considers that
-    #  the pointing might change slightly over the observation duration
-
     # Get altaz coords for map
     if oversampling is not None:
         geom = geom.upsample(factor=oversampling, axis="energy")
@@ -49,27 +52,26 @@ def make_map_background_irf(pointing, ontime, bkg, geom, oversampling=None):
     map_coord = geom.to_image().get_coord()
     sky_coord = map_coord.skycoord
 
-    if isinstance(pointing, FixedPointingInfo):
-        altaz_coord = sky_coord.transform_to(pointing.altaz_frame)
-
-        # Compute FOV coordinates of map relative to pointing
-        fov_lon, fov_lat = sky_to_fov(
-            altaz_coord.az, altaz_coord.alt, pointing.altaz.az, pointing.altaz.alt
-        )
+    if isinstance(pointing, PointingInfo):
+        time_min, time_max = pointing.time[0], pointing.time[-1]
+        time = time_min + (time_max - time_min) * _time_bin_centers(n_time_bins)
+        pointing_altaz = pointing.altaz_interpolate(time)
+        fov_lon, fov_lat = _altaz_fov_coordinates(sky_coord, pointing_altaz)
     else:
-        # Create OffsetFrame
-        frame = SkyOffsetFrame(origin=pointing)
-        pseudo_fov_coord = sky_coord.transform_to(frame)
-        fov_lon = pseudo_fov_coord.lon
-        fov_lat = pseudo_fov_coord.lat
+        # without FoV rotation a single time bin is sufficient
+        n_bins = n_time_bins if isinstance(pointing, FixedPointingInfo) else 1
+        fov_lon, fov_lat = _fov_coordinates(sky_coord, [pointing], n_bins)
+        fov_lon, fov_lat = fov_lon[0], fov_lat[0]
 
     energies = geom.get_axis_by_name("energy").edges
 
     bkg_de = bkg.evaluate_integrate(
         fov_lon=fov_lon,
         fov_lat=fov_lat,
-        energy_reco=energies[:, np.newaxis, np.newaxis],
+        energy_reco=energies[:, np.newaxis, np.newaxis, np.newaxis],
     )
+    # all time bins have the same duration
+    bkg_de = bkg_de.mean(axis=1)
 
     d_omega = geom.to_image().solid_angle()
     data = (bkg_de * d_omega * ontime).to_value("")
@@ -79,3 +81,191 @@ def make_map_background_irf(pointing, ontime, bkg, geom, oversampling=None):
         bkg_map = bkg_map.downsample(factor=oversampling, axis="energy")
 
     return bkg_map
+
+
+def make_maps_background_irf(
+    observations, geom, stack=False, oversampling=None, n_time_bins=1, chunk_size=10
+):
+    """Compute background maps for a set of observations on a shared geometry.
+
+    Gives the same result as calling `make_map_background_irf` for every
+    observation, but the sky coordinate grid and solid angles are computed
+    once, and the FoV coordinates of all observations of a chunk are
+    computed in a single vectorised coordinate transformation.
+
+    Parameters
+    ----------
+    observations : `~gammapy.data.Observations`
+        Observations
+    geom : `~gammapy.maps.WcsGeom`
+        Reference geometry
+    stack : bool
+        Return the sum of the maps instead of one map per observation.
+    oversampling: int
+        Oversampling factor in energy, used for the background model evaluation.
+    n_time_bins : int
+        Number of equal time intervals per observation, see `make_map_background_irf`.
+    chunk_size : int
+        Number of observations processed together, limits the memory usage.
+
+    Returns
+    -------
+    background : `~gammapy.maps.WcsNDMap` or list of `~gammapy.maps.WcsNDMap`
+        Background predicted counts sky cube(s) in reco energy, an empty map
+        if ``stack=True`` and there are no observations.
+    """
+    geom_reco = geom
+    if oversampling is not None:
+        geom = geom.upsample(factor=oversampling, axis="energy")
+
+    sky_coord = geom.to_image().get_coord().skycoord
+    d_omega = geom.to_image().solid_angle()
+    energies = geom.get_axis_by_name("energy").edges
+
+    maps = []
+    for chunk in _split_chunks(observations, chunk_size):
+        pointings = [_get_background_pointing(obs) for obs in chunk]
+        # without FoV rotation a single time bin is sufficient
+        is_fixed = [isinstance(_, FixedPointingInfo) for _ in pointings]
+        n_bins = n_time_bins if any(is_fixed) else 1
+        fov_lon, fov_lat = _fov_coordinates(sky_coord, pointings, n_bins)
+
+        def evaluate(bkg, idx):
+            bkg_de = bkg.evaluate_integrate(
+                fov_lon=fov_lon[idx],
+                fov_lat=fov_lat[idx],
+                energy_reco=energies[(slice(None),) + (np.newaxis,) * 4],
+            )
+            return bkg_de.mean(axis=2)
+
+        bkgs_de = _evaluate_grouped([obs.bkg for obs in chunk], evaluate)
+
+        for bkg_de, obs in zip(bkgs_de, chunk):
+            ontime = obs.observation_time_duration
+            data = (bkg_de * d_omega * ontime).to_value("")
+            bkg_map = WcsNDMap(geom, data=data)
+
+            if oversampling is not None:
+                bkg_map = bkg_map.downsample(factor=oversampling, axis="energy")
+
+            if stack and maps:
+                maps[0].data += bkg_map.data
+            else:
+                maps.append(bkg_map)
+
+    if stack and not maps:
+        return WcsNDMap(geom_reco)
+
+    return maps[0] if stack else maps
+
+
+def _get_background_pointing(observation):
+    """Pointing used for the background evaluation of an observation."""
+    bkg_coordsys = observation.bkg.meta.get("FOVALIGN", "RADEC")
+
+    if bkg_coordsys == "ALTAZ":
+        return observation.fixed_pointing_info
+    elif bkg_coordsys == "RADEC":
+        return observation.pointing_radec
+    else:
+        raise ValueError(
+            f"Invalid background coordinate system: {bkg_coordsys!r}\n"
+            "Options: ALTAZ, RADEC"
+        )
+
+
+def _time_bin_centers(n_time_bins):
+    """Centers of equal time bins, in units of the observation duration."""
+    return (np.arange(n_time_bins) + 0.5) / n_time_bins
+
+
+def _fov_coordinates(sky_coord, pointings, n_time_bins=1):
+    """Compute FoV coordinates of a sky coordinate grid for several pointings.
+
+    All pointings of the same type and all time bins are handled in one
+    vectorised coordinate transformation.
+
+    Parameters
+    ----------
+    sky_coord : `~astropy.coordinates.SkyCoord`
+        Sky coordinate grid
+    pointings : list
+        List of `~gammapy.data.FixedPointingInfo` or `~astropy.coordinates.SkyCoord`,
+        see `make_map_background_irf`.
+    n_time_bins : int
+        Number of equal time bins per observation, for ``FixedPointingInfo``.
+
+    Returns
+    -------
+    fov_lon, fov_lat : `~astropy.units.Quantity`
+        FoV coordinates with shape ``(len(pointings), n_time_bins) + sky_coord.shape``
+    """
+    shape = (len(pointings), n_time_bins) + sky_coord.shape
+    fov_lon = Quantity(np.empty(shape), "deg")
+    fov_lat = Quantity(np.empty(shape), "deg")
+
+    is_fixed = np.array([isinstance(_, FixedPointingInfo) for _ in pointings])
+    fixed = [p for p, _ in zip(pointings, is_fixed) if _]
+    radec = [p for p, _ in zip(pointings, is_fixed) if not _]
+
+    if fixed:
+        locations = [p.location for p in fixed]
+        location = EarthLocation.from_geocentric(
+            *[Quantity([getattr(_, name) for _ in locations]) for name in "xyz"]
+        )
+        time_start = Time([p.time_start for p in fixed])
+        duration = Time([p.time_stop for p in fixed]) - time_start
+        obstime = time_start[:, np.newaxis] + duration[:, np.newaxis] * (
+            _time_bin_centers(n_time_bins)
+        )
+
+        frame = AltAz(obstime=obstime, location=location[:, np.newaxis])
+        pointing_altaz = SkyCoord([p.radec for p in fixed])[:, np.newaxis]
+        pointing_altaz = pointing_altaz.transform_to(frame)
+
+        fov_lon[is_fixed], fov_lat[is_fixed] = _altaz_fov_coordinates(
+            sky_coord, pointing_altaz
+        )
+
+    if radec:
+        expand = (Ellipsis,) + (np.newaxis,) * (sky_coord.ndim + 1)
+        frame = SkyOffsetFrame(origin=SkyCoord(radec)[expand])
+        pseudo_fov_coord = sky_coord.transform_to(frame)
+        fov_lon[~is_fixed] = pseudo_fov_coord.lon
+        fov_lat[~is_fixed] = pseudo_fov_coord.lat
+
+    return fov_lon, fov_lat
+
+
+def _altaz_fov_coordinates(sky_coord, pointing_altaz):
+    """Compute FoV coordinates of a sky coordinate grid for AltAz pointings.
+
+    Parameters
+    ----------
+    sky_coord : `~astropy.coordinates.SkyCoord`
+        Sky coordinate grid
+    pointing_altaz : `~astropy.coordinates.SkyCoord`
+        Pointings in an `~astropy.coordinates.AltAz` frame, with array
+        ``obstime`` and ``location`` of the same shape or scalar.
+
+    Returns
+    -------
+    fov_lon, fov_lat : `~astropy.units.Quantity`
+        FoV coordinates with shape ``pointing_altaz.shape + sky_coord.shape``
+    """
+    expand = (Ellipsis,) + (np.newaxis,) * sky_coord.ndim
+
+    obstime = pointing_altaz.obstime
+    location = pointing_altaz.location
+    if obstime.shape:
+        obstime = obstime[expand]
+    if location.shape:
+        location = location[expand]
+
+    altaz_coord = sky_coord.transform_to(AltAz(obstime=obstime, location=location))
+    return sky_to_fov(
+        altaz_coord.az,
+        altaz_coord.alt,
+        pointing_altaz.az[expand],
+        pointing_altaz.alt[expand],
+    )
@@ -4,8 +4,11 @@ import numpy as np
 import astropy.io.fits as fits
 import astropy.units as u
 from gammapy.irf import EDispKernel
+from gammapy.irf.energy_dispersion import _integrate_migra
 from gammapy.maps import Map, MapCoord, WcsGeom
+from gammapy.utils.cache import LRUCache
 from gammapy.utils.random import InverseCDFSampler, get_random_state
+from .psf_map import _quantize_position
 
 __all__ = ["make_edisp_map", "EDispMap"]
 
@@ -67,6 +70,11 @@ class EDispMap:
     exposure_map : `~gammapy.maps.Map`, optional
         Associated exposure map. Needs to have a consistent map geometry.
 
+    Attributes
+    ----------
+    kernel_cache : `~gammapy.utils.cache.LRUCache`
+        Cache of the energy dispersion kernels, see `get_edisp_kernel`.
+
     Examples
     --------
     ::
@@ -120,6 +128,7 @@ class EDispMap:
 
         self.edisp_map = edisp_map
         self.exposure_map = exposure_map
+        self.kernel_cache = LRUCache(max_size=64)
 
     @classmethod
     def from_hdulist(
@@ -196,9 +205,16 @@ class EDispMap:
         hdulist = self.to_hdulist(**kwargs)
         hdulist.writeto(filename, overwrite=overwrite)
 
-    def get_edisp_kernel(self, position, e_reco, migra_step=5e-3):
+    def get_edisp_kernel(
+        self, position, e_reco, migra_step=5e-3, position_tolerance=None
+    ):
         """Get energy dispersion at a given position.
 
+        The position is quantised and the kernel is computed at the quantised
+        position. Kernels are cached in `kernel_cache`, so that models at
+        nearby positions share the same kernel. The cached kernels are shared
+        and should be treated as read-only.
+
         Parameters
         ----------
         position : `~astropy.coordinates.SkyCoord`
@@ -207,18 +223,33 @@ class EDispMap:
             Reconstructed energy axis binning
         migra_step : float
             Integration step in migration
+        position_tolerance : `~astropy.coordinates.Angle`
+            Step of the lon / lat grid the position is quantised to. By default
+            the position is quantised to the center of the EDisp map pixel.
+            Use 0 deg to compute the kernel at the exact position.
 
         Returns
         -------
         edisp : `~gammapy.irf.EnergyDispersion`
             the energy dispersion (i.e. rmf object)
         """
-        # TODO: reduce code duplication with EnergyDispersion2D.get_response
         if position.size != 1:
             raise ValueError(
                 "EnergyDispersion can be extracted at one single position only."
             )
 
+        key, position = _quantize_position(
+            self.edisp_map.geom, position, position_tolerance
+        )
+        e_reco = u.Quantity(e_reco)
+        key += (e_reco.to_value("TeV").tobytes(), migra_step)
+
+        def compute():
+            return self._get_edisp_kernel(position, e_reco, migra_step)
+
+        return self.kernel_cache.get(key, compute)
+
+    def _get_edisp_kernel(self, position, e_reco, migra_step):
         # axes ordering fixed. Could be changed.
         pix_ener = np.arange(self.edisp_map.geom.axes[1].nbin)
 
@@ -234,36 +265,15 @@ class EDispMap:
         # Build the pixels tuple
         pix = np.meshgrid(pix_lon, pix_lat, pix_migra, pix_ener)
         # Interpolate in the EDisp map. Squeeze to remove dimensions of length 1
-        edisp_values = self.edisp_map.interp_by_pix(pix) * u.Unit(self.edisp_map.unit)
+        edisp_values = self.edisp_map.interp_by_pix(pix)
         edisp_values = np.squeeze(edisp_values, axis=(0, 1))
 
+        # Integrate over migra for all true energies at once, migra is the last axis
         e_trues = self.edisp_map.geom.axes[1].center
-        data = []
+        migra_e_reco = (e_reco / e_trues[:, np.newaxis]).to_value("")
+        mig_array = u.Quantity(mig_array).to_value("")
+        data = _integrate_migra(edisp_values.T, mig_array, migra_e_reco)
 
-        for i, e_true in enumerate(e_trues):
-            # We now perform integration over migra
-            # The code is adapted from `~gammapy.EnergyDispersion2D.get_response`
-
-            # migration value of e_reco bounds
-            migra_e_reco = e_reco / e_true
-
-            # Compute normalized cumulative sum to prepare integration
-            tmp = np.nan_to_num(
-                np.cumsum(edisp_values[:, i]) / np.sum(edisp_values[:, i])
-            )
-
-            # Determine positions (bin indices) of e_reco bounds in migration array
-            pos_mig = np.digitize(migra_e_reco, mig_array) - 1
-            # We ensure that no negative values are found
-            pos_mig = np.maximum(pos_mig, 0)
-
-            # We compute the difference between 2 successive bounds in e_reco
-            # to get integral over reco energy bin
-            integral = np.diff(tmp[pos_mig])
-
-            data.append(integral)
-
-        data = np.asarray(data)
         # EnergyDispersion uses edges of true energy bins
         e_true_edges = self.edisp_map.geom.axes[1].edges
 
@@ -308,6 +318,8 @@ class EDispMap:
             self.edisp_map.data[parent_slices] /= self.exposure_map.data[parent_slices]
             self.edisp_map.data = np.nan_to_num(self.edisp_map.data)
 
+        self.kernel_cache.clear()
+
     def copy(self):
         """Copy EDispMap"""
         return deepcopy(self)
@@ -1,9 +1,11 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import numpy as np
+from astropy.coordinates import SkyCoord
 from gammapy.maps import WcsNDMap
 from gammapy.modeling.models import PowerLawSpectralModel
+from .utils import _evaluate_grouped, _split_chunks
 
-__all__ = ["make_map_exposure_true_energy"]
+__all__ = ["make_map_exposure_true_energy", "make_maps_exposure_true_energy"]
 
 
 def make_map_exposure_true_energy(pointing, livetime, aeff, geom):
@@ -44,6 +46,67 @@ def make_map_exposure_true_energy(pointing, livetime, aeff, geom):
     return WcsNDMap(geom, exposure.value.reshape(geom.data_shape), unit=exposure.unit)
 
 
+def make_maps_exposure_true_energy(observations, geom, stack=False, chunk_size=10):
+    """Compute exposure maps for a set of observations on a shared geometry.
+
+    Gives the same result as calling `make_map_exposure_true_energy` for
+    every observation, but the offsets of all observations of a chunk are
+    computed in one vectorised pass over the shared sky coordinate grid,
+    and observations sharing the same effective area are evaluated together.
+
+    Parameters
+    ----------
+    observations : `~gammapy.data.Observations`
+        Observations
+    geom : `~gammapy.maps.WcsGeom`
+        Map geometry (must have an energy axis)
+    stack : bool
+        Return the sum of the maps instead of one map per observation.
+    chunk_size : int
+        Number of observations processed together, limits the memory usage.
+
+    Returns
+    -------
+    map : `~gammapy.maps.WcsNDMap` or list of `~gammapy.maps.WcsNDMap`
+        Exposure map(s), an empty map if ``stack=True`` and there are no
+        observations.
+    """
+    sky_coord = geom.to_image().get_coord().skycoord
+    energy = geom.get_axis_by_name("energy").center
+
+    maps = []
+    for chunk in _split_chunks(observations, chunk_size):
+        pointings = SkyCoord([obs.pointing_radec for obs in chunk])
+        offsets = pointings[:, np.newaxis, np.newaxis].separation(sky_coord)
+
+        def evaluate(aeff, idx):
+            exposure = aeff.data.evaluate(
+                offset=offsets[idx],
+                energy=energy[:, np.newaxis, np.newaxis, np.newaxis],
+            )
+            # IRF axes with a single node are dropped by the interpolation
+            shape = energy.shape + offsets[idx].shape
+            return np.broadcast_to(exposure, shape, subok=True)
+
+        exposures = _evaluate_grouped([obs.aeff for obs in chunk], evaluate)
+
+        for exposure, obs in zip(exposures, chunk):
+            livetime = obs.observation_live_time_duration
+            exposure = (exposure * livetime).to("m2 s")
+            data = exposure.value.reshape(geom.data_shape)
+            exposure_map = WcsNDMap(geom, data, unit=exposure.unit)
+
+            if stack and maps:
+                maps[0].data += exposure_map.data
+            else:
+                maps.append(exposure_map)
+
+    if stack and not maps:
+        return WcsNDMap(geom, unit="m2 s")
+
+    return maps[0] if stack else maps
+
+
 def _map_spectrum_weight(map, spectrum=None):
     """Weight a map with a spectrum.
 
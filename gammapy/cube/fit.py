@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import logging
+import zlib
 import numpy as np
 import astropy.units as u
 from astropy.io import fits
@@ -12,12 +13,23 @@ from gammapy.cube.psf_kernel import PSFKernel
 from gammapy.cube.psf_map import PSFMap
 from gammapy.data import GTI
 from gammapy.irf import EffectiveAreaTable, EDispKernel
-from gammapy.maps import Map, MapAxis
+from gammapy.maps import Map, MapAxis, WcsSparseMap
 from gammapy.modeling import Dataset, Parameters
 from gammapy.modeling.models import BackgroundModel, SkyModel, SkyModels
-from gammapy.modeling.parameter import _get_parameters_str
+from gammapy.modeling.parameter import (
+    _get_parameters_str,
+    _linear_coefficients,
+    _numerical_derivative,
+)
 from gammapy.spectrum import SpectrumDataset, SpectrumDatasetOnOff
-from gammapy.stats import cash, cash_sum_cython, wstat
+from gammapy.stats import (
+    cash,
+    cash_derivative,
+    cash_sum_cython,
+    wstat,
+    wstat_derivative,
+    wstat_sum_cython,
+)
 from gammapy.utils.random import get_random_state
 from gammapy.utils.scripts import make_path
 from .exposure import _map_spectrum_weight
@@ -273,9 +285,15 @@ class MapDataset(Dataset):
     def npred(self):
         """Predicted source and background counts (`~gammapy.maps.Map`)."""
         npred_total = Map.from_geom(self._geom, dtype=float)
+        self._fill_npred(npred_total)
+        return npred_total
 
+    def _fill_npred(self, npred_total):
+        """Sum predicted counts in-place into the map ``npred_total``."""
         if self.background_model:
-            npred_total += self.background_model.evaluate()
+            npred_total.data[...] = self.background_model.evaluate().data
+        else:
+            npred_total.data.fill(0)
 
         if self.models:
             for evaluator in self._evaluators:
@@ -288,8 +306,6 @@ class MapDataset(Dataset):
                     npred = evaluator.compute_npred()
                     npred_total.stack(npred)
 
-        return npred_total
-
     @classmethod
     def from_geoms(
         cls,
@@ -471,6 +487,10 @@ class MapDataset(Dataset):
         if self.gti and other.gti:
             self.gti = self.gti.stack(other.gti).union()
 
+        # the IRFs were modified in place, so the cached model evaluations
+        # are outdated
+        self._make_evaluators()
+
     @staticmethod
     def _mask_safe_irf(irf_map, mask):
         geom = irf_map.geom.to_image()
@@ -594,17 +614,95 @@ class MapDataset(Dataset):
         return ax_image, ax_spec
 
     @lazyproperty
-    def _counts_data(self):
-        return self.counts.data.astype(float)
+    def _fit_indices_cache(self):
+        return _EvaluationCache()
+
+    @property
+    def _fit_indices(self):
+        """Flat indices of the fit region and of its bins with counts (`_FitIndices`).
+
+        Re-computed if ``counts``, ``mask_fit`` or ``mask_safe`` are replaced
+        or their data is modified in place, which is detected with a checksum.
+        """
+        inputs = (self.counts, self.mask_fit, self.mask_safe)
+        return self._fit_indices_cache.get(
+            inputs,
+            parameters=[],
+            compute=self._compute_fit_indices,
+            versions=[_checksum(_) for _ in inputs],
+        )
+
+    def _compute_fit_indices(self):
+        if isinstance(self.counts, WcsSparseMap):
+            idx, counts = self.counts.get_flat_nonzero()
+        else:
+            counts = self.counts.data.ravel()
+            idx = np.flatnonzero(counts)
+            counts = counts[idx]
+
+        mask = self.mask
+        if mask is not None:
+            mask = mask.ravel()
+            idx_fit = np.flatnonzero(mask)
+            selected = mask[idx]
+            idx, counts = idx[selected], counts[selected]
+        else:
+            idx_fit = None
+
+        return _FitIndices(self._geom, idx_fit, idx, counts)
 
     def stat_sum(self):
         """Total likelihood given the current model parameters."""
-        counts, npred = self._counts_data, self.npred().data
+        fit_indices = self._fit_indices
+        npred = fit_indices.npred
+        self._fill_npred(npred)
+
+        npred_fit, npred_counts = fit_indices.take(npred.data)
+
+        # the Cash statistic is zero for npred <= 0 or NaN, bins without
+        # counts contribute 2 * npred
+        npred_fit = np.where(npred_fit > 0, npred_fit, 0)
+        npred_counts = np.where(npred_counts > 0, npred_counts, 0)
+        npred_sum = np.sum(npred_fit) - np.sum(npred_counts)
+        return cash_sum_cython(fit_indices.counts, npred_counts) + 2 * npred_sum
+
+    def _stat_sum_norm_batch(self, parameter, values):
+        mask = slice(None) if self.mask is None else self.mask
+        offset, slope = _linear_coefficients(lambda: self.npred().data[mask], parameter)
+        counts = self.counts.data[mask].ravel()
+
+        def stat(npred):
+            return np.sum(cash(n_on=counts, mu_on=npred), axis=-1)
+
+        return self._stat_sum_linear(stat, offset, slope, values)
+
+    def _stat_sum_derivatives(self):
+        dstat = cash_derivative(n_on=self.counts.data, mu_on=self.npred().data)
+        return self._npred_derivatives_sum(dstat)
 
+    def _npred_derivatives_sum(self, dstat):
+        """Sum of the statistic derivatives times the npred derivatives.
+
+        Must be called after `npred`, which updates the model evaluators.
+        """
         if self.mask is not None:
-            return cash_sum_cython(counts[self.mask.data], npred[self.mask.data])
-        else:
-            return cash_sum_cython(counts.ravel(), npred.ravel())
+            dstat = np.where(self.mask, dstat, 0)
+
+        derivatives = {}
+
+        if self.background_model:
+            for par, value in self.background_model.derivatives().items():
+                derivatives[par] = np.sum(dstat * value.data)
+
+        for evaluator in self._evaluators:
+            if not evaluator.contributes:
+                continue
+
+            for par, value in evaluator.compute_npred_derivatives().items():
+                derivative = _sum_product(self._geom, dstat, value)
+                derivatives[par] = derivatives.get(par, 0) + derivative
+
+        return derivatives
 
     def fake(self, random_state="random-seed"):
         """Simulate fake counts for the current model and reduced IRFs.
@@ -1246,7 +1344,35 @@ class MapDatasetOnOff(MapDataset):
 
     def stat_sum(self):
         """Total likelihood given the current model parameters."""
-        return Dataset.stat_sum(self)
+        return wstat_sum_cython(
+            n_on=self.counts.data,
+            n_off=self.counts_off.data,
+            alpha=self.alpha.data,
+            mu_sig=self.npred().data,
+            mask=self.mask,
+        )
+
+    def _stat_sum_norm_batch(self, parameter, values):
+        mask = slice(None) if self.mask is None else self.mask
+        offset, slope = _linear_coefficients(lambda: self.npred().data[mask], parameter)
+        n_on = self.counts.data[mask].ravel()
+        n_off = self.counts_off.data[mask].ravel()
+        alpha = self.alpha.data[mask].ravel()
+
+        def stat(mu_sig):
+            stat = wstat(n_on=n_on, n_off=n_off, alpha=alpha, mu_sig=mu_sig)
+            return np.sum(np.nan_to_num(stat), axis=-1)
+
+        return self._stat_sum_linear(stat, offset, slope, values)
+
+    def _stat_sum_derivatives(self):
+        dstat = wstat_derivative(
+            n_on=self.counts.data,
+            n_off=self.counts_off.data,
+            alpha=self.alpha.data,
+            mu_sig=self.npred().data,
+        )
+        return self._npred_derivatives_sum(np.nan_to_num(dstat))
 
     def fake(self, background_model, random_state="random-seed"):
         """Simulate fake counts (on and off) for the current model and reduced IRFs.
@@ -1464,6 +1590,23 @@ class MapEvaluator:
         Energy dispersion
     evaluation_mode : {"local", "global"}
         Model evaluation mode.
+
+    Notes
+    -----
+    The predicted counts are cached and only re-computed if one of the model
+    parameters changed since the previous call, so model components that are
+    frozen or unchanged during a fit are evaluated only once.
+
+    For a `~gammapy.modeling.models.SkyModel` with a spatial component the
+    spatial template, i.e. the spatial model times the exposure and bin volume,
+    convolved with the PSF, is cached as well. As long as the spatial
+    parameters do not change, e.g. when only spectral parameters are fitted,
+    `compute_npred` only re-weights the cached template with the spectral
+    model and applies the energy dispersion.
+
+    Both caches are reset by `update`. They are also invalidated if the
+    exposure, PSF or energy dispersion attribute is replaced, but not by
+    in-place modifications of their data.
     """
 
     def __init__(
@@ -1474,6 +1617,8 @@ class MapEvaluator:
         self.psf = psf
         self.edisp = edisp
         self.contributes = True
+        self._npred_cache = _EvaluationCache()
+        self._spatial_template_cache = _EvaluationCache()
 
         if evaluation_mode not in {"local", "global"}:
             raise ValueError(f"Invalid evaluation_mode: {evaluation_mode!r}")
@@ -1511,6 +1656,9 @@ class MapEvaluator:
             Counts geom
         """
         log.debug("Updating model evaluator")
+        self._npred_cache.clear()
+        self._spatial_template_cache.clear()
+
         # cache current position of the model component
 
         if isinstance(edisp, EDispMap):
@@ -1595,16 +1743,265 @@ class MapEvaluator:
         """
         Evaluate model predicted counts.
 
+        The returned map is cached and must not be modified in place.
+
         Returns
         -------
         npred : `~gammapy.maps.Map`
             Predicted counts on the map (in reco energy bins)
         """
-        flux = self.compute_flux()
-        npred = self.apply_exposure(flux)
-        if self.psf is not None:
-            npred = self.apply_psf(npred)
+        return self._npred_cache.get(
+            inputs=(self.model, self.exposure, self.psf, self.edisp),
+            parameters=self.model.parameters,
+            compute=self._compute_npred,
+        )
+
+    def _compute_npred(self):
+        npred = None
+        if self._is_factorised:
+            npred = self._compute_npred_factorised()
+
+        if npred is None:
+            flux = self.compute_flux()
+            npred = self.apply_exposure(flux)
+            if self.psf is not None:
+                npred = self.apply_psf(npred)
+
         if self.edisp is not None:
             npred = self.apply_edisp(npred)
 
         return npred
+
+    def compute_npred_derivatives(self):
+        """Evaluate derivatives of the model predicted counts.
+
+        For a `~gammapy.modeling.models.SkyModel` with a spatial component the
+        derivatives of the spectral and spatial model are propagated through
+        exposure, PSF and energy dispersion. Otherwise they are computed by
+        finite differences of the predicted counts.
+
+        Returns
+        -------
+        derivatives : dict of `~gammapy.maps.Map`
+            Derivative of the predicted counts (in reco energy bins) per free
+            `~gammapy.modeling.Parameter`, per unit of the parameter.
+        """
+        derivatives = None
+        if self._is_factorised:
+            derivatives = self._compute_npred_derivatives_factorised()
+
+        if derivatives is None:
+            geom = self.compute_npred().geom
+            derivatives = {}
+            for par in self.model.parameters.free_parameters:
+                data = _numerical_derivative(lambda: self._compute_npred().data, par)
+                derivatives[par] = Map.from_geom(geom, data=data, unit="")
+
+        return derivatives
+
+    @property
+    def _is_factorised(self):
+        return isinstance(self.model, SkyModel) and self.model.spatial_model is not None
+
+    def _compute_npred_factorised(self):
+        """Compute npred in true energy from the cached spatial template.
+
+        Returns None if the spectral model is negative somewhere, because then
+        the clipping of the PSF convolved cube does not commute with the
+        spectral weighting.
+        """
+        energy = self.geom.get_axis_by_name("energy").center
+        spectrum = self.model.spectral_model(energy)
+
+        if np.any(spectrum.value < 0):
+            return None
+
+        template = self._get_spatial_template()
+        scale = (spectrum.unit * template.unit).to("")
+        weights = scale * spectrum.value
+        data = weights[:, np.newaxis, np.newaxis] * template.data
+        return Map.from_geom(self.geom, data=data, unit="")
+
+    def _compute_npred_derivatives_factorised(self):
+        """Compute npred derivatives from the spatial template and its derivatives.
+
+        Returns None in the same cases as `_compute_npred_factorised`.
+        """
+        energy = self.geom.get_axis_by_name("energy").center
+        spectral_model = self.model.spectral_model
+        spectrum = spectral_model(energy)
+
+        if np.any(spectrum.value < 0):
+            return None
+
+        template = self._get_spatial_template()
+
+        derivatives = {}
+        for par, value in spectral_model.derivatives(energy).items():
+            scale = (value.unit * par.unit * template.unit).to("")
+            weights = scale * value.value
+            derivatives[par] = weights[:, np.newaxis, np.newaxis] * template.data
+
+        for par, value in self._compute_spatial_template_derivatives().items():
+            scale = (spectrum.unit * value.unit).to("")
+            weights = scale * spectrum.value
+            data = weights[:, np.newaxis, np.newaxis] * value.data
+            derivatives[par] = derivatives.get(par, 0) + data
+
+        npred_derivatives = {}
+        for par, data in derivatives.items():
+            npred = Map.from_geom(self.geom, data=data, unit="")
+            if self.edisp is not None:
+                npred = self.apply_edisp(npred)
+            npred_derivatives[par] = npred
+
+        return npred_derivatives
+
+    def _get_spatial_template(self):
+        spatial_model = self.model.spatial_model
+        return self._spatial_template_cache.get(
+            inputs=(spatial_model, self.exposure, self.psf),
+            parameters=spatial_model.parameters,
+            compute=self._compute_spatial_template,
+        )
+
+    def _compute_spatial_template(self):
+        """Spatial model times exposure and bin volume, convolved with the PSF."""
+        geom = self.geom
+        dnde = self.model.spatial_model.evaluate_geom(geom.to_image())
+        template = dnde * geom.bin_volume() * self.exposure.quantity
+        template = Map.from_geom(geom, data=template.value, unit=template.unit)
+
+        if self.psf is not None:
+            template = self.apply_psf(template)
+
+        return template
+
+    def _compute_spatial_template_derivatives(self):
+        """Derivatives of the spatial template per free spatial parameter.
+
+        The PSF convolved derivatives are not clipped at zero.
+        """
+        geom = self.geom
+        derivatives = self.model.spatial_model.derivatives_geom(geom.to_image())
+
+        templates = {}
+        for par, value in derivatives.items():
+            value = value * par.unit * geom.bin_volume() * self.exposure.quantity
+            template = Map.from_geom(geom, data=value.value, unit=value.unit)
+
+            if self.psf is not None:
+                template = template.convolve(self.psf)
+
+            templates[par] = template
+
+        return templates
+
+
+def _sum_product(geom, data, other):
+    """Sum of ``data`` on ``geom`` times ``other`` on the same or a cutout geometry."""
+    if geom == other.geom:
+        return np.sum(data * other.data)
+
+    slices = other.geom.cutout_info["parent-slices"]
+    parent = data[..., slices[0], slices[1]]
+
+    slices = other.geom.cutout_info["cutout-slices"]
+    cutout = other.data[..., slices[0], slices[1]]
+    return np.sum(parent * cutout)
+
+
+class _FitIndices:
+    """Flat indices of the fit region of a `MapDataset` with preallocated buffers.
+
+    Parameters
+    ----------
+    geom : `~gammapy.maps.Geom`
+        Dataset geometry.
+    idx_fit : `~numpy.ndarray` or None
+        Flat indices of the bins in the fit region, None if there is no mask.
+    idx : `~numpy.ndarray`
+        Flat indices of the bins in the fit region with non-zero counts.
+    counts : `~numpy.ndarray`
+        Counts in these bins.
+    """
+
+    def __init__(self, geom, idx_fit, idx, counts):
+        self.idx_fit = idx_fit
+        self.idx = idx
+        self.counts = counts.astype(float)
+        self.npred = Map.from_geom(geom, dtype=float)
+
+        self._npred_fit = None if idx_fit is None else np.empty(len(idx_fit))
+        self._npred_counts = np.empty(len(idx))
+
+    def take(self, data):
+        """Take ``data`` on the fit region and on the bins with counts.
+
+        The returned arrays are the preallocated buffers, or a view of ``data``
+        if there is no mask, and are overwritten by the next call.
+        """
+        data = data.ravel()
+
+        if self.idx_fit is None:
+            data_fit = data
+        else:
+            data_fit = np.take(data, self.idx_fit, out=self._npred_fit)
+
+        data_counts = np.take(data, self.idx, out=self._npred_counts)
+        return data_fit, data_counts
+
+
+def _checksum(m):
+    """CRC32 checksum of the data of a map, None for None."""
+    if m is None:
+        return None
+
+    if isinstance(m, WcsSparseMap):
+        arrays = m.get_flat_nonzero()
+    else:
+        arrays = [m.data]
+
+    checksum = 0
+    for array in arrays:
+        checksum = zlib.crc32(np.ascontiguousarray(array), checksum)
+    return checksum
+
+
+class _EvaluationCache:
+    """Cache for a single value computed from a set of inputs.
+
+    Inputs are compared by identity, parameters by identity and version, so
+    that the value is re-computed if an input is replaced or a parameter
+    value changes.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self._inputs = None
+        self._versions = None
+        self.value = None
+
+    def _is_valid(self, inputs, versions):
+        if self._inputs is None or len(inputs) != len(self._inputs):
+            return False
+
+        same_inputs = all(a is b for a, b in zip(inputs, self._inputs))
+        return same_inputs and versions == self._versions
+
+    def get(self, inputs, parameters, compute, versions=()):
+        """Get cached value, call ``compute`` if it is outdated.
+
+        Additional ``versions``, e.g. checksums of the input data, are
+        compared by value.
+        """
+        inputs = (*inputs, *parameters)
+        versions = (*versions, *[par._version for par in parameters])
+
+        if not self._is_valid(inputs, versions):
+            self.value = compute()
+            self._inputs, self._versions = inputs, versions
+
+        return self.value
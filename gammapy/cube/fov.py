@@ -61,9 +61,9 @@ class FoVBackgroundMaker:
         """Reproject the exclusion on the dataset geometry"""
         mask_map = Map.from_geom(dataset.counts.geom)
         if self.exclusion_mask is not None:
-            coords = dataset.counts.geom.get_coord()
-            vals = self.exclusion_mask.get_by_coord(coords)
-            mask_map.data += vals
+            # pixels outside of the exclusion mask are excluded
+            mask = self.exclusion_mask.reproject(mask_map.geom, method="nearest")
+            mask_map.data += mask.data
 
         return mask_map.data.astype("bool")
 
@@ -5,7 +5,7 @@ from astropy.coordinates import Angle
 from gammapy.irf import EnergyDependentMultiGaussPSF
 from gammapy.maps import Map
 from gammapy.modeling.models import BackgroundModel
-from .background import make_map_background_irf
+from .background import _get_background_pointing, make_map_background_irf
 from .edisp_map import make_edisp_map
 from .exposure import make_map_exposure_true_energy
 from .fit import MapDataset, MapDatasetOnOff
@@ -23,16 +23,30 @@ class MapDatasetMaker:
     ----------
     background_oversampling : int
         Background evaluation oversampling factor in energy.
+    background_time_bins : int
+        Number of equal time intervals used for the background evaluation,
+        see `~gammapy.cube.make_map_background_irf`.
     selection : list
         List of str, selecting which maps to make.
         Available: 'counts', 'exposure', 'background', 'psf', 'edisp'
         By default, all maps are made.
+    sparse_counts : bool
+        Store the counts in a `~gammapy.maps.WcsSparseMap`, which saves memory
+        for cubes that are mostly empty, e.g. at high energies.
     """
 
     available_selection = ["counts", "exposure", "background", "psf", "edisp"]
 
-    def __init__(self, background_oversampling=None, selection=None):
+    def __init__(
+        self,
+        background_oversampling=None,
+        background_time_bins=1,
+        selection=None,
+        sparse_counts=False,
+    ):
         self.background_oversampling = background_oversampling
+        self.background_time_bins = background_time_bins
+        self.sparse_counts = sparse_counts
 
         if selection is None:
             selection = self.available_selection
@@ -46,7 +60,7 @@ class MapDatasetMaker:
         self.selection = selection
 
     @staticmethod
-    def make_counts(geom, observation):
+    def make_counts(geom, observation, sparse=False):
         """Make counts map.
 
         Parameters
@@ -55,14 +69,25 @@ class MapDatasetMaker:
             Reference map geom.
         observation : `~gammapy.data.DataStoreObservation`
             Observation container.
+        sparse : bool
+            Make a `~gammapy.maps.WcsSparseMap`.
 
         Returns
         -------
         counts : `~gammapy.maps.Map`
             Counts map.
         """
-        counts = Map.from_geom(geom)
-        counts.fill_events(observation.events)
+        columns = ["RA", "DEC"] + [axis.name.upper() for axis in geom.axes]
+
+        energy_band = None
+        if "energy" in [axis.name for axis in geom.axes]:
+            energy_band = geom.get_axis_by_name("energy").edges[[0, -1]]
+
+        events = observation.get_events(columns=columns, energy_band=energy_band)
+
+        map_type = "wcs-sparse" if sparse else "auto"
+        counts = Map.from_geom(geom, map_type=map_type)
+        counts.fill_events(events)
         return counts
 
     @staticmethod
@@ -126,24 +151,13 @@ class MapDatasetMaker:
         background : `~gammapy.maps.Map`
             Background map.
         """
-        bkg_coordsys = observation.bkg.meta.get("FOVALIGN", "RADEC")
-
-        if bkg_coordsys == "ALTAZ":
-            pointing = observation.fixed_pointing_info
-        elif bkg_coordsys == "RADEC":
-            pointing = observation.pointing_radec
-        else:
-            raise ValueError(
-                f"Invalid background coordinate system: {bkg_coordsys!r}\n"
-                "Options: ALTAZ, RADEC"
-            )
-
         return make_map_background_irf(
-            pointing=pointing,
+            pointing=_get_background_pointing(observation),
             ontime=observation.observation_time_duration,
             bkg=observation.bkg,
             geom=geom,
             oversampling=self.background_oversampling,
+            n_time_bins=self.background_time_bins,
         )
 
     def make_edisp(self, geom, observation):
@@ -222,7 +236,9 @@ class MapDatasetMaker:
         kwargs["mask_safe"] = mask_safe
 
         if "counts" in self.selection:
-            counts = self.make_counts(dataset.counts.geom, observation)
+            counts = self.make_counts(
+                dataset.counts.geom, observation, sparse=self.sparse_counts
+            )
             kwargs["counts"] = counts
 
         if "exposure" in self.selection:
@@ -3,8 +3,10 @@ from copy import deepcopy
 import numpy as np
 import astropy.io.fits as fits
 import astropy.units as u
+from astropy.coordinates import Angle, SkyCoord
 from gammapy.irf import EnergyDependentTablePSF
 from gammapy.maps import Map, MapAxis, MapCoord, WcsGeom
+from gammapy.utils.cache import LRUCache
 from gammapy.utils.random import InverseCDFSampler, get_random_state
 from .psf_kernel import PSFKernel
 from .exposure import _map_spectrum_weight
@@ -74,6 +76,11 @@ class PSFMap:
     exposure_map : `~gammapy.maps.Map`
         Associated exposure map. Needs to have a consistent map geometry.
 
+    Attributes
+    ----------
+    kernel_cache : `~gammapy.utils.cache.LRUCache`
+        Cache of the PSF kernels computed by `get_psf_kernel`.
+
     Examples
     --------
     ::
@@ -127,6 +134,7 @@ class PSFMap:
 
         self.psf_map = psf_map
         self.exposure_map = exposure_map
+        self.kernel_cache = LRUCache(max_size=64)
 
     @classmethod
     def from_hdulist(
@@ -249,11 +257,19 @@ class PSFMap:
             energy=energy, rad=rad, psf_value=psf_values, exposure=exposure
         )
 
-    def get_psf_kernel(self, position, geom, max_radius=None, factor=4):
+    def get_psf_kernel(
+        self, position, geom, max_radius=None, factor=4, position_tolerance=None
+    ):
         """Returns a PSF kernel at the given position.
 
         The PSF is returned in the form a WcsNDMap defined by the input Geom.
 
+        The position is quantised and the kernel is computed at the quantised
+        position. Kernels are cached in `kernel_cache`, so that models at
+        nearby positions share the same kernel, also for geometries that only
+        differ by their center, e.g. cutouts. The cached kernels are shared
+        and should be treated as read-only.
+
         Parameters
         ----------
         position : `~astropy.coordinates.SkyCoord`
@@ -264,16 +280,31 @@ class PSFMap:
             maximum angular size of the kernel map
         factor : int
             oversampling factor to compute the PSF
+        position_tolerance : `~astropy.coordinates.Angle`
+            Step of the lon / lat grid the position is quantised to. By default
+            the position is quantised to the center of the PSF map pixel.
+            Use 0 deg to compute the kernel at the exact position.
 
         Returns
         -------
         kernel : `~gammapy.cube.PSFKernel`
             the resulting kernel
         """
-        table_psf = self.get_energy_dependent_table_psf(position)
-        if max_radius is None:
-            max_radius = np.max(table_psf.rad)
-        return PSFKernel.from_table_psf(table_psf, geom, max_radius, factor)
+        key, position = _quantize_position(
+            self.psf_map.geom, position, position_tolerance
+        )
+
+        if max_radius is not None:
+            max_radius = Angle(max_radius)
+            key += (max_radius.deg,)
+
+        def compute():
+            table_psf = self.get_energy_dependent_table_psf(position)
+            radius = np.max(table_psf.rad) if max_radius is None else max_radius
+            return PSFKernel.from_table_psf(table_psf, geom, radius, factor)
+
+        key += (_kernel_geom_key(geom), factor)
+        return self.kernel_cache.get(key, compute)
 
     def containment_radius_map(self, energy, fraction=0.68):
         """Containment radius map.
@@ -330,6 +361,8 @@ class PSFMap:
             self.psf_map.data[parent_slices] /= self.exposure_map.data[parent_slices]
             self.psf_map.data = np.nan_to_num(self.psf_map.data)
 
+        self.kernel_cache.clear()
+
     def copy(self):
         """Copy PSFMap"""
         return deepcopy(self)
@@ -485,3 +518,64 @@ class PSFMap:
 
         psf = psf_map.sum_over_axes(axes=["energy"], keepdims=keepdims)
         return self.__class__(psf_map=psf, exposure_map=exposure)
+
+
+def _kernel_geom_key(geom):
+    """Hashable key of the geom properties a PSF kernel depends on.
+
+    The kernel is computed at the geom center, so the center is not part of
+    the key and e.g. cutouts at different positions share the kernel.
+    """
+    axes = tuple(
+        (ax.name, ax.node_type, ax.interp, str(ax.unit), ax.edges.value.tobytes())
+        for ax in geom.axes
+    )
+    cdelt = tuple(np.abs(geom.wcs.wcs.cdelt))
+    return geom.data_shape, cdelt, geom.projection, axes
+
+
+def _quantize_position(geom, position, tolerance=None):
+    """Quantise a sky position to an IRF map pixel or a lon / lat grid.
+
+    Parameters
+    ----------
+    geom : `~gammapy.maps.WcsGeom`
+        IRF map geometry.
+    position : `~astropy.coordinates.SkyCoord`
+        Sky position.
+    tolerance : `~astropy.coordinates.Angle`
+        Grid step. By default the position is quantised to the center of the
+        map pixel. Positions outside the map are not quantised.
+
+    Returns
+    -------
+    key : tuple
+        Hashable key of the quantised position.
+    position : `~astropy.coordinates.SkyCoord`
+        Quantised position.
+    """
+    if position.size != 1:
+        raise ValueError("Position must be a single coordinate.")
+
+    geom = geom.to_image()
+    position = position.transform_to(geom.frame)
+    lon, lat = position.spherical.lon.deg, position.spherical.lat.deg
+
+    if tolerance is None:
+        idx = geom.coord_to_idx((lon, lat))
+        if np.all([_ >= 0 for _ in idx]):
+            lon, lat = geom.pix_to_coord(idx)
+            key = ("pix",) + tuple(int(_) for _ in idx)
+        else:
+            key = ("exact", float(lon), float(lat))
+    else:
+        step = Angle(tolerance).deg
+        if step > 0:
+            idx = np.round(lon / step), np.round(lat / step)
+            lon, lat = idx[0] * step, idx[1] * step
+            key = ("grid", int(idx[0]), int(idx[1]), step)
+        else:
+            key = ("exact", float(lon), float(lat))
+
+    position = SkyCoord(lon, lat, unit="deg", frame=geom.frame)
+    return key, position
@@ -4,9 +4,10 @@ import numpy as np
 from numpy.testing import assert_allclose
 from astropy import units as u
 from astropy.coordinates import EarthLocation, SkyCoord
+from astropy.table import Table
 from astropy.time import Time
-from gammapy.cube import make_map_background_irf
-from gammapy.data import FixedPointingInfo
+from gammapy.cube import make_map_background_irf, make_maps_background_irf
+from gammapy.data import FixedPointingInfo, Observation, PointingInfo
 from gammapy.irf import Background3D
 from gammapy.maps import HpxGeom, MapAxis, WcsGeom
 from gammapy.utils.testing import requires_data
@@ -181,3 +182,139 @@ def test_make_map_background_irf_asym(fixed_pointing_info_aligned):
         with pytest.raises(AssertionError):
             assert_allclose(d[0, 1], d[2, 1], rtol=1e-4)  # Symmetric along lat
         assert_allclose(d[0, 1] * 9, d[2, 1], rtol=1e-4)  # Asymmetric along lat
+
+
+def test_make_maps_background_irf():
+    bkgs = [bkg_3d_custom("asymmetric"), bkg_3d_custom("symmetric")]
+    observations = [
+        Observation.create(
+            pointing=SkyCoord(0.5 * idx, 0, unit="deg"),
+            livetime=(idx + 1) * u.h,
+            irfs={"bkg": bkgs[idx % 2]},
+        )
+        for idx in range(3)
+    ]
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(6, 4), binsz=0.5, axes=[axis])
+
+    maps = make_maps_background_irf(observations, geom, oversampling=2, chunk_size=2)
+    assert len(maps) == 3
+
+    for obs, m in zip(observations, maps):
+        expected = make_map_background_irf(
+            pointing=obs.pointing_radec,
+            ontime=obs.observation_time_duration,
+            bkg=obs.bkg,
+            geom=geom,
+            oversampling=2,
+        )
+        assert_allclose(m.data, expected.data, rtol=1e-12)
+
+    stacked = make_maps_background_irf(observations, geom, stack=True)
+    assert stacked.geom == geom
+    assert_allclose(stacked.data.sum(), sum(m.data.sum() for m in maps), rtol=1e-5)
+
+
+def fixed_pointing_info_custom(tstart=0, duration=1800):
+    meta = {
+        "RA_PNT": 83.6,
+        "DEC_PNT": 22.0,
+        "GEOLON": 16.5,
+        "GEOLAT": -23.27,
+        "ALTITUDE": 1835.0,
+        "MJDREFI": 51910,
+        "MJDREFF": 0.0,
+        "TIMESYS": "TT",
+        "TSTART": 6e8 + tstart,
+        "TSTOP": 6e8 + tstart + duration,
+    }
+    return FixedPointingInfo(meta)
+
+
+def test_make_map_background_irf_time_bins():
+    bkg = bkg_3d_custom("asymmetric")
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(6, 4), binsz=0.5, axes=[axis], skydir=(83.6, 22))
+
+    m = make_map_background_irf(
+        fixed_pointing_info_custom(), "1800 s", bkg, geom, n_time_bins=4
+    )
+
+    expected = np.zeros(geom.data_shape)
+    for idx in range(4):
+        fpi = fixed_pointing_info_custom(tstart=450 * idx, duration=450)
+        expected += make_map_background_irf(fpi, "450 s", bkg, geom).data
+
+    assert_allclose(m.data, expected, rtol=1e-10)
+
+    # the FoV rotates during the observation
+    fpi = fixed_pointing_info_custom()
+    m_single = make_map_background_irf(fpi, "1800 s", bkg, geom)
+    with pytest.raises(AssertionError):
+        assert_allclose(m.data, m_single.data, rtol=1e-4)
+
+    # time bins are ignored for a SkyCoord pointing
+    m = make_map_background_irf(fpi.radec, "1800 s", bkg, geom, n_time_bins=4)
+    m_single = make_map_background_irf(fpi.radec, "1800 s", bkg, geom)
+    assert_allclose(m.data, m_single.data, rtol=1e-12)
+
+
+def test_make_maps_background_irf_altaz():
+    bkg = bkg_3d_custom("asymmetric")
+    bkg.meta["FOVALIGN"] = "ALTAZ"
+
+    observations = []
+    for idx in range(3):
+        obs = Observation.create(
+            pointing=SkyCoord(83.6, 22, unit="deg"),
+            livetime=0.5 * u.h,
+            irfs={"bkg": bkg},
+        )
+        obs.fixed_pointing_info = fixed_pointing_info_custom(tstart=3600 * idx)
+        observations.append(obs)
+
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(6, 4), binsz=0.5, axes=[axis], skydir=(83.6, 22))
+
+    maps = make_maps_background_irf(observations, geom, n_time_bins=2, chunk_size=2)
+
+    for obs, m in zip(observations, maps):
+        expected = make_map_background_irf(
+            pointing=obs.fixed_pointing_info,
+            ontime=obs.observation_time_duration,
+            bkg=bkg,
+            geom=geom,
+            n_time_bins=2,
+        )
+        assert_allclose(m.data, expected.data, rtol=1e-10)
+
+    # the FoV rotation differs between the observations
+    with pytest.raises(AssertionError):
+        assert_allclose(maps[0].data, maps[1].data, rtol=1e-4)
+
+
+def test_make_maps_background_irf_empty():
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(6, 4), binsz=0.5, axes=[axis])
+
+    assert make_maps_background_irf([], geom) == []
+
+    stacked = make_maps_background_irf([], geom, stack=True, oversampling=2)
+    assert stacked.geom == geom
+    assert_allclose(stacked.data, 0)
+
+
+def test_make_map_background_irf_pointing_info():
+    fpi = fixed_pointing_info_custom()
+    time = np.linspace(fpi.meta["TSTART"], fpi.meta["TSTOP"], 31)
+    table = Table({"TIME": time, "RA_PNT": [83.6] * 31, "DEC_PNT": [22.0] * 31})
+    table.meta = fpi.meta
+    pointing_info = PointingInfo(table)
+
+    bkg = bkg_3d_custom("asymmetric")
+    axis = MapAxis.from_edges([0.1, 1, 10], name="energy", unit="TeV", interp="log")
+    geom = WcsGeom.create(npix=(6, 4), binsz=0.5, axes=[axis], skydir=(83.6, 22))
+
+    m = make_map_background_irf(pointing_info, "1800 s", bkg, geom, n_time_bins=5)
+    expected = make_map_background_irf(fpi, "1800 s", bkg, geom, n_time_bins=5)
+    assert_allclose(m.data, expected.data, rtol=1e-3)
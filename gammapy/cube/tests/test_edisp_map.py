@@ -110,6 +110,30 @@ def test_edisp_map_to_energydispersion():
     assert_allclose(edisp.get_resolution(e_true=1.0 * u.TeV), 0.2, atol=3e-2)
 
 
+def test_edisp_map_kernel_cache():
+    edmap = make_edisp_map_test()
+    e_reco = np.logspace(-0.3, 0.2, 20) * u.TeV
+
+    # positions in the same EDisp map pixel share the kernel
+    edisp = edmap.get_edisp_kernel(SkyCoord(1, 1, unit="deg"), e_reco)
+    edisp_2 = edmap.get_edisp_kernel(SkyCoord(1.2, 1, unit="deg"), e_reco)
+    assert edisp_2 is edisp
+
+    edisp_3 = edmap.get_edisp_kernel(SkyCoord(1, 1, unit="deg"), e_reco[:-1])
+    assert edisp_3 is not edisp
+
+    assert edmap.kernel_cache.hits == 1
+    assert edmap.kernel_cache.misses == 2
+
+    expected = edmap.get_edisp_kernel(
+        SkyCoord(1, 1, unit="deg"), e_reco, position_tolerance="0 deg"
+    )
+    assert_allclose(edisp.pdf_matrix, expected.pdf_matrix)
+
+    edmap.stack(edmap.copy())
+    assert len(edmap.kernel_cache) == 0
+
+
 def test_edisp_map_stacking():
     edmap1 = make_edisp_map_test()
     edmap2 = make_edisp_map_test()
@@ -1,8 +1,15 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
+import astropy.units as u
 from astropy.coordinates import SkyCoord
-from gammapy.cube.exposure import _map_spectrum_weight, make_map_exposure_true_energy
+from gammapy.cube.exposure import (
+    _map_spectrum_weight,
+    make_map_exposure_true_energy,
+    make_maps_exposure_true_energy,
+)
+from gammapy.data import Observation
 from gammapy.irf import EffectiveAreaTable2D
 from gammapy.maps import HpxGeom, MapAxis, WcsGeom, WcsNDMap
 from gammapy.modeling.models import ConstantSpectralModel
@@ -19,6 +26,18 @@ def aeff():
     return EffectiveAreaTable2D.read(filename, hdu="EFFECTIVE AREA")
 
 
+def fake_aeff2d(area=1e6 * u.m ** 2, energy=np.logspace(-1, 1, 5) * u.TeV):
+    offsets = np.array((0.0, 1.0, 2.0, 3.0)) * u.deg
+
+    return EffectiveAreaTable2D(
+        energy_lo=energy[:-1],
+        energy_hi=energy[1:],
+        offset_lo=offsets[:-1],
+        offset_hi=offsets[1:],
+        data=np.ones((len(energy) - 1, 3)) * area,
+    )
+
+
 def geom(map_type, ebounds):
     axis = MapAxis.from_edges(ebounds, name="energy", unit="TeV", interp="log")
     if map_type == "wcs":
@@ -76,3 +95,63 @@ def test_map_spectrum_weight():
     assert weighted_expo.data.shape == (2, 10, 10)
     assert weighted_expo.unit == "m2 s"
     assert_allclose(weighted_expo.data.sum(), 100)
+
+
+def test_make_maps_exposure_true_energy():
+    aeffs = [fake_aeff2d(), fake_aeff2d(area=1e5 * u.m ** 2)]
+    observations = [
+        Observation.create(
+            pointing=SkyCoord(idx, 0, unit="deg"),
+            livetime=(idx + 1) * u.h,
+            irfs={"aeff": aeffs[idx % 2]},
+        )
+        for idx in range(3)
+    ]
+    wcs_geom = geom(map_type="wcs", ebounds=[0.1, 1, 10])
+
+    maps = make_maps_exposure_true_energy(observations, wcs_geom, chunk_size=2)
+    assert len(maps) == 3
+
+    for obs, m in zip(observations, maps):
+        expected = make_map_exposure_true_energy(
+            pointing=obs.pointing_radec,
+            livetime=obs.observation_live_time_duration,
+            aeff=obs.aeff,
+            geom=wcs_geom,
+        )
+        assert m.unit == "m2 s"
+        assert_allclose(m.data, expected.data, rtol=1e-12)
+
+    stacked = make_maps_exposure_true_energy(observations, wcs_geom, stack=True)
+    assert_allclose(stacked.data.sum(), sum(m.data.sum() for m in maps))
+
+    stacked = make_maps_exposure_true_energy([], wcs_geom, stack=True)
+    assert stacked.geom == wcs_geom
+    assert stacked.unit == "m2 s"
+    assert_allclose(stacked.data, 0)
+
+
+def test_make_maps_exposure_true_energy_single_energy_node():
+    # the energy axis is dropped when evaluating an IRF with a single node
+    aeff = fake_aeff2d(energy=[0.1, 10] * u.TeV)
+    observations = [
+        Observation.create(
+            pointing=SkyCoord(idx, 0, unit="deg"),
+            livetime=1 * u.h,
+            irfs={"aeff": aeff},
+        )
+        for idx in range(2)
+    ]
+    wcs_geom = geom(map_type="wcs", ebounds=[0.1, 10])
+
+    maps = make_maps_exposure_true_energy(observations, wcs_geom)
+
+    for obs, m in zip(observations, maps):
+        expected = make_map_exposure_true_energy(
+            pointing=obs.pointing_radec,
+            livetime=obs.observation_live_time_duration,
+            aeff=obs.aeff,
+            geom=wcs_geom,
+        )
+        assert m.data.shape == (1, 3, 4)
+        assert_allclose(m.data, expected.data, rtol=1e-12)
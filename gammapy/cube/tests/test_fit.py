@@ -15,7 +15,7 @@ from gammapy.cube import (
 from gammapy.data import GTI
 from gammapy.irf import EffectiveAreaTable2D, EnergyDependentMultiGaussPSF
 from gammapy.maps import Map, MapAxis, WcsGeom, WcsNDMap
-from gammapy.modeling import Datasets, Fit
+from gammapy.modeling import Dataset, Datasets, Fit
 from gammapy.modeling.models import (
     BackgroundModel,
     GaussianSpatialModel,
@@ -390,6 +390,111 @@ def test_map_fit_one_energy_bin(sky_model, geom_image):
     assert_allclose(pars.error("amplitude"), 1.901406e-13, rtol=1e-2)
 
 
+@requires_data()
+def test_map_dataset_stat_sum(sky_model, geom, geom_etrue):
+    dataset = get_map_dataset(sky_model, geom, geom_etrue)
+    dataset.counts = dataset.npred()
+    dataset.fake(0)
+    dataset.background_model.norm.value = 0.9
+
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+    # fit indices are updated if the masks or counts are replaced
+    mask_safe = geom.energy_mask(emin=1 * u.TeV)
+    dataset.mask_safe = Map.from_geom(geom, data=mask_safe)
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+    # and if their data is modified in place
+    stat_sum = dataset.stat_sum()
+    dataset.mask_fit.data[:, :, :20] = False
+    assert dataset.stat_sum() != stat_sum
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+    dataset.counts.data[:, 20:30, 20:30] += 1
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+    dataset.mask_fit = None
+    dataset.mask_safe = None
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+    dataset.fake(1)
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+    # bins with NaN predicted counts do not contribute
+    dataset.background_model.map.data[:, 10:20, 10:20] = np.nan
+    assert np.isfinite(dataset.stat_sum())
+    assert_allclose(dataset.stat_sum(), Dataset.stat_sum(dataset))
+
+
+@requires_data()
+def test_map_dataset_stat_sum_gradient(sky_model, geom, geom_etrue):
+    dataset = get_map_dataset(sky_model, geom, geom_etrue)
+    dataset.counts = dataset.npred()
+    dataset.background_model.norm.value = 0.9
+    sky_model.parameters["lon_0"].value = 0.21
+    sky_model.parameters["index"].value = 2.9
+
+    parameters = list(dataset.parameters.free_parameters)
+    actual = dataset.stat_sum_gradient(parameters)
+
+    derivatives = Dataset._stat_sum_derivatives(dataset)
+    desired = [derivatives[par] for par in parameters]
+    assert_allclose(actual, desired, rtol=1e-2)
+
+
+@requires_data()
+def test_map_dataset_stat_sum_batch(sky_model, geom, geom_etrue):
+    dataset = get_map_dataset(sky_model, geom, geom_etrue)
+    dataset.counts = dataset.npred()
+    dataset.fake(0)
+
+    for parameter in [sky_model.parameters["amplitude"], dataset.background_model.norm]:
+        value = parameter.value
+        values = value * np.array([0, 0.5, 1.2])
+
+        desired = []
+        for val in values:
+            parameter.value = val
+            desired.append(dataset.stat_sum())
+        parameter.value = value
+
+        actual = dataset.stat_sum_batch(parameter, values)
+        assert_allclose(actual, desired, rtol=1e-7)
+        assert_allclose(parameter.value, value)
+
+
+@requires_data()
+def test_map_dataset_stat_sum_batch_nonlinear(sky_model, geom, geom_etrue):
+    dataset = get_map_dataset(sky_model, geom, geom_etrue)
+    dataset.counts = dataset.npred()
+    dataset.fake(0)
+
+    def check(parameter, values):
+        value = parameter.value
+        desired = []
+        for val in values:
+            parameter.value = val
+            desired.append(dataset.stat_sum())
+        parameter.value = value
+
+        assert not dataset._is_linear_norm(parameter, values)
+        actual = dataset.stat_sum_batch(parameter, values)
+        assert_allclose(actual, desired, rtol=1e-7)
+        assert_allclose(parameter.value, value)
+
+    # negative predicted counts are clipped after the PSF convolution
+    amplitude = sky_model.spectral_model.amplitude
+    check(amplitude, amplitude.value * np.array([-1, -0.5, 0, 1.2]))
+
+    # the norms of a compound model are not declared by the compound model
+    spectral_model = sky_model.spectral_model + PowerLawSpectralModel(index=3)
+    dataset.models = SkyModel(
+        spatial_model=sky_model.spatial_model, spectral_model=spectral_model
+    )
+    amplitude = spectral_model.model2.amplitude
+    check(amplitude, amplitude.value * np.array([0, 0.5, 1.2]))
+
+
 def test_create(geom, geom_etrue):
     # tests empty datasets created
     migra_axis = MapAxis(nodes=np.linspace(0.0, 3.0, 51), unit="", name="migra")
@@ -482,12 +587,17 @@ def test_stack(geom, geom_etrue):
         exposure=get_exposure(geom_etrue),
         mask_safe=mask2,
     )
+    stat_sum = dataset1.stat_sum()
     dataset1.stack(dataset2)
     assert_allclose(dataset1.counts.data.sum(), 7987)
     assert_allclose(dataset1.background_model.map.data.sum(), 5988)
     assert_allclose(dataset1.exposure.data, 2.0 * dataset2.exposure.data)
     assert_allclose(dataset1.mask_safe.data.sum(), 20000)
 
+    # the fit indices are re-computed for the stacked counts and masks
+    assert dataset1.stat_sum() != stat_sum
+    assert_allclose(dataset1.stat_sum(), Dataset.stat_sum(dataset1))
+
 
 @pytest.fixture
 def images():
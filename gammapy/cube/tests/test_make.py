@@ -8,7 +8,7 @@ from regions import CircleSkyRegion
 from gammapy.cube import MapDataset, MapDatasetMaker, RingBackgroundMaker, SafeMaskMaker
 from gammapy.cube.fit import MapDatasetOnOff
 from gammapy.data import DataStore
-from gammapy.maps import Map, MapAxis, WcsGeom
+from gammapy.maps import Map, MapAxis, WcsGeom, WcsSparseMap
 from gammapy.utils.testing import requires_data
 
 
@@ -191,6 +191,23 @@ def test_map_maker_obs(observations):
     assert map_dataset.name == "obs_110380"
 
 
+@requires_data()
+def test_map_maker_sparse_counts(observations):
+    reference = MapDataset.create(geom=geom(ebounds=[0.1, 1, 10]))
+
+    maker = MapDatasetMaker(selection=["counts", "background"])
+    dataset = maker.run(reference, observations[0])
+
+    maker_sparse = MapDatasetMaker(
+        selection=["counts", "background"], sparse_counts=True
+    )
+    dataset_sparse = maker_sparse.run(reference, observations[0])
+
+    assert isinstance(dataset_sparse.counts, WcsSparseMap)
+    assert_allclose(dataset_sparse.counts.data, dataset.counts.data)
+    assert_allclose(dataset_sparse.stat_sum(), dataset.stat_sum(), rtol=1e-10)
+
+
 @requires_data()
 def test_safe_mask_maker(observations):
     obs = observations[0]
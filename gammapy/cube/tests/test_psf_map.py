@@ -129,6 +129,53 @@ def test_psfmap_to_psf_kernel():
     assert_allclose(psfkernel.psf_kernel_map.data.sum(axis=(1, 2)), 1.0, atol=1e-7)
 
 
+def test_psfmap_psf_kernel_cache():
+    psfmap = make_test_psfmap(0.15 * u.deg)
+
+    energy_axis = psfmap.psf_map.geom.axes[1]
+    kern_geom = WcsGeom.create(binsz=0.02, width=5.0, axes=[energy_axis])
+
+    # positions in the same PSF map pixel share the kernel
+    kernel = psfmap.get_psf_kernel(SkyCoord(1, 1, unit="deg"), kern_geom, "1 deg")
+    kernel_2 = psfmap.get_psf_kernel(SkyCoord(1.05, 1, unit="deg"), kern_geom, "1 deg")
+    assert kernel_2 is kernel
+
+    kernel_3 = psfmap.get_psf_kernel(SkyCoord(1.2, 1, unit="deg"), kern_geom, "1 deg")
+    assert kernel_3 is not kernel
+
+    assert psfmap.kernel_cache.hits == 1
+    assert psfmap.kernel_cache.misses == 2
+
+    # an equal geom created again shares the kernel
+    kern_geom_2 = WcsGeom.create(binsz=0.02, width=5.0, axes=[energy_axis])
+    kernel_5 = psfmap.get_psf_kernel(SkyCoord(1, 1, unit="deg"), kern_geom_2, "1 deg")
+    assert kernel_5 is kernel
+    assert psfmap.kernel_cache.hits == 2
+
+    # as does a geom with another center, e.g. a cutout
+    kern_geom_3 = WcsGeom.create(
+        skydir=(10, 5), binsz=0.02, width=5.0, axes=[energy_axis]
+    )
+    kernel_6 = psfmap.get_psf_kernel(SkyCoord(1, 1, unit="deg"), kern_geom_3, "1 deg")
+    assert kernel_6 is kernel
+    assert psfmap.kernel_cache.hits == 3
+
+    # the kernel is computed at the pixel center
+    position = SkyCoord(1, 1, unit="deg")
+    expected = psfmap.get_psf_kernel(
+        position, kern_geom, "1 deg", position_tolerance="0 deg"
+    )
+    assert_allclose(kernel.psf_kernel_map.data, expected.psf_kernel_map.data)
+
+    kernel_4 = psfmap.get_psf_kernel(
+        SkyCoord(1.05, 1, unit="deg"), kern_geom, "1 deg", position_tolerance="0.2 deg"
+    )
+    assert_allclose(kernel_4.psf_kernel_map.data, expected.psf_kernel_map.data)
+
+    psfmap.stack(psfmap.copy())
+    assert len(psfmap.kernel_cache) == 0
+
+
 def test_psfmap_to_from_hdulist():
     psfmap = make_test_psfmap(0.15 * u.deg)
     hdulist = psfmap.to_hdulist(psf_hdu="PSF", psf_hdubands="BANDS")
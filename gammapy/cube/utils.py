@@ -0,0 +1,40 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Utility functions for the batched computation of maps for observations."""
+import numpy as np
+
+
+def _split_chunks(observations, chunk_size):
+    """Split observations into lists of at most ``chunk_size`` observations."""
+    observations = list(observations)
+    for idx in range(0, len(observations), chunk_size):
+        yield observations[idx : idx + chunk_size]
+
+
+def _evaluate_grouped(irfs, evaluate):
+    """Evaluate IRFs shared by several observations in one call.
+
+    Parameters
+    ----------
+    irfs : list
+        IRF of every observation, identical objects are grouped.
+    evaluate : callable
+        Function called as ``evaluate(irf, idx)``, where ``idx`` are the
+        indices of the observations using ``irf``. It must return an array
+        with the observation axis as second axis.
+
+    Returns
+    -------
+    values : list
+        Evaluated array for every observation.
+    """
+    groups = {}
+    for idx, irf in enumerate(irfs):
+        groups.setdefault(id(irf), (irf, []))[1].append(idx)
+
+    values = [None] * len(irfs)
+    for irf, idx in groups.values():
+        result = evaluate(irf, idx)
+        for jdx, value in zip(idx, np.moveaxis(result, 1, 0)):
+            values[jdx] = value
+
+    return values
@@ -6,7 +6,7 @@ from astropy.coordinates import SkyCoord
 from astropy.io import fits
 from gammapy.utils.scripts import make_path
 from gammapy.utils.testing import Checker
-from .hdu_index_table import HDUIndexTable
+from .hdu_index_table import HDUCache, HDUIndexTable
 from .obs_table import ObservationTable, ObservationTableChecker
 from .observations import DataStoreObservation, ObservationChecker, Observations
 
@@ -29,6 +29,9 @@ class DataStore:
         HDU index table
     obs_table : `~gammapy.data.ObservationTable`
         Observation index table
+    cache : `~gammapy.data.HDUCache`
+        Cache for the events and IRFs loaded by the observations of the
+        data store. By default a cache with a maximum size of 1 GB is used.
 
     Examples
     --------
@@ -45,9 +48,10 @@ class DataStore:
     DEFAULT_OBS_TABLE = "obs-index.fits.gz"
     """Default observation table filename."""
 
-    def __init__(self, hdu_table=None, obs_table=None):
+    def __init__(self, hdu_table=None, obs_table=None, cache=None):
         self.hdu_table = hdu_table
         self.obs_table = obs_table
+        self.cache = cache if cache is not None else HDUCache()
 
     def __str__(self):
         return self.info(show=False)
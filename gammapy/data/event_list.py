@@ -62,20 +62,69 @@ class EventListBase:
     def __init__(self, table):
         self.table = table
 
+    def copy(self):
+        """A copy of the event list, including the table data."""
+        return self.__class__(self.table.copy())
+
     @classmethod
-    def read(cls, filename, **kwargs):
+    def read(
+        cls,
+        filename,
+        columns=None,
+        energy_band=None,
+        time_interval=None,
+        region=None,
+        wcs=None,
+        **kwargs,
+    ):
         """Read from FITS file.
 
         Format specification: :ref:`gadf:iact-events`
 
+        If ``columns`` or any of the selections are given, the events table
+        is memory-mapped and only the selected columns of the selected rows
+        are copied to memory. This reduces the memory usage and read time
+        for large event lists.
+
         Parameters
         ----------
         filename : `pathlib.Path`, str
             Filename
+        columns : list of str
+            Columns to read. By default all columns are read.
+        energy_band : `~astropy.units.Quantity`
+            Energy band ``[energy_min, energy_max)`` of events to read.
+        time_interval : `astropy.time.Time`
+            Start time (inclusive) and stop time (exclusive) of events to read.
+        region : `~regions.SkyRegion` or str
+            Sky region of events to read.
+        wcs : `~astropy.wcs.WCS`
+            World coordinate system transformation used for ``region``.
         """
         filename = make_path(filename)
         kwargs.setdefault("hdu", "EVENTS")
-        table = Table.read(filename, **kwargs)
+
+        selections = [energy_band, time_interval, region]
+        if columns is None and all(_ is None for _ in selections):
+            return cls(table=Table.read(filename, **kwargs))
+
+        table = Table.read(filename, memmap=True, **kwargs)
+        events = cls(table)
+
+        mask = np.ones(len(table), dtype=bool)
+        if energy_band is not None:
+            mask &= events._mask_energy(energy_band)
+        if time_interval is not None:
+            mask &= events._mask_time(time_interval)
+        if region is not None:
+            mask &= events._mask_region(region, wcs)
+
+        if columns is None:
+            columns = table.colnames
+
+        # copy only the selected rows of the selected columns, so that
+        # no references to the memory-mapped file remain
+        table = Table([table[_][mask] for _ in columns], meta=table.meta)
         return cls(table=table)
 
     @classmethod
@@ -211,10 +260,14 @@ class EventListBase:
         >>> energy_band = Quantity([1, 20], 'TeV')
         >>> event_list = event_list.select_energy()
         """
+        mask = self._mask_energy(energy_band)
+        return self.select_row_subset(mask)
+
+    def _mask_energy(self, energy_band):
         energy = self.energy
         mask = energy_band[0] <= energy
         mask &= energy < energy_band[1]
-        return self.select_row_subset(mask)
+        return mask
 
     def select_time(self, time_interval):
         """Select events in time interval.
@@ -229,10 +282,14 @@ class EventListBase:
         events : `EventList`
             Copy of event list with selection applied.
         """
+        mask = self._mask_time(time_interval)
+        return self.select_row_subset(mask)
+
+    def _mask_time(self, time_interval):
         time = self.time
         mask = time_interval[0] <= time
         mask &= time < time_interval[1]
-        return self.select_row_subset(mask)
+        return mask
 
     def select_region(self, region, wcs=None):
         """Select events in given region.
@@ -249,10 +306,13 @@ class EventListBase:
         event_list : `EventList`
             Copy of event list with selection applied.
         """
-        region = make_region(region)
-        mask = region.contains(self.radec, wcs)
+        mask = self._mask_region(region, wcs)
         return self.select_row_subset(mask)
 
+    def _mask_region(self, region, wcs=None):
+        region = make_region(region)
+        return region.contains(self.radec, wcs)
+
     def select_parameter(self, parameter, band):
         """Select events with respect to a specified parameter.
 
@@ -445,7 +505,16 @@ class EventListBase:
         coord : `~gammapy.maps.MapCoord`
             Coordinates
         """
-        coord = {"skycoord": self.radec}
+        if getattr(geom, "frame", None) == "icrs":
+            # avoid creating a SkyCoord object
+            coord = {
+                "lon": Quantity(self.table["RA"], "deg").value,
+                "lat": Quantity(self.table["DEC"], "deg").value,
+            }
+            frame = "icrs"
+        else:
+            coord = {"skycoord": self.radec}
+            frame = None
 
         cols = {k.upper(): v for k, v in self.table.columns.items()}
 
@@ -456,7 +525,7 @@ class EventListBase:
             except KeyError:
                 raise KeyError(f"Column not found in event list: {axis.name!r}")
 
-        return MapCoord.create(coord)
+        return MapCoord.create(coord, frame=frame)
 
     def select_map_mask(self, mask):
         """Select events inside a mask (`EventList`).
@@ -5,9 +5,10 @@ import numpy as np
 from astropy.io import fits
 from astropy.table import Table
 from astropy.utils import lazyproperty
+from gammapy.utils.cache import LRUCache
 from gammapy.utils.scripts import make_path
 
-__all__ = ["HDULocation", "HDUIndexTable"]
+__all__ = ["HDULocation", "HDUIndexTable", "HDUCache"]
 
 log = logging.getLogger(__name__)
 
@@ -114,6 +115,84 @@ class HDULocation:
             raise ValueError(f"Invalid hdu_class: {hdu_class}")
 
 
+class HDUCache:
+    """Least recently used cache for objects loaded from HDUs.
+
+    Objects are keyed on the absolute file path and HDU name, so observations
+    that point to the same IRF file share a single cached object. When the
+    total size of the cached objects exceeds ``max_size``, the least recently
+    used objects are evicted, see `~gammapy.utils.cache.LRUCache`.
+
+    The cached objects are shared between all callers and should be treated
+    as read-only.
+
+    Parameters
+    ----------
+    max_size : int
+        Maximum total size of the cached objects in bytes.
+        Use 0 to disable caching.
+    """
+
+    def __init__(self, max_size=int(1e9)):
+        self.max_size = max_size
+        self._cache = LRUCache(max_size=None if max_size > 0 else 0, max_bytes=max_size)
+
+    def __str__(self):
+        return (
+            f"{self.__class__.__name__}\n\n"
+            f"\tentries  : {len(self)}\n"
+            f"\tsize     : {self.size} / {self.max_size} bytes\n"
+            f"\thits     : {self.hits}\n"
+            f"\tmisses   : {self.misses}\n"
+        )
+
+    def __getstate__(self):
+        # cached objects are not pickled, e.g. when observations are sent
+        # to worker processes
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._cache)
+
+    @property
+    def size(self):
+        """Total size of the cached objects in bytes."""
+        return self._cache.nbytes
+
+    @property
+    def hits(self):
+        """Number of loads served from the cache."""
+        return self._cache.hits
+
+    @property
+    def misses(self):
+        """Number of loads read from disk."""
+        return self._cache.misses
+
+    def clear(self):
+        """Remove all cached objects and reset the counters."""
+        self._cache.clear()
+
+    def load(self, location):
+        """Load HDU as appropriate class, using the cache.
+
+        Parameters
+        ----------
+        location : `~gammapy.data.HDULocation`
+            HDU location
+
+        Returns
+        -------
+        object : object
+            Loaded object, see `~gammapy.data.HDULocation.load`
+        """
+        key = (str(location.path().resolve()), location.hdu_name)
+        return self._cache.get(key, location.load)
+
+
 class HDUIndexTable(Table):
     """HDU index table.
 
@@ -11,7 +11,7 @@ from gammapy.utils.table import table_row_to_dict
 from gammapy.utils.testing import Checker
 from gammapy.utils.time import time_ref_from_dict
 from ..irf import load_cta_irfs
-from .event_list import EventListChecker
+from .event_list import EventList, EventListChecker
 from .filters import ObservationFilter
 from .gti import GTI
 from .pointing import FixedPointingInfo
@@ -82,6 +82,9 @@ class DataStoreObservation:
     def load(self, hdu_type=None, hdu_class=None):
         """Load data file as appropriate object.
 
+        The object is taken from the data store cache (see
+        `~gammapy.data.HDUCache`) if it was loaded before.
+
         Parameters
         ----------
         hdu_type : str
@@ -95,13 +98,68 @@ class DataStoreObservation:
             Object depends on type, e.g. for `events` it's a `~gammapy.data.EventList`.
         """
         location = self.location(hdu_type=hdu_type, hdu_class=hdu_class)
-        return location.load()
+        return self.data_store.cache.load(location)
 
     @property
     def events(self):
-        """Load `gammapy.data.EventList` object and apply the filter."""
+        """Load `gammapy.data.EventList` object and apply the filter.
+
+        The returned event list is never the one in the data store cache,
+        so it can be modified.
+        """
         events = self.load(hdu_type="events")
-        return self.obs_filter.filter_events(events)
+        filtered_events = self.obs_filter.filter_events(events)
+
+        if filtered_events is events:
+            filtered_events = events.copy()
+
+        return filtered_events
+
+    def get_events(self, columns=None, energy_band=None, region=None, wcs=None):
+        """Read a subset of the `gammapy.data.EventList` and apply the filter.
+
+        The events are read with the given column and row selections pushed
+        down to the memory-mapped file (see `~gammapy.data.EventList.read`),
+        bypassing the data store cache.
+
+        Parameters
+        ----------
+        columns : list of str
+            Columns to read. By default all columns are read.
+        energy_band : `~astropy.units.Quantity`
+            Energy band ``[energy_min, energy_max)`` of events to read.
+        region : `~regions.SkyRegion` or str
+            Sky region of events to read.
+        wcs : `~astropy.wcs.WCS`
+            World coordinate system transformation used for ``region``.
+
+        Returns
+        -------
+        events : `~gammapy.data.EventList`
+            Event list
+        """
+        event_filters = self.obs_filter.event_filters
+
+        if columns is not None:
+            columns = list(columns)
+            for event_filter in event_filters:
+                if event_filter["type"] == "sky_region":
+                    required = ["RA", "DEC"]
+                else:
+                    required = [event_filter["opts"]["parameter"]]
+                columns += [_ for _ in required if _ not in columns]
+
+        location = self.location(hdu_type="events")
+        events = EventList.read(
+            location.path(),
+            hdu=location.hdu_name,
+            columns=columns,
+            energy_band=energy_band,
+            time_interval=self.obs_filter.time_filter,
+            region=region,
+            wcs=wcs,
+        )
+        return ObservationFilter(event_filters=event_filters).filter_events(events)
 
     @property
     def gti(self):
@@ -405,6 +463,22 @@ class Observation:
         ss += "- Livetime duration: {}\n".format(self.observation_live_time_duration)
         return ss
 
+    def get_events(self, columns=None, energy_band=None, region=None, wcs=None):
+        """Select a subset of the `gammapy.data.EventList`.
+
+        See `~gammapy.data.DataStoreObservation.get_events`. The events are
+        already in memory, so ``columns`` is ignored.
+        """
+        events = self.events
+
+        if energy_band is not None:
+            events = events.select_energy(energy_band)
+
+        if region is not None:
+            events = events.select_region(region, wcs)
+
+        return events
+
     @property
     def tstart(self):
         return self.gti.time_start[0]
@@ -2,6 +2,7 @@
 from numpy.testing import assert_allclose
 from astropy import units as u
 from astropy.coordinates import SkyCoord
+from astropy.io import fits
 from astropy.table import Table
 from regions import CircleSkyRegion, RectangleSkyRegion
 from gammapy.data import EventList, EventListBase, EventListLAT
@@ -173,3 +174,35 @@ class TestEventSelection:
         mask = Map.from_geom(geom, data=mask_data)
         new_list = self.events.select_map_mask(mask)
         assert len(new_list.table) == 2
+
+    def test_read_projected(self, tmp_path):
+        filename = tmp_path / "events.fits"
+        table = self.events.table.copy()
+        table["TIME"] = [0.0, 1.0, 2.0, 3.0] * u.s
+        table.meta.update({"MJDREFI": 51910, "MJDREFF": 0.0, "TIMESYS": "TT"})
+        fits.BinTableHDU(table, name="EVENTS").writeto(filename)
+
+        events = EventListBase.read(filename, columns=["RA", "ENERGY"])
+        assert events.table.colnames == ["RA", "ENERGY"]
+        assert len(events.table) == 4
+        assert events.table["ENERGY"].unit == "TeV"
+        assert events.table.meta["MJDREFI"] == 51910
+
+        events = EventListBase.read(
+            filename, columns=["ENERGY"], energy_band=[1.2, 20] * u.TeV
+        )
+        assert_allclose(events.table["ENERGY"], [1.5, 1.5, 10.0])
+
+        geom = WcsGeom.create(skydir=(0, 0), binsz=0.2, width=4.0 * u.deg, proj="TAN")
+        events = EventListBase.read(
+            filename,
+            region=self.on_regions[0],
+            wcs=geom.wcs,
+            energy_band=[1.2, 20] * u.TeV,
+        )
+        assert len(events.table) == 1
+        assert "TIME" in events.table.colnames
+
+        time_interval = events.time_ref + [1.5, 10] * u.s
+        events = EventListBase.read(filename, time_interval=time_interval)
+        assert_allclose(events.table["TIME"], [2.0, 3.0])
@@ -1,7 +1,8 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 from pathlib import Path
 import pytest
-from gammapy.data import HDUIndexTable
+import astropy.units as u
+from gammapy.data import GTI, HDUCache, HDUIndexTable, HDULocation
 from gammapy.utils.scripts import make_path
 from gammapy.utils.testing import requires_data
 
@@ -45,6 +46,56 @@ def test_hdu_index_table(hdu_index_table):
     assert hdu_index_table.summary().startswith("HDU index table")
 
 
+def make_gti_location(path, obs_id, file_name):
+    gti = GTI.create([0, 10] * u.s, [5, 20] * u.s)
+    if not (path / file_name).exists():
+        gti.write(path / file_name)
+    return HDULocation(obs_id, "gti", "gti", path, ".", file_name, "GTI")
+
+
+def test_hdu_cache(tmp_path):
+    cache = HDUCache()
+    location_1 = make_gti_location(tmp_path, 1, "gti_1.fits")
+    location_2 = make_gti_location(tmp_path, 2, "gti_1.fits")
+
+    gti = cache.load(location_1)
+    assert cache.misses == 1
+    assert cache.hits == 0
+    assert cache.size > 0
+
+    # a different observation pointing to the same file shares the object
+    assert cache.load(location_2) is gti
+    assert cache.misses == 1
+    assert cache.hits == 1
+    assert "hits     : 1" in str(cache)
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hits == 0
+
+
+def test_hdu_cache_eviction(tmp_path):
+    location_1 = make_gti_location(tmp_path, 1, "gti_1.fits")
+    location_2 = make_gti_location(tmp_path, 2, "gti_2.fits")
+
+    cache = HDUCache()
+    cache.load(location_1)
+    cache = HDUCache(max_size=cache.size)
+
+    cache.load(location_1)
+    cache.load(location_2)
+    assert len(cache) == 1
+
+    cache.load(location_1)
+    assert cache.misses == 3
+
+    cache = HDUCache(max_size=0)
+    cache.load(location_1)
+    cache.load(location_1)
+    assert cache.misses == 2
+    assert len(cache) == 0
+
+
 @requires_data()
 def test_hdu_index_table_hd_hap():
     """Test HESS HAP-HD data access."""
@@ -39,6 +39,18 @@ def test_data_store_observation(data_store):
     assert_skycoord_allclose(obs.target_radec, c)
 
 
+@requires_data()
+def test_data_store_observation_events_not_shared(data_store):
+    obs = data_store.obs(23523)
+    events = obs.events
+    n_events = len(events.table)
+    events.table.remove_rows(slice(0, 10))
+
+    # the cached event list is not modified
+    assert obs.events is not events
+    assert len(obs.events.table) == n_events
+
+
 @requires_dependency("matplotlib")
 @requires_data()
 def test_observation_peek(data_store):
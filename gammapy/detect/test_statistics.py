@@ -2,10 +2,14 @@
 """Functions to compute TS images."""
 import functools
 import logging
+import time
 import warnings
+from multiprocessing import Pool
 import numpy as np
 import scipy.optimize
+import astropy.units as u
 from astropy.convolution import CustomKernel, Kernel2D
+from astropy.table import Table
 from gammapy.stats import cash, cash_sum_cython
 from gammapy.utils.array import shape_2N, symmetric_crop_pad_width
 from ._test_statistics_cython import (
@@ -21,6 +25,9 @@ log = logging.getLogger(__name__)
 FLUX_FACTOR = 1e-12
 MAX_NITER = 20
 RTOL = 1e-3
+# maximum number of pixel values (positions x kernel size) processed at once
+# by the batch root finding method
+BATCH_SIZE = 2 ** 16
 
 
 def _extract_array(array, shape, position):
@@ -86,6 +93,11 @@ class TSMapEstimator:
         * ``'root newton'``
             Fit amplitude by finding the roots of the the derivative of the fit
             statistics using Newton's method.
+        * ``'root batch'``
+            Fit amplitude by finding the roots of the the derivative of the fit
+            statistics for blocks of pixels at once, using a vectorised Newton
+            method, that falls back to bisection where a step leaves the
+            bracket of the root. Recommended for large maps.
         * ``'leastsq iter'``
             Fit the amplitude by an iterative least square fit, that can be solved
             analytically.
@@ -103,6 +115,15 @@ class TSMapEstimator:
     rtol : float (0.001)
         Relative precision of the flux estimate. Used as a stopping criterion for
         the amplitude fit.
+    n_jobs : int (1)
+        Number of processes the tiles of the map are distributed to.
+    tile_size : int (200)
+        Size of the square map tiles in pixels.
+
+    Attributes
+    ----------
+    timing : `~astropy.table.Table`
+        Number of pixels and computation time per tile of the last `run`.
 
     Notes
     -----
@@ -132,9 +153,11 @@ class TSMapEstimator:
         ul_sigma=2,
         threshold=None,
         rtol=0.001,
+        n_jobs=1,
+        tile_size=200,
     ):
 
-        if method not in ["root brentq", "root newton", "leastsq iter"]:
+        if method not in ["root brentq", "root newton", "root batch", "leastsq iter"]:
             raise ValueError(f"Not a valid method: '{method}'")
 
         if error_method not in ["covar", "conf"]:
@@ -148,7 +171,10 @@ class TSMapEstimator:
             "ul_sigma": ul_sigma,
             "threshold": threshold,
             "rtol": rtol,
+            "n_jobs": n_jobs,
+            "tile_size": tile_size,
         }
+        self.timing = None
 
     @staticmethod
     def flux_default(maps, kernel):
@@ -293,7 +319,7 @@ class TSMapEstimator:
         if "mask" in maps:
             mask.data &= maps["mask"].data
 
-        if p["threshold"] or p["method"] == "root newton":
+        if p["threshold"] or p["method"] in ["root newton", "root batch"]:
             flux = self.flux_default(maps, kernel).data
         else:
             flux = None
@@ -309,14 +335,9 @@ class TSMapEstimator:
         error_method = p["error_method"] if "flux_err" in which else "none"
         ul_method = p["ul_method"] if "flux_ul" in which else "none"
 
-        wrap = functools.partial(
-            _ts_value,
-            counts=counts,
-            exposure=exposure,
-            background=background,
-            c_0=c_0,
+        compute_tile = functools.partial(
+            _ts_tile,
             kernel=kernel,
-            flux=flux,
             method=p["method"],
             error_method=error_method,
             threshold=p["threshold"],
@@ -326,21 +347,49 @@ class TSMapEstimator:
             rtol=p["rtol"],
         )
 
-        x, y = np.where(mask.data)
-        positions = list(zip(x, y))
+        tiles = _split_tiles(
+            mask=mask.data.astype(bool),
+            kernel_shape=kernel.shape,
+            tile_size=p["tile_size"],
+            counts=counts,
+            exposure=exposure,
+            background=background,
+            c_0=c_0,
+            flux=flux,
+        )
 
-        results = list(map(wrap, positions))
+        names = ["ts", "flux", "niter"]
+        names += [name for name in ["flux_err", "flux_ul"] if name in which]
 
-        # Set TS values at given positions
-        j, i = zip(*positions)
-        for name in ["ts", "flux", "niter"]:
-            result[name].data[j, i] = [_[name] for _ in results]
+        if p["n_jobs"] > 1:
+            pool = Pool(processes=p["n_jobs"])
+            # the tiles are computed independently, the order is kept
+            results = pool.imap(compute_tile, tiles)
+        else:
+            pool = None
+            results = map(compute_tile, tiles)
 
-        if "flux_err" in which:
-            result["flux_err"].data[j, i] = [_["flux_err"] for _ in results]
+        durations = []
+        try:
+            for tile, (values, duration) in zip(tiles, results):
+                # Set TS values at given positions
+                j, i = tile["positions"]
+                for name in names:
+                    result[name].data[j, i] = values[name]
+
+                log.debug(
+                    f"TS map tile {tile['slice']}: {len(j)} pixels in {duration:.2f} s"
+                )
+                durations.append(duration)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
 
-        if "flux_ul" in which:
-            result["flux_ul"].data[j, i] = [_["flux_ul"] for _ in results]
+        self.timing = Table()
+        self.timing["tile"] = [tile["slice"] for tile in tiles]
+        self.timing["n_pix"] = [len(tile["positions"][0]) for tile in tiles]
+        self.timing["time"] = durations * u.s
 
         # Compute sqrt(TS) values
         if "sqrt_ts" in which:
@@ -365,6 +414,224 @@ class TSMapEstimator:
         return info
 
 
+def _split_tiles(mask, kernel_shape, tile_size, **images):
+    """Split the positions to compute into square tiles.
+
+    For each tile the images are cut out, including a margin of half the
+    kernel size.
+
+    Parameters
+    ----------
+    mask : `~numpy.ndarray`
+        Mask of the positions to compute.
+    kernel_shape : tuple
+        Kernel shape.
+    tile_size : int
+        Tile size in pixels.
+    **images : dict of `~numpy.ndarray` or None
+        Images to cut out.
+
+    Returns
+    -------
+    tiles : list of dict
+        Tiles, with the global pixel "positions", the "offset" of the cutout
+        and the cutout images.
+    """
+    ny, nx = mask.shape
+    margin_y, margin_x = kernel_shape[0] // 2, kernel_shape[1] // 2
+
+    tiles = []
+    for y_lo in range(0, ny, tile_size):
+        for x_lo in range(0, nx, tile_size):
+            y_hi, x_hi = min(y_lo + tile_size, ny), min(x_lo + tile_size, nx)
+            j, i = np.where(mask[y_lo:y_hi, x_lo:x_hi])
+
+            if len(j) == 0:
+                continue
+
+            cutout_y_lo = max(y_lo - margin_y, 0)
+            cutout_x_lo = max(x_lo - margin_x, 0)
+            slices = (
+                slice(cutout_y_lo, y_hi + margin_y),
+                slice(cutout_x_lo, x_hi + margin_x),
+            )
+
+            tile = {
+                "slice": f"[{y_lo}:{y_hi}, {x_lo}:{x_hi}]",
+                "positions": (j + y_lo, i + x_lo),
+                "offset": (cutout_y_lo, cutout_x_lo),
+            }
+
+            for name, image in images.items():
+                tile[name] = None if image is None else image[slices]
+
+            tiles.append(tile)
+
+    return tiles
+
+
+def _ts_tile(tile, kernel, method, **kwargs):
+    """Compute TS values for all positions of a tile.
+
+    Parameters
+    ----------
+    tile : dict
+        Tile as returned by `_split_tiles`.
+    kernel : `astropy.convolution.Kernel2D`
+        Source model kernel
+    method : str
+        Amplitude fit method.
+    **kwargs : dict
+        Keyword arguments passed to `_ts_value` or `_ts_values_batch`.
+
+    Returns
+    -------
+    values : dict of `~numpy.ndarray`
+        Result values per position.
+    duration : float
+        Computation time in seconds.
+    """
+    t_start = time.perf_counter()
+
+    j, i = tile["positions"]
+    positions = (j - tile["offset"][0], i - tile["offset"][1])
+    names = ["counts", "exposure", "background", "c_0", "flux"]
+    images = {name: tile[name] for name in names}
+
+    if method == "root batch":
+        values = _ts_values_batch(positions, kernel=kernel, **images, **kwargs)
+    else:
+        results = [
+            _ts_value(position, kernel=kernel, method=method, **images, **kwargs)
+            for position in zip(*positions)
+        ]
+        names = ["ts", "flux", "niter", "flux_err", "flux_ul"]
+        values = {
+            name: np.array([_.get(name, np.nan) for _ in results]) for name in names
+        }
+
+    return values, time.perf_counter() - t_start
+
+
+def _ts_values_batch(
+    positions,
+    counts,
+    exposure,
+    background,
+    c_0,
+    kernel,
+    flux,
+    error_method,
+    error_sigma,
+    ul_method,
+    ul_sigma,
+    threshold,
+    rtol,
+):
+    """Compute TS values at many pixel positions at once.
+
+    Same as `_ts_value`, but the amplitudes are fitted with
+    `_root_amplitude_batch` for blocks of positions.
+
+    Parameters
+    ----------
+    positions : tuple of `~numpy.ndarray`
+        Pixel positions (j, i).
+
+    The other parameters are the same as for `_ts_value`.
+
+    Returns
+    -------
+    values : dict of `~numpy.ndarray`
+        Result values per position.
+    """
+    ny, nx = kernel.shape
+    width = counts.shape[1]
+    dy, dx = np.meshgrid(
+        np.arange(ny) - ny // 2, np.arange(nx) - nx // 2, indexing="ij"
+    )
+    offsets = (dy * width + dx).ravel()
+    kernel_data = kernel.array.ravel()
+
+    # flattened copies, so that the pixels around each position can be
+    # extracted with a single index array
+    counts, exposure = counts.ravel(), exposure.ravel()
+    background, c_0 = background.ravel(), c_0.ravel()
+
+    idx_positions = positions[0] * width + positions[1]
+    names = ["ts", "flux", "niter", "flux_err", "flux_ul"]
+    values = {name: np.full(len(idx_positions), np.nan) for name in names}
+
+    batch_size = max(BATCH_SIZE // kernel_data.size, 1)
+
+    for start in range(0, len(idx_positions), batch_size):
+        batch = slice(start, start + batch_size)
+        idx = idx_positions[batch, np.newaxis] + offsets
+
+        counts_, background_ = counts[idx], background[idx]
+        model = exposure[idx] * kernel_data
+        c_0_ = c_0[idx].sum(axis=1)
+
+        ts, amplitude = np.full((2, len(idx)), np.nan)
+        niter = np.zeros(len(idx))
+        fit = np.ones(len(idx), dtype=bool)
+
+        if threshold is not None:
+            amplitude_start = flux[positions[0][batch], positions[1][batch]]
+            with np.errstate(invalid="ignore", divide="ignore"):
+                c_1 = _cash_sum_batch(
+                    amplitude_start / FLUX_FACTOR, counts_, background_, model
+                )
+            # Don't fit if pixel significance is low
+            fit = c_0_ - c_1 >= threshold
+            ts[~fit] = ((c_0_ - c_1) * np.sign(amplitude_start))[~fit]
+            amplitude[~fit] = amplitude_start[~fit] / FLUX_FACTOR
+
+        counts_, background_, model = counts_[fit], background_[fit], model[fit]
+        if flux is not None:
+            flux_ = flux[positions[0][batch], positions[1][batch]][fit]
+        else:
+            flux_ = None
+
+        amplitude_fit, niter[fit] = _root_amplitude_batch(
+            counts_, background_, model, flux=flux_, rtol=rtol
+        )
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            c_1 = _cash_sum_batch(amplitude_fit, counts_, background_, model)
+
+        ts[fit] = (c_0_[fit] - c_1) * np.sign(amplitude_fit)
+        amplitude[fit] = amplitude_fit
+
+        flux_err, flux_ul = np.full((2, len(idx)), np.nan)
+
+        if error_method == "covar":
+            flux_err_fit = _compute_flux_err_covar(
+                amplitude_fit[:, np.newaxis], counts_, background_, model, axis=1
+            )
+            flux_err[fit] = flux_err_fit * error_sigma
+        elif error_method == "conf":
+            flux_err[fit] = FLUX_FACTOR * _compute_flux_err_conf_batch(
+                amplitude_fit, counts_, background_, model, c_1, error_sigma
+            )
+
+        if ul_method == "covar":
+            flux_ul[fit] = amplitude_fit * FLUX_FACTOR + ul_sigma * flux_err[fit]
+        elif ul_method == "conf":
+            flux_ul_fit = _compute_flux_err_conf_batch(
+                amplitude_fit, counts_, background_, model, c_1, ul_sigma
+            )
+            flux_ul[fit] = FLUX_FACTOR * (flux_ul_fit + amplitude_fit)
+
+        values["ts"][batch] = ts
+        values["flux"][batch] = amplitude * FLUX_FACTOR
+        values["niter"][batch] = niter
+        values["flux_err"][batch] = flux_err
+        values["flux_ul"][batch] = flux_ul
+
+    return values
+
+
 def _ts_value(
     position,
     counts,
@@ -599,13 +866,238 @@ def _root_amplitude_brentq(counts, background, model, rtol=RTOL):
             return np.nan, MAX_NITER
 
 
-def _compute_flux_err_covar(x, counts, background, model):
+def _root_amplitude_batch(counts, background, model, flux=None, rtol=RTOL):
+    """Fit amplitudes for many positions by finding roots using `_root_batch`.
+
+    See Appendix A Stewart (2009).
+
+    Parameters
+    ----------
+    counts : `~numpy.ndarray`
+        Count values around the positions, with shape (n_positions, n_pix).
+    background : `~numpy.ndarray`
+        Background values around the positions.
+    model : `~numpy.ndarray`
+        Model templates to fit.
+    flux : `~numpy.ndarray`, optional
+        Starting values for the fit.
+
+    Returns
+    -------
+    amplitude : `~numpy.ndarray`
+        Fitted flux amplitudes.
+    niter : `~numpy.ndarray`
+        Number of iterations needed for the fit.
+    """
+    bounds = _amplitude_bounds_batch(counts, background, model)
+    amplitude_min, amplitude_max, amplitude_min_total = bounds
+
+    amplitude, niter = amplitude_min_total, np.zeros(len(counts))
+    has_counts = counts.sum(axis=1) > 0
+
+    # bins with zero model do not contribute to the root function
+    positive = model[has_counts] > 0
+    args = (
+        np.where(positive, counts[has_counts], 0),
+        np.where(positive, background[has_counts], 1),
+        np.where(positive, model[has_counts] * FLUX_FACTOR, 0),
+        np.where(positive, model[has_counts], 0).sum(axis=1) * FLUX_FACTOR,
+    )
+
+    if flux is not None:
+        flux = flux[has_counts] / FLUX_FACTOR
+
+    root, niter[has_counts] = _root_batch(
+        _f_cash_root_batch,
+        amplitude_min[has_counts],
+        amplitude_max[has_counts],
+        args=args,
+        start=flux,
+        rtol=rtol,
+    )
+    amplitude[has_counts] = np.maximum(root, amplitude_min_total[has_counts])
+    return amplitude, niter
+
+
+def _root_batch(func, lower, upper, args, start=None, rtol=RTOL, maxiter=MAX_NITER):
+    """Find the roots of many monotonic functions at once.
+
+    Uses Newton's method. Where a step leaves the bracket of the root, a
+    bisection step is done instead. Like for `scipy.optimize.brentq` the roots
+    must be bracketed by ``lower`` and ``upper``, NaN is returned otherwise,
+    or if the root finding does not converge within ``maxiter`` iterations.
+
+    Parameters
+    ----------
+    func : callable
+        Function ``func(x, *args)`` returning the function values and
+        derivatives at ``x``.
+    lower, upper : `~numpy.ndarray`
+        Bounds of the roots.
+    args : tuple of `~numpy.ndarray`
+        Arguments passed to ``func``, with one row per root.
+    start : `~numpy.ndarray`, optional
+        Starting values. By default, or where the starting value is not
+        within the bounds, a secant step between the bounds is used.
+    rtol : float
+        Relative tolerance of the roots.
+    maxiter : int
+        Maximum number of iterations.
+
+    Returns
+    -------
+    root : `~numpy.ndarray`
+        Roots.
+    niter : `~numpy.ndarray`
+        Number of iterations.
+    """
+    root = np.full(len(lower), np.nan)
+    niter = np.full(len(lower), maxiter)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        f_lower, _ = func(lower, *args)
+        f_upper, _ = func(upper, *args)
+
+    for bound, f_bound in [(upper, f_upper), (lower, f_lower)]:
+        on_bound = f_bound == 0
+        root[on_bound], niter[on_bound] = bound[on_bound], 0
+
+    bracketed = f_lower * f_upper < 0
+    (rows,) = np.nonzero(bracketed)
+    args = [arg[bracketed] for arg in args]
+    lo, hi, f_lo, f_hi = lower[rows], upper[rows], f_lower[rows], f_upper[rows]
+    sign_lo = np.sign(f_lo)
+
+    x = lo - f_lo * (hi - lo) / (f_hi - f_lo)
+    if start is not None:
+        start = start[rows]
+        inside = (start > lo) & (start < hi)
+        x[inside] = start[inside]
+
+    active = np.ones(len(rows), dtype=bool)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        for iteration in range(1, maxiter + 1):
+            value, derivative = func(x, *args)
+
+            below = np.sign(value) == sign_lo
+            lo, hi = np.where(below, x, lo), np.where(below, hi, x)
+
+            x_new = x - value / derivative
+            outside = ~((x_new > lo) & (x_new < hi))
+            x_new = np.where(outside, 0.5 * (lo + hi), x_new)
+
+            done = (value == 0) | (np.abs(x_new - x) <= rtol * np.abs(x_new))
+            done &= active
+            root[rows[done]], niter[rows[done]] = x_new[done], iteration
+
+            active &= ~done
+            x = x_new
+
+            if not active.any():
+                break
+
+            # converged roots are only dropped once they are the majority,
+            # to avoid copying the arguments on every iteration
+            if active.sum() < 0.5 * len(active):
+                rows, x, lo, hi = rows[active], x[active], lo[active], hi[active]
+                sign_lo = sign_lo[active]
+                args = [arg[active] for arg in args]
+                active = active[active]
+
+    return root, niter
+
+
+def _amplitude_bounds_batch(counts, background, model):
+    """Compute bounds for the roots of `_f_cash_root_batch`.
+
+    Vectorised version of `_amplitude_bounds_cython`.
+    """
+    positive = model > 0
+    rows = np.arange(len(counts))
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        sn = np.where(positive, background / model, np.inf)
+
+    s_model = np.where(positive, model, 0).sum(axis=1)
+    s_counts = np.where(counts > 0, counts, 0).sum(axis=1)
+    sn_min_total = np.minimum(sn.min(axis=1), 1e14)
+
+    sn = np.where(counts > 0, sn, np.inf)
+    idx_min = np.argmin(sn, axis=1)
+    sn_min, c_min = sn[rows, idx_min], counts[rows, idx_min]
+
+    undefined = sn_min >= 1e14
+    sn_min[undefined], c_min[undefined] = 1e14, 1
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        b_min = c_min / s_model - sn_min
+        b_max = s_counts / s_model - sn_min
+    return b_min / FLUX_FACTOR, b_max / FLUX_FACTOR, -sn_min_total / FLUX_FACTOR
+
+
+def _f_cash_root_batch(x, counts, background, model, model_sum):
+    """Vectorised `_f_cash_root_cython` and its derivative.
+
+    Parameters
+    ----------
+    x : `~numpy.ndarray`
+        Model amplitudes.
+    counts : `~numpy.ndarray`
+        Count values around the positions, with shape (n_positions, n_pix).
+    background : `~numpy.ndarray`
+        Background values around the positions.
+    model : `~numpy.ndarray`
+        Source templates (multiplied with exposure and ``FLUX_FACTOR``).
+    model_sum : `~numpy.ndarray`
+        Sum of the source templates.
+    """
+    ratio = model / (x[:, np.newaxis] * model + background)
+    weighted = ratio * counts
+    value = model_sum - weighted.sum(axis=1)
+    derivative = np.einsum("ij,ij->i", weighted, ratio)
+    return 2 * value, 2 * derivative
+
+
+def _cash_sum_batch(x, counts, background, model):
+    """Summed cash statistics for many positions, see `f_cash`."""
+    npred = background + x[:, np.newaxis] * FLUX_FACTOR * model
+    return cash(counts, npred).sum(axis=1)
+
+
+def _compute_flux_err_covar(x, counts, background, model, axis=None):
     """
     Compute amplitude errors using inverse 2nd derivative method.
     """
     with np.errstate(invalid="ignore", divide="ignore"):
         stat = (model ** 2 * counts) / (background + x * FLUX_FACTOR * model) ** 2
-        return np.sqrt(1.0 / stat.sum())
+        return np.sqrt(1.0 / stat.sum(axis=axis))
+
+
+def _compute_flux_err_conf_batch(
+    amplitude, counts, background, model, c_1, error_sigma
+):
+    """
+    Compute amplitude errors for many positions using likelihood profile method.
+    """
+    positive = model > 0
+    args = (
+        counts,
+        background,
+        model,
+        c_1 + error_sigma ** 2,
+        np.where(positive, counts, 0),
+        np.where(positive, background, 1),
+        np.where(positive, model * FLUX_FACTOR, 0),
+        np.where(positive, model, 0).sum(axis=1) * FLUX_FACTOR,
+    )
+
+    def ts_diff(x, counts, background, model, c_1, *args):
+        derivative, _ = _f_cash_root_batch(x, *args)
+        return _cash_sum_batch(x, counts, background, model) - c_1, derivative
+
+    root, _ = _root_batch(ts_diff, amplitude, amplitude + 1e4, args=args, rtol=1e-3)
+    return root - amplitude
 
 
 def _compute_flux_err_conf(amplitude, counts, background, model, c_1, error_sigma):
@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import pytest
-from numpy.testing import assert_allclose
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
 from astropy.convolution import Gaussian2DKernel
 from gammapy.detect import TSMapEstimator
 from gammapy.maps import Map
@@ -58,3 +59,54 @@ def test_large_kernel(input_maps):
 
     with pytest.raises(ValueError):
         ts_estimator.run(input_maps, kernel=kernel)
+
+
+@pytest.fixture(scope="session")
+def fake_maps():
+    m = Map.create(npix=(40, 30), binsz=0.02)
+    y, x = np.indices(m.data.shape)
+    source = 20 * np.exp(-((y - 15) ** 2 + (x - 20) ** 2) / (2 * 2 ** 2))
+    counts = np.random.RandomState(0).poisson(2 + source)
+    return {
+        "counts": m.copy(data=counts.astype(float)),
+        "exposure": m.copy(data=np.full(m.data.shape, 1e11)),
+        "background": m.copy(data=np.full(m.data.shape, 2.0)),
+    }
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"threshold": 1},
+        {"error_method": "conf", "ul_method": "conf", "rtol": 1e-5},
+    ],
+)
+def test_compute_ts_map_batch(fake_maps, kwargs):
+    kernel = Gaussian2DKernel(2)
+
+    result = TSMapEstimator(**kwargs).run(fake_maps, kernel=kernel)
+
+    ts_estimator = TSMapEstimator(method="root batch", tile_size=16, **kwargs)
+    result_batch = ts_estimator.run(fake_maps, kernel=kernel)
+
+    assert len(ts_estimator.timing) == 4
+    assert ts_estimator.timing["n_pix"].sum() == np.isfinite(result["ts"].data).sum()
+
+    for name in ["ts", "flux", "flux_err", "flux_ul"]:
+        assert_allclose(result_batch[name].data, result[name].data, rtol=1e-2)
+
+    assert_allclose(result_batch["ts"].data[15, 20], 1042.81, rtol=1e-3)
+
+
+def test_compute_ts_map_n_jobs(fake_maps):
+    kernel = Gaussian2DKernel(2)
+
+    ts_estimator = TSMapEstimator(method="root batch", tile_size=16)
+    result = ts_estimator.run(fake_maps, kernel=kernel)
+
+    ts_estimator = TSMapEstimator(method="root batch", tile_size=16, n_jobs=2)
+    result_parallel = ts_estimator.run(fake_maps, kernel=kernel)
+
+    for name in ["ts", "flux", "niter", "flux_err", "flux_ul"]:
+        assert_equal(result_parallel[name].data, result[name].data)
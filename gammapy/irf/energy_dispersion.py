@@ -824,12 +824,9 @@ class EnergyDispersion2D:
         e_true = self.data.axis("e_true").edges if e_true is None else e_true
         e_reco = self.data.axis("e_true").edges if e_reco is None else e_reco
 
-        data = []
-        for energy in MapAxis.from_edges(e_true, interp="log").center:
-            vec = self.get_response(offset=offset, e_true=energy, e_reco=e_reco)
-            data.append(vec)
+        energy = MapAxis.from_edges(e_true, interp="log").center
+        data = self.get_response(offset=offset, e_true=energy, e_reco=e_reco)
 
-        data = np.asarray(data)
         e_lo, e_hi = e_true[:-1], e_true[1:]
         ereco_lo, ereco_hi = (e_reco[:-1], e_reco[1:])
 
@@ -848,10 +845,13 @@ class EnergyDispersion2D:
         energy band. In each reco bin, you integrate with a riemann sum over
         the default migra bin of your analysis.
 
+        All true energies are integrated in one vectorised pass, see
+        `_integrate_migra`.
+
         Parameters
         ----------
         e_true : `~astropy.units.Quantity`
-            True energy
+            True energy, scalar or 1D array
         e_reco : `~astropy.units.Quantity`, None
             Reconstructed energy axis
         offset : `~astropy.coordinates.Angle`
@@ -862,19 +862,18 @@ class EnergyDispersion2D:
         Returns
         -------
         rv : `~numpy.ndarray`
-            Redistribution vector
+            Redistribution vector, or array of shape ``(len(e_true), len(e_reco) - 1)``
+            for an array of true energies.
         """
         e_true = Quantity(e_true)
 
         if e_reco is None:
             # Default: e_reco nodes = migra nodes * e_true nodes
-            e_reco = self.data.axis("migra").edges * e_true
+            migra_e_reco = Quantity(self.data.axis("migra").edges).to_value("")
         else:
-            # Translate given e_reco binning to migra at bin center
-            e_reco = Quantity(e_reco)
-
-        # migration value of e_reco bounds
-        migra_e_reco = e_reco / e_true
+            # migration value of e_reco bounds
+            e_true_col = e_true.reshape(e_true.shape + (1,))
+            migra_e_reco = (Quantity(e_reco) / e_true_col).to_value("")
 
         # Define a vector of migration with mig_step step
         mrec_min = self.data.axis("migra").edges[0]
@@ -882,22 +881,15 @@ class EnergyDispersion2D:
         mig_array = np.arange(mrec_min, mrec_max, migra_step)
 
         # Compute energy dispersion probability dP/dm for each element of migration array
-        vals = self.data.evaluate(offset=offset, e_true=e_true, migra=mig_array)
-
-        # Compute normalized cumulative sum to prepare integration
-        with np.errstate(invalid="ignore"):
-            tmp = np.nan_to_num(np.cumsum(vals) / np.sum(vals))
-
-        # Determine positions (bin indices) of e_reco bounds in migration array
-        pos_mig = np.digitize(migra_e_reco, mig_array) - 1
-        # We ensure that no negative values are found
-        pos_mig = np.maximum(pos_mig, 0)
-
-        # We compute the difference between 2 successive bounds in e_reco
-        # to get integral over reco energy bin
-        integral = np.diff(tmp[pos_mig])
+        vals = self.data.evaluate(
+            offset=offset,
+            e_true=e_true.reshape(e_true.shape + (1,)),
+            migra=mig_array,
+        )
 
-        return integral
+        mig_array = Quantity(mig_array).to_value("")
+        integral = _integrate_migra(vals.value, mig_array, migra_e_reco)
+        return integral.reshape(e_true.shape + integral.shape[-1:])
 
     def plot_migration(self, ax=None, offset=None, e_true=None, migra=None, **kwargs):
         """Plot energy dispersion for given offset and true energy.
@@ -1039,3 +1031,44 @@ class EnergyDispersion2D:
     def to_fits(self, name="ENERGY DISPERSION"):
         """Convert to `~astropy.io.fits.BinTable`."""
         return fits.BinTableHDU(self.to_table(), name=name)
+
+
+def _integrate_migra(values, migra, migra_e_reco):
+    """Integrate energy dispersion probabilities over reconstructed energy bins.
+
+    The probabilities are integrated with a riemann sum over the migration
+    array, using the normalised cumulative sum. All leading axes, e.g. true
+    energies and positions, are processed in one array operation.
+
+    Parameters
+    ----------
+    values : `~numpy.ndarray`
+        Probability dP/dm, with the migration as last axis.
+    migra : `~numpy.ndarray`
+        Migration array the probabilities are evaluated on.
+    migra_e_reco : `~numpy.ndarray`
+        Migration values of the reconstructed energy bin edges, as last axis.
+        The leading axes are broadcast against the ones of ``values``.
+
+    Returns
+    -------
+    integral : `~numpy.ndarray`
+        Probability per reconstructed energy bin, with the reconstructed
+        energy as last axis.
+    """
+    # Compute normalized cumulative sum to prepare integration
+    with np.errstate(invalid="ignore"):
+        cdf = np.cumsum(values, axis=-1) / np.sum(values, axis=-1, keepdims=True)
+    cdf = np.nan_to_num(cdf)
+
+    # Determine positions (bin indices) of e_reco bounds in migration array
+    # We ensure that no negative values are found
+    idx = np.maximum(np.digitize(migra_e_reco, migra) - 1, 0)
+
+    shape = np.broadcast(cdf[..., :1], idx[..., :1]).shape[:-1]
+    cdf = np.broadcast_to(cdf, shape + cdf.shape[-1:])
+    idx = np.broadcast_to(idx, shape + idx.shape[-1:])
+
+    # We compute the difference between 2 successive bounds in e_reco
+    # to get integral over reco energy bin
+    return np.diff(np.take_along_axis(cdf, idx, axis=-1), axis=-1)
@@ -136,6 +136,18 @@ class TestEnergyDispersion2D:
         assert_allclose(pdf.sum(), 1)
         assert_allclose(pdf.max(), 0.0130256, rtol=1e-5)
 
+    def test_get_response_array(self):
+        offset = 0.7 * u.deg
+        e_true = [0.5, 1, 3] * u.TeV
+        e_reco = np.logspace(-1, 1, 11) * u.TeV
+
+        pdf = self.edisp2.get_response(offset=offset, e_true=e_true, e_reco=e_reco)
+        assert pdf.shape == (3, 10)
+
+        for idx, energy in enumerate(e_true):
+            desired = self.edisp2.get_response(offset, energy, e_reco)
+            assert_allclose(pdf[idx], desired, atol=1e-15)
+
     def test_exporter(self):
         # Check RMF exporter
         offset = Angle(0.612, "deg")
@@ -3,11 +3,14 @@
 from .base import *
 from .geom import *
 from .hpx import *
+from .hpxchunked import *
 from .hpxmap import *
 from .hpxnd import *
 from .image_utils import *
 from .plotting import *
 from .profile import *
+from .reproject import *
 from .wcs import *
 from .wcsmap import *
 from .wcsnd import *
+from .wcssparse import *
@@ -272,7 +272,9 @@ class Map(abc.ABC):
 
             return WcsNDMap
         elif map_type == "wcs-sparse":
-            raise NotImplementedError()
+            from .wcssparse import WcsSparseMap
+
+            return WcsSparseMap
         elif map_type == "hpx":
             from .hpxnd import HpxNDMap
 
@@ -447,6 +449,51 @@ class Map(abc.ABC):
         """
         pass
 
+    def reproject(self, geom, method="bilinear", oversample=4, fill_value=0):
+        """Reproject the map onto a different spatial geometry.
+
+        The reprojection weights are stored in a sparse matrix, which is
+        cached in `~gammapy.maps.REPROJECT_CACHE` and applied to all image
+        planes with a single matrix product. The non-spatial axes of the
+        map are kept.
+
+        Parameters
+        ----------
+        geom : `Geom`
+            Target geometry, its non-spatial axes are ignored.
+        method : {"nearest", "bilinear", "flux"}
+            Reprojection method. Use "flux" to preserve the integral over
+            the pixels, e.g. for counts maps.
+        oversample : int
+            Oversampling factor of the map pixels to compute the pixel
+            overlap for ``method="flux"``.
+        fill_value : float
+            Value of target pixels not covered by the map.
+
+        Returns
+        -------
+        map : `Map`
+            Reprojected map.
+        """
+        from .reproject import make_reproject_matrix
+
+        matrix = make_reproject_matrix(self.geom, geom, method, oversample)
+        geom_out = geom.to_image().to_cube(self.geom.axes)
+
+        data = self.data.reshape((-1, matrix.shape[1]))
+        data = (matrix @ data.T).T
+
+        covered = matrix.getnnz(axis=1) > 0
+        data[:, ~covered] = fill_value
+
+        return Map.from_geom(
+            geom_out,
+            data=data.reshape(geom_out.data_shape),
+            meta=copy.deepcopy(self.meta),
+            unit=self.unit,
+            dtype=data.dtype,
+        )
+
     def slice_by_idx(self, slices):
         """Slice sub map from map object.
 
@@ -723,9 +770,24 @@ class Map(abc.ABC):
         """
         pass
 
-    def fill_events(self, events):
-        """Fill event coordinates (`~gammapy.data.EventList`)."""
-        self.fill_by_coord(events.map_coord(self.geom))
+    def fill_events(self, events, chunk_size=None):
+        """Fill event coordinates (`~gammapy.data.EventList`).
+
+        Parameters
+        ----------
+        events : `~gammapy.data.EventList`
+            Event list.
+        chunk_size : int
+            Number of events filled at once, to limit the memory used for
+            the intermediate coordinate arrays. By default all events are
+            filled at once.
+        """
+        n_events = len(events.table)
+        chunk_size = n_events if chunk_size is None else chunk_size
+
+        for start in range(0, n_events, max(chunk_size, 1)):
+            chunk = events.select_row_subset(slice(start, start + chunk_size))
+            self.fill_by_coord(chunk.map_coord(self.geom))
 
     def fill_by_coord(self, coords, weights=None):
         """Fill pixels at ``coords`` with given ``weights``.
@@ -0,0 +1,414 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Batched convolution of map data cubes."""
+import numpy as np
+import scipy.signal
+from astropy.table import Table
+from gammapy.utils.cache import LRUCache
+
+try:
+    import scipy.fft as _fft
+    from scipy.fft import next_fast_len
+except ImportError:
+    # scipy < 1.4, no worker support
+    import numpy.fft as _fft
+    from scipy.fftpack import next_fast_len
+
+try:
+    from scipy.signal import oaconvolve
+except ImportError:
+    # scipy < 1.4, no overlap-add convolution
+    oaconvolve = None
+
+__all__ = [
+    "ConvolutionCostModel",
+    "FFTConvolver",
+    "FFT_CONVOLVER",
+]
+
+CONVOLUTION_METHODS = ["direct", "fft", "oa"]
+
+
+def _fft_shape(image_shape, kernel_shape):
+    return tuple(
+        next_fast_len(int(ni + nk - 1)) for ni, nk in zip(image_shape, kernel_shape)
+    )
+
+
+def _oa_block_shape(image_shape, kernel_shape):
+    # block FFT length of a few times the kernel size, which is close to the
+    # optimum for small kernels. Returns None if a single block is used.
+    block_shape = tuple(next_fast_len(4 * int(nk)) for nk in kernel_shape)
+    full_shape = [ni + nk - 1 for ni, nk in zip(image_shape, kernel_shape)]
+    if all(nb >= nf for nb, nf in zip(block_shape, full_shape)):
+        return None
+    return block_shape
+
+
+class ConvolutionCostModel:
+    """Cost model to choose the convolution method for given shapes.
+
+    The run time of each method is modeled as ``overhead + scale * ops``,
+    where ``ops`` is the number of operations of the method:
+
+    * "direct": ``n_images * image_pixels * kernel_pixels``
+    * "fft": ``n_images * fft_pixels * log2(fft_pixels)`` of the padded image
+    * "oa": ``n_images * n_blocks * block_pixels * log2(block_pixels)`` for
+      overlap-add convolution with blocks of a few times the kernel size
+
+    The default coefficients are rough estimates. Use the benchmark script
+    ``dev/maps/convolution_benchmark.py`` and `ConvolutionCostModel.read` to
+    tune them for a given machine.
+
+    Parameters
+    ----------
+    coefficients : dict
+        Dict with method names as keys and ``(overhead, scale)`` in seconds
+        as values.
+
+    Examples
+    --------
+    ::
+
+        from gammapy.maps.convolution import ConvolutionCostModel
+
+        # table written by dev/maps/convolution_benchmark.py
+        cost_model = ConvolutionCostModel.read("convolution-benchmark.ecsv")
+        print(cost_model.choose(image_shape=(40, 40), kernel_shape=(21, 21)))
+    """
+
+    default_coefficients = {
+        "direct": (5e-6, 1e-9),
+        "fft": (5e-5, 4e-9),
+        "oa": (1e-4, 4e-9),
+    }
+
+    def __init__(self, coefficients=None):
+        self.coefficients = dict(self.default_coefficients)
+        if coefficients is not None:
+            self.coefficients.update(coefficients)
+
+    def __str__(self):
+        ss = f"{self.__class__.__name__}\n\n"
+        for method, (overhead, scale) in self.coefficients.items():
+            ss += f"\t{method:8s} : overhead={overhead:.2e} s, scale={scale:.2e} s\n"
+        return ss
+
+    @property
+    def methods(self):
+        """Convolution methods available with the installed scipy version."""
+        return [
+            method
+            for method in CONVOLUTION_METHODS
+            if method in self.coefficients and (method != "oa" or oaconvolve)
+        ]
+
+    @staticmethod
+    def ops(method, image_shape, kernel_shape, n_images=1):
+        """Number of operations of a convolution method.
+
+        Parameters
+        ----------
+        method : {"direct", "fft", "oa"}
+            Convolution method.
+        image_shape, kernel_shape : tuple of int
+            Spatial shapes of the image and kernel.
+        n_images : int
+            Number of image planes.
+
+        Returns
+        -------
+        ops : float
+            Number of operations.
+        """
+        if method == "direct":
+            return float(n_images * np.prod(image_shape) * np.prod(kernel_shape))
+
+        if method == "fft":
+            fft_shape = _fft_shape(image_shape, kernel_shape)
+            n_blocks = 1
+        elif method == "oa":
+            fft_shape = _oa_block_shape(image_shape, kernel_shape)
+            if fft_shape is None:
+                fft_shape = _fft_shape(image_shape, kernel_shape)
+                n_blocks = 1
+            else:
+                steps = [nb - nk + 1 for nb, nk in zip(fft_shape, kernel_shape)]
+                n_blocks = np.prod(
+                    [
+                        np.ceil((ni + nk - 1) / step)
+                        for ni, nk, step in zip(image_shape, kernel_shape, steps)
+                    ]
+                )
+        else:
+            raise ValueError(f"Invalid convolution method: {method!r}")
+
+        npix = np.prod(fft_shape)
+        return float(n_images * n_blocks * npix * np.log2(max(npix, 2)))
+
+    def cost(self, method, image_shape, kernel_shape, n_images=1):
+        """Estimated run time of a convolution method.
+
+        Parameters
+        ----------
+        method : {"direct", "fft", "oa"}
+            Convolution method.
+        image_shape, kernel_shape : tuple of int
+            Spatial shapes of the image and kernel.
+        n_images : int
+            Number of image planes.
+
+        Returns
+        -------
+        cost : float
+            Estimated run time in seconds.
+        """
+        overhead, scale = self.coefficients[method]
+        return overhead + scale * self.ops(method, image_shape, kernel_shape, n_images)
+
+    def choose(self, image_shape, kernel_shape, n_images=1):
+        """Choose the convolution method with the lowest estimated run time.
+
+        Parameters
+        ----------
+        image_shape, kernel_shape : tuple of int
+            Spatial shapes of the image and kernel.
+        n_images : int
+            Number of image planes.
+
+        Returns
+        -------
+        method : {"direct", "fft", "oa"}
+            Convolution method.
+        """
+        return min(
+            self.methods,
+            key=lambda method: self.cost(method, image_shape, kernel_shape, n_images),
+        )
+
+    @classmethod
+    def from_table(cls, table):
+        """Fit the cost model coefficients to a benchmark table.
+
+        Parameters
+        ----------
+        table : `~astropy.table.Table`
+            Benchmark table with columns "method", "image_size",
+            "kernel_size", "n_images" and "time" in seconds.
+
+        Returns
+        -------
+        cost_model : `ConvolutionCostModel`
+            Cost model.
+        """
+        coefficients = {}
+        for method in np.unique(table["method"]):
+            rows = table[table["method"] == method]
+            ops = [
+                cls.ops(
+                    method,
+                    (row["image_size"],) * 2,
+                    (row["kernel_size"],) * 2,
+                    row["n_images"],
+                )
+                for row in rows
+            ]
+            if len(rows) > 1:
+                scale, overhead = np.polyfit(ops, rows["time"], deg=1)
+            else:
+                scale, overhead = rows["time"][0] / ops[0], 0.0
+            coefficients[str(method)] = (max(overhead, 0.0), max(scale, 0.0))
+
+        return cls(coefficients)
+
+    @classmethod
+    def read(cls, filename):
+        """Read cost model from a benchmark table file.
+
+        Parameters
+        ----------
+        filename : str or `~pathlib.Path`
+            Benchmark table file, e.g. in ECSV format.
+
+        Returns
+        -------
+        cost_model : `ConvolutionCostModel`
+            Cost model.
+        """
+        return cls.from_table(Table.read(str(filename)))
+
+
+class FFTConvolver:
+    """Batched FFT convolution over the two spatial axes of a data cube.
+
+    All image planes are transformed with a single real FFT, multiplied with
+    the kernel FFT and transformed back. The kernel FFTs are cached per
+    kernel and padded shape, so that repeated convolutions with the same
+    kernel, e.g. in a likelihood fit, only transform the data.
+
+    For small images, e.g. model cutouts of about the size of the PSF kernel,
+    the FFT set-up dominates. With ``method="auto"`` direct or overlap-add
+    convolution is used instead, if the cost model predicts it to be faster.
+
+    Parameters
+    ----------
+    workers : int
+        Number of workers used by `scipy.fft`. Requires scipy >= 1.4 and is
+        ignored otherwise.
+    cache_size : int
+        Maximum number of cached kernel FFTs.
+    cost_model : `ConvolutionCostModel`
+        Cost model used to choose the method for ``method="auto"``.
+
+    Examples
+    --------
+    ::
+
+        import numpy as np
+        from gammapy.maps.convolution import FFTConvolver
+
+        convolver = FFTConvolver(workers=4)
+        data = np.random.random((10, 200, 200))
+        kernel = np.ones((5, 5)) / 25
+        convolved = convolver.convolve(data, kernel)
+    """
+
+    def __init__(self, workers=1, cache_size=16, cost_model=None):
+        self.workers = workers
+        self.kernel_cache = LRUCache(max_size=cache_size)
+        self.cost_model = cost_model or ConvolutionCostModel()
+
+    def __str__(self):
+        return (
+            f"{self.__class__.__name__}\n\n"
+            f"\tworkers  : {self.workers}\n\n" + str(self.kernel_cache)
+        )
+
+    def _fft_kwargs(self, workers=None):
+        if _fft.__name__ == "scipy.fft":
+            return {"workers": self.workers if workers is None else workers}
+        return {}
+
+    @staticmethod
+    def fft_shape(image_shape, kernel_shape):
+        """Padded spatial shape of the FFT.
+
+        Parameters
+        ----------
+        image_shape, kernel_shape : tuple of int
+            Spatial shapes of the image and kernel.
+
+        Returns
+        -------
+        shape : tuple of int
+            Shape of the full convolution, rounded up to fast FFT sizes.
+        """
+        return _fft_shape(image_shape, kernel_shape)
+
+    def kernel_fft(self, kernel, shape):
+        """Real FFT of the kernel over the last two axes.
+
+        The result is cached and must not be modified.
+
+        Parameters
+        ----------
+        kernel : `~numpy.ndarray`
+            Convolution kernel.
+        shape : tuple of int
+            Padded spatial shape.
+
+        Returns
+        -------
+        kernel_fft : `~numpy.ndarray`
+            Kernel FFT.
+        """
+        kernel = np.ascontiguousarray(kernel)
+        # the kernel values are part of the key, so modified or re-created
+        # kernels with the same values are handled correctly
+        key = (kernel.shape, kernel.dtype.str, kernel.tobytes(), shape)
+
+        def compute():
+            values = _fft.rfftn(kernel, shape, axes=(-2, -1), **self._fft_kwargs())
+            values.flags.writeable = False
+            return values
+
+        return self.kernel_cache.get(key, compute)
+
+    def convolve(self, data, kernel, workers=None, method="fft"):
+        """Convolve data with a kernel, keeping the shape of the data.
+
+        This is equivalent to calling ``scipy.signal.fftconvolve`` with
+        ``mode="same"`` on every image plane.
+
+        Parameters
+        ----------
+        data : `~numpy.ndarray`
+            Data with the two spatial axes last.
+        kernel : `~numpy.ndarray`
+            Convolution kernel. If the kernel is two dimensional, it is applied
+            to all image planes, otherwise the non-spatial axes must match the
+            ones of the data.
+        workers : int
+            Number of FFT workers, by default `workers` is used.
+        method : {"fft", "direct", "oa", "auto"}
+            Convolution method. With "auto" the method with the lowest
+            estimated run time according to `cost_model` is used.
+
+        Returns
+        -------
+        convolved : `~numpy.ndarray`
+            Convolved data, in the precision of the inputs.
+        """
+        dtype = np.result_type(data.dtype, kernel.dtype, np.float32)
+        data = data.astype(dtype, copy=False)
+        kernel = kernel.astype(dtype, copy=False)
+
+        image_shape = data.shape[-2:]
+
+        if method == "auto":
+            n_images = int(np.prod(data.shape[:-2]))
+            method = self.cost_model.choose(image_shape, kernel.shape[-2:], n_images)
+
+        if method == "direct":
+            return self._convolve_direct(data, kernel)
+        elif method == "oa":
+            return self._convolve_oa(data, kernel)
+        elif method != "fft":
+            raise ValueError(f"Invalid convolution method: {method!r}")
+
+        shape = self.fft_shape(image_shape, kernel.shape[-2:])
+
+        fft_kwargs = self._fft_kwargs(workers)
+        values = _fft.rfftn(data, shape, axes=(-2, -1), **fft_kwargs)
+        values *= self.kernel_fft(kernel, shape)
+        values = _fft.irfftn(values, shape, axes=(-2, -1), **fft_kwargs)
+
+        # same as the "same" mode of `scipy.signal.fftconvolve`
+        start = [(nk - 1) // 2 for nk in kernel.shape[-2:]]
+        slices = tuple(slice(s, s + n) for s, n in zip(start, image_shape))
+        return values[(Ellipsis,) + slices].astype(dtype, copy=False)
+
+    @staticmethod
+    def _convolve_direct(data, kernel):
+        images = data.reshape((-1,) + data.shape[-2:])
+        kernels = np.broadcast_to(kernel, data.shape[:-2] + kernel.shape[-2:])
+        kernels = kernels.reshape((-1,) + kernel.shape[-2:])
+
+        convolved = np.empty_like(images)
+        for idx, (image, kernel_image) in enumerate(zip(images, kernels)):
+            convolved[idx] = scipy.signal.convolve(
+                image, kernel_image, mode="same", method="direct"
+            )
+        return convolved.reshape(data.shape)
+
+    @staticmethod
+    def _convolve_oa(data, kernel):
+        if oaconvolve is None:
+            raise ValueError("Overlap-add convolution requires scipy >= 1.4")
+
+        kernel = kernel.reshape((1,) * (data.ndim - kernel.ndim) + kernel.shape)
+        convolved = oaconvolve(data, kernel, mode="same", axes=(-2, -1))
+        return convolved.astype(data.dtype, copy=False)
+
+
+FFT_CONVOLVER = FFTConvolver()
+"""Default convolver used by `~gammapy.maps.WcsNDMap.convolve`."""
@@ -1,11 +1,14 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Utilities for dealing with HEALPix projections and mappings."""
 import copy
+import hashlib
 import re
 import numpy as np
 from astropy.coordinates import SkyCoord
 from astropy.io import fits
 from astropy.units import Quantity
+from gammapy.utils.cache import LRUCache
+from gammapy.utils.scripts import make_path
 from .geom import (
     Geom,
     MapCoord,
@@ -19,7 +22,14 @@ from .wcs import WcsGeom
 
 # Not sure if we should expose this in the docs or not:
 # HPX_FITS_CONVENTIONS, HpxConv
-__all__ = ["HpxGeom"]
+__all__ = ["HpxGeom", "HPX2WCS_CACHE"]
+
+HPX2WCS_CACHE = LRUCache(max_size=64, max_bytes=2 ** 30)
+"""Process-wide cache of `HpxToWcsMapping` objects.
+
+Mappings are shared by all pairs of HEALPix and WCS geometries with the same
+pixels, see ``HPX2WCS_CACHE.to_table()`` for the cached mappings.
+"""
 
 # Approximation of the size of HEALPIX pixels (in degrees) for a particular order.
 # Used to convert from HEALPIX to WCS-based projections.
@@ -588,6 +598,7 @@ class HpxGeom(Geom):
         self._ipix = None
         self._rmap = None
         self._region = region
+        self._cache_key_value = None
         self._create_lookup(region)
 
         if self._ipix is not None:
@@ -604,6 +615,17 @@ class HpxGeom(Geom):
         )
         self._center_pix = self.coord_to_pix(self._center_coord)
 
+    @property
+    def _cache_key(self):
+        """Hash of the pixelisation, used in `HPX2WCS_CACHE`."""
+        if self._cache_key_value is None:
+            sha = hashlib.sha1(f"{self.nest}{self.frame}{self.region}".encode())
+            sha.update(np.asarray(self.nside, dtype=np.int64).tobytes())
+            if self._ipix is not None:
+                sha.update(np.asarray(self._ipix, dtype=np.int64).tobytes())
+            self._cache_key_value = sha.hexdigest()
+        return self._cache_key_value
+
     @property
     def data_shape(self):
         """Shape of the Numpy data array matching this geometry."""
@@ -1701,12 +1723,23 @@ class HpxGeom(Geom):
 class HpxToWcsMapping:
     """Stores the indices need to convert from HEALPIX to WCS.
 
+    For geometries with a single NSIDE the mapping is also stored as a sparse
+    matrix, so that all image planes are converted with a single matrix
+    product. Use `create` to get a mapping from the `HPX2WCS_CACHE` and
+    `write` and `read` to store it on disk.
+
     Parameters
     ----------
     hpx : `~HpxGeom`
         HEALPix geometry object.
     wcs : `~gammapy.maps.WcsGeom`
         WCS geometry object.
+    ipix : `~numpy.ndarray`
+        HEALPix pixel indices for each WCS pixel.
+    mult_val : `~numpy.ndarray`
+        1 / number of WCS pixels pointing at each HEALPix pixel.
+    npix : tuple
+        Shape of the WCS grid (nx, ny).
     """
 
     def __init__(self, hpx, wcs, ipix, mult_val, npix):
@@ -1717,6 +1750,7 @@ class HpxToWcsMapping:
         self._npix = npix
         self._lmap = self._hpx[self._ipix]
         self._valid = self._lmap >= 0
+        self._matrix = self._make_matrix() if self._valid.ndim == 1 else None
 
     @property
     def hpx(self):
@@ -1753,10 +1787,38 @@ class HpxToWcsMapping:
         """Array ``(nx, ny)`` of bool: which WCS pixel in inside the HEALPIX region."""
         return self._valid
 
+    @property
+    def matrix(self):
+        """Sparse mapping matrix (`~scipy.sparse.csr_matrix`).
+
+        The matrix has shape (ny * nx, npix), where npix is the number of
+        HEALPix pixels of the geometry, and maps the flattened HEALPix data of
+        an image plane to the flattened WCS data. None for geometries with
+        more than one NSIDE.
+        """
+        return self._matrix
+
+    def _make_matrix(self):
+        from scipy.sparse import csr_matrix
+
+        shape = tuple([int(t.flat[0]) for t in self._npix])
+        idx = np.flatnonzero(self._valid)
+        ix, iy = np.unravel_index(idx, shape)
+
+        rows = np.ravel_multi_index((iy, ix), shape[::-1])
+        cols = self._lmap[idx]
+        values = np.ones(len(idx))
+
+        npix = int(np.max(self._hpx.npix))
+        return csr_matrix((values, (rows, cols)), shape=(shape[0] * shape[1], npix))
+
     @classmethod
     def create(cls, hpx, wcs):
         """Create HEALPix to WCS geometry pixel mapping.
 
+        Mappings are cached in `HPX2WCS_CACHE` and shared between all
+        geometries with the same pixels.
+
         Parameters
         ----------
         hpx : `~HpxGeom`
@@ -1769,8 +1831,90 @@ class HpxToWcsMapping:
         hpx2wcs : `~HpxToWcsMapping`
 
         """
-        ipix, mult_val, npix = make_hpx_to_wcs_mapping(hpx, wcs)
-        return cls(hpx, wcs, ipix, mult_val, npix)
+        wcs = wcs.to_image()
+
+        def compute():
+            ipix, mult_val, npix = make_hpx_to_wcs_mapping(hpx, wcs)
+            return cls(hpx, wcs, ipix, mult_val, npix)
+
+        return HPX2WCS_CACHE.get((hpx._cache_key, wcs._cache_key), compute)
+
+    def to_hdulist(self):
+        """Convert mapping to a `~astropy.io.fits.HDUList`.
+
+        Returns
+        -------
+        hdulist : `~astropy.io.fits.HDUList`
+            HDU list with the pixel indices and weights in the "IPIX" and
+            "MULT_VAL" HDUs and the geometries in the headers.
+        """
+        if self._hpx.region == "explicit":
+            raise ValueError("Mappings of explicit HEALPix geometries can't be stored.")
+
+        hdulist = fits.HDUList(
+            [
+                fits.PrimaryHDU(),
+                fits.ImageHDU(self._ipix, self._hpx.make_header(), name="IPIX"),
+                fits.ImageHDU(self._mult_val, name="MULT_VAL"),
+                fits.ImageHDU(header=self._wcs.make_header(), name="WCS"),
+            ]
+        )
+
+        if self._hpx.axes:
+            hdulist.append(self._hpx.make_bands_hdu(hdu="IPIX_BANDS"))
+
+        return hdulist
+
+    @classmethod
+    def from_hdulist(cls, hdulist):
+        """Create mapping from a `~astropy.io.fits.HDUList`.
+
+        Parameters
+        ----------
+        hdulist : `~astropy.io.fits.HDUList`
+            HDU list in the format written by `to_hdulist`.
+
+        Returns
+        -------
+        hpx2wcs : `~HpxToWcsMapping`
+        """
+        hdu_bands = hdulist["IPIX_BANDS"] if "IPIX_BANDS" in hdulist else None
+        hpx = HpxGeom.from_header(hdulist["IPIX"].header, hdu_bands=hdu_bands)
+        wcs = WcsGeom.from_header(hdulist["WCS"].header)
+
+        ipix = hdulist["IPIX"].data.astype(int)
+        mult_val = hdulist["MULT_VAL"].data.astype(float)
+        return cls(hpx, wcs, ipix, mult_val, wcs.npix)
+
+    def write(self, filename, overwrite=False):
+        """Write mapping to a FITS file.
+
+        Parameters
+        ----------
+        filename : str or `~pathlib.Path`
+            Filename.
+        overwrite : bool
+            Overwrite existing file.
+        """
+        filename = make_path(filename)
+        self.to_hdulist().writeto(filename, overwrite=overwrite)
+
+    @classmethod
+    def read(cls, filename):
+        """Read mapping from a FITS file.
+
+        Parameters
+        ----------
+        filename : str or `~pathlib.Path`
+            Filename.
+
+        Returns
+        -------
+        hpx2wcs : `~HpxToWcsMapping`
+        """
+        filename = make_path(filename)
+        with fits.open(str(filename), memmap=False) as hdulist:
+            return cls.from_hdulist(hdulist)
 
     def fill_wcs_map_from_hpx_data(
         self, hpx_data, wcs_data, normalize=True, fill_nan=True
@@ -1788,11 +1932,28 @@ class HpxToWcsMapping:
         fill_nan : bool
             Fill pixels outside the HPX geometry with NaN.
         """
-        # FIXME: Do we want to flatten mapping arrays?
-
         shape = tuple([t.flat[0] for t in self._npix])
-        if self._valid.ndim != 1:
-            shape = hpx_data.shape[:-1] + shape
+
+        if self._matrix is not None:
+            valid = self._valid.reshape(shape).T
+            data = hpx_data.reshape((-1, hpx_data.shape[-1]))
+
+            # one matrix product for all image planes
+            values = (self._matrix @ data.T).T
+            values = values.reshape(hpx_data.shape[:-1] + valid.shape)
+
+            if normalize:
+                values *= self._mult_val.reshape(shape).T
+
+            wcs_data[..., valid] = values[..., valid]
+
+            if fill_nan:
+                wcs_data[..., ~valid] = np.nan
+
+            return wcs_data
+
+        # FIXME: Do we want to flatten mapping arrays?
+        shape = hpx_data.shape[:-1] + shape
 
         valid = np.where(self._valid.reshape(shape))
         lmap = self._lmap[self._valid]
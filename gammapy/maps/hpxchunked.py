@@ -0,0 +1,534 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import copy
+import tempfile
+import numpy as np
+from astropy.units import Quantity
+from gammapy.utils.scripts import make_path
+from .geom import MapCoord, pix_tuple_to_idx
+from .hpx import HpxToWcsMapping, get_subpixels, get_superpixels, is_power2
+from .hpxmap import HpxMap
+from .utils import INVALID_INDEX, interp_to_order
+
+__all__ = ["HpxChunkedMap"]
+
+
+class HpxChunkedMap(HpxMap):
+    """All-sky HEALPix map stored in memory-mapped chunk files.
+
+    The sky is split into superpixels of NSIDE ``nside_chunk``. In the nested
+    scheme the subpixels of a superpixel form a contiguous range of pixel
+    indices, so every chunk holds the data of all non-spatial bins for one
+    range of pixels and is stored as a ``.npy`` file in ``path``. Chunks are
+    memory-mapped on access and only created when data is written, so the
+    memory usage is set by the chunk size and not by the size of the map.
+
+    `fill_by_idx`, `get_by_idx`, `set_by_idx`, `interp_by_coord`, `to_wcs`,
+    `sum_over_axes`, `upsample`, `downsample` and `to_ud_graded` process the
+    data chunk by chunk. Accessing `data` loads the full array into memory
+    and returns a read-only copy, use e.g. `set_by_idx` or assign to `data`
+    to modify the map.
+    As the map is all-sky with nested pixel ordering, `pad`, `crop` and
+    `to_swapped` are not supported, neither is `interp_by_pix`.
+
+    Parameters
+    ----------
+    geom : `~gammapy.maps.HpxGeom`
+        All-sky HEALPix geometry with nested pixel ordering and a single NSIDE.
+    path : str or `~pathlib.Path`
+        Directory of the chunk files. Existing chunk files are re-used. By
+        default a temporary directory is used, which is deleted together with
+        the map.
+    nside_chunk : int
+        NSIDE of the chunks. By default chunks of 65536 pixels per image plane
+        are used.
+    data : `~numpy.ndarray`
+        Data array to write to the chunks.
+    dtype : str, optional
+        Data type, default is float32
+    meta : `dict`
+        Dictionary to store meta data.
+    unit : str or `~astropy.units.Unit`
+        The map unit
+
+    Examples
+    --------
+    ::
+
+        from gammapy.maps import HpxGeom, HpxChunkedMap, MapAxis
+
+        axis = MapAxis.from_energy_bounds("100 MeV", "1 TeV", nbin=30)
+        geom = HpxGeom.create(nside=4096, frame="galactic", axes=[axis])
+        m = HpxChunkedMap(geom, path="counts-chunks")
+
+        for events in event_lists:
+            m.fill_events(events)
+
+        image = m.sum_over_axes().to_wcs(width_pix=3600)
+    """
+
+    def __init__(
+        self,
+        geom,
+        path=None,
+        nside_chunk=None,
+        data=None,
+        dtype="float32",
+        meta=None,
+        unit="",
+    ):
+        if not (geom.is_allsky and geom.is_regular and geom.nest):
+            raise ValueError(
+                "Chunked maps require an all-sky geometry with a single NSIDE"
+                " and nested pixel ordering."
+            )
+
+        nside = int(geom.nside.flat[0])
+        if nside_chunk is None:
+            nside_chunk = max(nside // 256, 1)
+
+        if nside_chunk > nside:
+            raise ValueError(f"nside_chunk must be <= {nside}, got {nside_chunk}")
+
+        if path is None:
+            self._tmpdir = tempfile.TemporaryDirectory(prefix="gammapy-hpx-")
+            path = self._tmpdir.name
+
+        self._path = make_path(path)
+        self._path.mkdir(parents=True, exist_ok=True)
+        self._nside_chunk = nside_chunk
+        self._dtype = np.dtype(dtype)
+        super().__init__(geom, data, meta, unit)
+
+    @property
+    def path(self):
+        """Directory of the chunk files (`~pathlib.Path`)"""
+        return self._path
+
+    @property
+    def nside_chunk(self):
+        """NSIDE of the chunks (int)"""
+        return self._nside_chunk
+
+    @property
+    def nside(self):
+        """NSIDE of the map (int)"""
+        return int(self.geom.nside.flat[0])
+
+    @property
+    def npix_chunk(self):
+        """Number of pixels per image plane in a chunk (int)"""
+        return (self.nside // self.nside_chunk) ** 2
+
+    @property
+    def chunk_shape(self):
+        """Shape of the data array of a chunk (tuple)"""
+        return self.geom.data_shape[:-1] + (self.npix_chunk,)
+
+    def _chunk_filename(self, idx):
+        return self.path / f"chunk_{idx:08d}.npy"
+
+    def get_chunk(self, idx, create=False):
+        """Get the memory-mapped data of a chunk.
+
+        Parameters
+        ----------
+        idx : int
+            Chunk index, i.e. the nested pixel index at NSIDE ``nside_chunk``.
+        create : bool
+            Create a zero filled chunk if it does not exist.
+
+        Returns
+        -------
+        data : `~numpy.memmap` or None
+            Chunk data, None if the chunk does not exist and ``create=False``.
+        """
+        filename = self._chunk_filename(idx)
+
+        if filename.exists():
+            return np.load(str(filename), mmap_mode="r+")
+        elif create:
+            return np.lib.format.open_memmap(
+                str(filename), mode="w+", dtype=self._dtype, shape=self.chunk_shape
+            )
+
+        return None
+
+    def iter_chunks(self):
+        """Iterate over the existing chunks.
+
+        Yields
+        ------
+        idx : int
+            Chunk index.
+        pix : `~numpy.ndarray`
+            HEALPix pixel indices of the chunk.
+        data : `~numpy.memmap`
+            Chunk data.
+        """
+        idxs = sorted(int(f.stem.split("_")[1]) for f in self.path.glob("chunk_*.npy"))
+
+        for idx in idxs:
+            pix = get_subpixels(idx, self.nside_chunk, self.nside, nest=True)
+            yield idx, pix.ravel(), self.get_chunk(idx)
+
+    def _group_by_chunk(self, pix):
+        """Split pixel indices by chunk.
+
+        Yields the chunk index, the positions in ``pix`` and the pixel
+        indices within the chunk.
+        """
+        chunks = get_superpixels(pix, self.nside, self.nside_chunk, nest=True)
+        order = np.argsort(chunks, kind="stable")
+        idxs, start = np.unique(chunks[order], return_index=True)
+
+        for idx, sel in zip(idxs, np.split(order, start[1:])):
+            yield int(idx), sel, pix[sel] - idx * self.npix_chunk
+
+    def _load_data(self):
+        data = np.zeros(self.geom.data_shape, dtype=self._dtype)
+
+        for idx, pix, chunk in self.iter_chunks():
+            data[..., pix] = chunk
+
+        return data
+
+    @property
+    def data(self):
+        """Data array (`~numpy.ndarray`), loaded from all chunks.
+
+        The array is a read-only copy, in-place modifications raise an error.
+        """
+        data = self._load_data()
+        data.flags.writeable = False
+        return data
+
+    @data.setter
+    def data(self, val):
+        if val is None:
+            return
+
+        if val.shape != self.geom.data_shape:
+            raise ValueError(
+                f"Shape {val.shape!r} does not match map data shape {self.geom.data_shape!r}"
+            )
+
+        if isinstance(val, Quantity):
+            raise TypeError("Map data must be a Numpy array. Set unit separately")
+
+        self._dtype = val.dtype
+        for idx in range(12 * self.nside_chunk ** 2):
+            values = val[..., idx * self.npix_chunk : (idx + 1) * self.npix_chunk]
+            chunk = self.get_chunk(idx, create=np.any(values))
+            if chunk is not None:
+                chunk[...] = values
+
+    @classmethod
+    def from_map(cls, m, path=None, nside_chunk=None):
+        """Create a chunked map from a HEALPix map.
+
+        Parameters
+        ----------
+        m : `~gammapy.maps.HpxNDMap`
+            All-sky HEALPix map.
+        path : str or `~pathlib.Path`
+            Directory of the chunk files.
+        nside_chunk : int
+            NSIDE of the chunks.
+
+        Returns
+        -------
+        map_out : `HpxChunkedMap`
+            Chunked map.
+        """
+        return cls(
+            m.geom,
+            path=path,
+            nside_chunk=nside_chunk,
+            data=m.data,
+            meta=copy.deepcopy(m.meta),
+            unit=m.unit,
+        )
+
+    def to_dense(self):
+        """Load the map into memory.
+
+        Returns
+        -------
+        map_out : `~gammapy.maps.HpxNDMap`
+            HEALPix map.
+        """
+        from .hpxnd import HpxNDMap
+
+        return HpxNDMap(
+            self.geom,
+            data=self._load_data(),
+            meta=copy.deepcopy(self.meta),
+            unit=self.unit,
+        )
+
+    def _init_copy(self, **kwargs):
+        """Init a new chunked map in a temporary directory."""
+        kwargs.setdefault("geom", copy.deepcopy(self.geom))
+        kwargs.setdefault("meta", copy.deepcopy(self.meta))
+        kwargs.setdefault("unit", self.unit)
+        kwargs.setdefault("dtype", self._dtype)
+        kwargs.setdefault("nside_chunk", self.nside_chunk)
+
+        copy_data = "data" not in kwargs
+        map_out = self.__class__(**kwargs)
+
+        if copy_data:
+            for idx, _, chunk in self.iter_chunks():
+                map_out.get_chunk(idx, create=True)[...] = chunk
+
+        return map_out
+
+    def fill_by_idx(self, idx, weights=None):
+        idx = pix_tuple_to_idx(idx)
+        msk = np.all(np.stack([t != INVALID_INDEX.int for t in idx]), axis=0)
+        idx = [t[msk] for t in idx]
+
+        if weights is not None:
+            if isinstance(weights, Quantity):
+                weights = weights.to_value(self.unit)
+            weights = weights[msk]
+
+        for chunk_idx, sel, pix in self._group_by_chunk(idx[0]):
+            chunk = self.get_chunk(chunk_idx, create=True)
+            idx_chunk = [pix] + [t[sel] for t in idx[1:]]
+            idx_chunk = np.ravel_multi_index(idx_chunk, chunk.T.shape)
+            idx_chunk, idx_inv = np.unique(idx_chunk, return_inverse=True)
+            weights_chunk = None if weights is None else weights[sel]
+            chunk.T.flat[idx_chunk] += np.bincount(idx_inv, weights=weights_chunk)
+
+    def set_by_idx(self, idx, vals):
+        idx = np.broadcast_arrays(*pix_tuple_to_idx(idx))
+        vals = np.broadcast_to(vals, idx[0].shape).ravel()
+        idx = [t.ravel() for t in idx]
+
+        for chunk_idx, sel, pix in self._group_by_chunk(idx[0]):
+            chunk = self.get_chunk(chunk_idx, create=True)
+            chunk.T[tuple([pix] + [t[sel] for t in idx[1:]])] = vals[sel]
+
+    def get_by_idx(self, idx):
+        idx = np.broadcast_arrays(*pix_tuple_to_idx(idx))
+        shape = idx[0].shape
+        idx = [t.ravel() for t in idx]
+
+        valid = np.all(np.stack([t != INVALID_INDEX.int for t in idx]), axis=0)
+        vals = np.zeros(idx[0].shape, dtype=self._dtype)
+
+        for chunk_idx, sel, pix in self._group_by_chunk(np.where(valid, idx[0], 0)):
+            chunk = self.get_chunk(chunk_idx)
+            if chunk is not None:
+                vals[sel] = chunk.T[tuple([pix] + [t[sel] for t in idx[1:]])]
+
+        if np.issubdtype(self._dtype, np.floating):
+            vals[~valid] = np.nan
+
+        return vals.reshape(shape)
+
+    def interp_by_coord(self, coords, interp=1):
+        # inherited docstring
+        import healpy as hp
+
+        coords = MapCoord.create(coords, frame=self.geom.frame)
+
+        order = interp_to_order(interp)
+        if order != 1:
+            raise ValueError(f"Invalid interpolation order: {order!r}")
+
+        theta, phi = coords.theta, coords.phi
+        m = ~np.isfinite(theta)
+        theta[m], phi[m] = 0, 0
+
+        pix, wts = hp.get_interp_weights(self.nside, theta, phi, nest=True)
+        wts[:, m] = 0
+
+        if self.geom.is_image:
+            return np.sum(self.get_by_idx((pix,)) * wts, axis=0)
+
+        val = np.zeros(pix.shape[1:])
+
+        # Loop over function values at corners
+        for i in range(2 ** len(self.geom.axes)):
+            pix_i = []
+            wt = np.ones(pix.shape[1:])[np.newaxis, ...]
+            for j, ax in enumerate(self.geom.axes):
+                idx = ax.coord_to_idx(coords[ax.name])
+                idx = np.clip(idx, 0, len(ax.center) - 2)
+
+                w = ax.center[idx + 1] - ax.center[idx]
+                c = Quantity(coords[ax.name], ax.center.unit, copy=False).value
+
+                if i & (1 << j):
+                    wt *= (c - ax.center[idx].value) / w.value
+                    pix_i += [idx + 1]
+                else:
+                    wt *= 1.0 - (c - ax.center[idx].value) / w.value
+                    pix_i += [idx]
+
+            wt[~np.isfinite(wt)] = 0
+            idx = [pix] + [np.broadcast_to(t, pix.shape) for t in pix_i]
+            val += np.nansum(wts * wt * self.get_by_idx(idx), axis=0)
+
+        return val
+
+    def interp_by_pix(self, pix, interp=None):
+        raise NotImplementedError(
+            "Interpolation by pixel is not supported for HEALPix maps,"
+            " use interp_by_coord."
+        )
+
+    def sum_over_axes(self):
+        """Sum over all non-spatial dimensions.
+
+        Returns
+        -------
+        map_out : `~HpxChunkedMap`
+            Summed map, stored in a temporary directory.
+        """
+        map_out = self._init_copy(geom=self.geom.to_image(), data=None)
+        axis = tuple(range(len(self.chunk_shape) - 1))
+
+        for idx, _, chunk in self.iter_chunks():
+            map_out.get_chunk(idx, create=True)[...] = np.nansum(chunk, axis=axis)
+
+        return map_out
+
+    def to_wcs(
+        self,
+        sum_bands=False,
+        normalize=True,
+        proj="AIT",
+        oversample=2,
+        width_pix=None,
+        hpx2wcs=None,
+    ):
+        from .wcsnd import WcsNDMap
+
+        if sum_bands:
+            return self.sum_over_axes().to_wcs(
+                normalize=normalize,
+                proj=proj,
+                oversample=oversample,
+                width_pix=width_pix,
+                hpx2wcs=hpx2wcs,
+            )
+
+        if hpx2wcs is None:
+            wcs = self.geom.make_wcs(
+                proj=proj, oversample=oversample, width_pix=width_pix, drop_axes=True
+            )
+            hpx2wcs = HpxToWcsMapping.create(self.geom, wcs)
+
+        npix = tuple([int(t.flat[0]) for t in hpx2wcs.npix])
+        wcs = hpx2wcs.wcs.to_cube(self.geom.axes)
+
+        wcs_data = np.full(wcs.data_shape, np.nan)
+        valid = np.flatnonzero(hpx2wcs.valid)
+        ix, iy = np.unravel_index(valid, npix)
+        wcs_data[..., iy, ix] = 0
+
+        ipix = hpx2wcs.ipix[valid]
+        mult_val = hpx2wcs.mult_val[valid]
+
+        for chunk_idx, sel, pix in self._group_by_chunk(ipix):
+            chunk = self.get_chunk(chunk_idx)
+            if chunk is not None:
+                values = chunk[..., pix]
+                if normalize:
+                    values = values * mult_val[sel]
+                wcs_data[..., iy[sel], ix[sel]] = values
+
+        return WcsNDMap(wcs, wcs_data, unit=self.unit)
+
+    def pad(self, pad_width, mode="constant", cval=0, order=1):
+        raise NotImplementedError("Chunked maps are all-sky and can't be padded.")
+
+    def crop(self, crop_width):
+        raise NotImplementedError("Chunked maps are all-sky and can't be cropped.")
+
+    def upsample(self, factor, preserve_counts=True):
+        """Upsample the spatial dimension by a given factor.
+
+        In the nested scheme the subpixels of a pixel are consecutive, so the
+        values of each chunk are repeated ``factor ** 2`` times.
+
+        Parameters
+        ----------
+        factor : int
+            Upsampling factor, a power of 2.
+        preserve_counts : bool
+            Preserve the integral over each bin.
+
+        Returns
+        -------
+        map_out : `HpxChunkedMap`
+            Upsampled map, stored in a temporary directory.
+        """
+        geom = self.geom.upsample(factor)
+        map_out = self._init_copy(geom=geom, data=None)
+        n_sub = factor ** 2
+
+        for idx, _, chunk in self.iter_chunks():
+            values = np.repeat(chunk, n_sub, axis=-1)
+            if preserve_counts:
+                values = values / n_sub
+            map_out.get_chunk(idx, create=True)[...] = values
+
+        return map_out
+
+    def downsample(self, factor, preserve_counts=True):
+        """Downsample the spatial dimension by a given factor.
+
+        In the nested scheme the subpixels of a pixel are consecutive, so the
+        values of each chunk are summed in groups of ``factor ** 2``. If the
+        new NSIDE is smaller than ``nside_chunk``, it is used as NSIDE of the
+        chunks of the downsampled map.
+
+        Parameters
+        ----------
+        factor : int
+            Downsampling factor, a power of 2.
+        preserve_counts : bool
+            Preserve the integral over each bin.
+
+        Returns
+        -------
+        map_out : `HpxChunkedMap`
+            Downsampled map, stored in a temporary directory.
+        """
+        geom = self.geom.downsample(factor)
+        nside_chunk = min(self.nside_chunk, self.nside // factor)
+        map_out = self._init_copy(geom=geom, data=None, nside_chunk=nside_chunk)
+        n_sub = factor ** 2
+
+        for idx, pix, chunk in self.iter_chunks():
+            if self.npix_chunk >= n_sub:
+                shape = chunk.shape[:-1] + (-1, n_sub)
+                values = np.nansum(chunk.reshape(shape), axis=-1)
+                chunk_out = map_out.get_chunk(idx, create=True)
+            else:
+                # the chunk is part of a single pixel, i.e. output chunk
+                values = np.nansum(chunk, axis=-1, keepdims=True)
+                chunk_out = map_out.get_chunk(pix[0] // n_sub, create=True)
+
+            if not preserve_counts:
+                values = values / n_sub
+            chunk_out += values.astype(chunk_out.dtype)
+
+        return map_out
+
+    def to_swapped(self):
+        raise NotImplementedError("Chunked maps require nested pixel ordering.")
+
+    def to_ud_graded(self, nside, preserve_counts=False):
+        # inherited docstring
+        if not is_power2(nside):
+            raise ValueError(f"NSIDE must be a power of 2, got {nside}")
+
+        if nside >= self.nside:
+            return self.upsample(nside // self.nside, preserve_counts=preserve_counts)
+        else:
+            return self.downsample(self.nside // nside, preserve_counts=preserve_counts)
@@ -159,7 +159,7 @@ class HpxNDMap(HpxMap):
                 width_pix=width_pix,
             )
 
-        # FIXME: Check whether the old mapping is still valid and reuse it
+        # mappings are cached, see HPX2WCS_CACHE
         if hpx2wcs is None:
             hpx2wcs = self.make_wcs_mapping(
                 oversample=oversample, proj=proj, width_pix=width_pix
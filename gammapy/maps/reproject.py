@@ -0,0 +1,165 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Reprojection of maps between geometries with sparse weight matrices."""
+import numpy as np
+from scipy.sparse import csr_matrix
+from gammapy.utils.cache import LRUCache
+from .geom import MapCoord
+from .utils import INVALID_INDEX
+
+__all__ = ["REPROJECT_CACHE"]
+
+REPROJECT_CACHE = LRUCache(max_size=64, max_bytes=2 ** 30)
+"""Process-wide cache of reprojection weight matrices.
+
+Matrices are shared by all pairs of geometries with the same pixels, see
+``REPROJECT_CACHE.to_table()`` for the cached matrices.
+"""
+
+REPROJECT_METHODS = ["nearest", "bilinear", "flux"]
+
+
+def _ravel_image_idx(geom, idx):
+    """Flat index into the image data array, -1 for invalid pixels."""
+    valid = np.all(np.stack([t != INVALID_INDEX.int for t in idx]), axis=0)
+    flat = np.full(valid.shape, -1, dtype=np.int64)
+
+    if geom.is_hpx:
+        # global to local HEALPix pixel index
+        flat[valid] = geom[idx[0][valid]]
+    else:
+        idx = tuple([t[valid] for t in idx[::-1]])
+        flat[valid] = np.ravel_multi_index(idx, geom.data_shape)
+
+    return flat
+
+
+def _weights_nearest(geom_in, coords):
+    idx_in = _ravel_image_idx(geom_in, geom_in.coord_to_idx(coords))
+    return idx_in[None], np.ones((1,) + idx_in.shape)
+
+
+def _weights_bilinear(geom_in, coords):
+    if geom_in.is_hpx:
+        import healpy as hp
+
+        coords = MapCoord.create(coords, frame=geom_in.frame)
+        theta, phi = coords.theta, coords.phi
+        invalid = ~np.isfinite(theta)
+        theta[invalid], phi[invalid] = 0, 0
+
+        pix, weights = hp.get_interp_weights(
+            int(geom_in.nside.flat[0]), theta, phi, nest=geom_in.nest
+        )
+        idx_in = _ravel_image_idx(geom_in, (pix,))
+        weights[:, invalid] = 0
+        return idx_in, weights
+
+    ny, nx = geom_in.data_shape
+    x, y = geom_in.coord_to_pix(coords)[:2]
+
+    with np.errstate(invalid="ignore"):
+        valid = (x >= 0) & (x <= nx - 1) & (y >= 0) & (y <= ny - 1)
+
+    x0 = np.clip(np.floor(np.where(valid, x, 0)), 0, max(nx - 2, 0)).astype(int)
+    y0 = np.clip(np.floor(np.where(valid, y, 0)), 0, max(ny - 2, 0)).astype(int)
+    dx, dy = np.where(valid, x - x0, 0), np.where(valid, y - y0, 0)
+
+    idx_in, weights = [], []
+    for ix, wx in [(x0, 1 - dx), (np.minimum(x0 + 1, nx - 1), dx)]:
+        for iy, wy in [(y0, 1 - dy), (np.minimum(y0 + 1, ny - 1), dy)]:
+            idx_in.append(np.where(valid, iy * nx + ix, -1))
+            weights.append(wx * wy)
+
+    return np.stack(idx_in), np.stack(weights)
+
+
+def _make_matrix_flux(geom_in, geom_out, oversample):
+    # sub-sample the input pixels and distribute their solid angle on the
+    # output pixels, the weights of every input pixel sum up to the covered
+    # fraction
+    geom_sub = geom_in.upsample(oversample)
+    coords = geom_sub.get_coord()
+
+    idx_in = _ravel_image_idx(geom_in, geom_in.coord_to_idx(coords)).ravel()
+    idx_out = _ravel_image_idx(geom_out, geom_out.coord_to_idx(coords)).ravel()
+
+    solid_angle = geom_sub.solid_angle().to_value("sr")
+    solid_angle = np.broadcast_to(solid_angle, coords.shape).ravel()
+
+    has_input = idx_in >= 0
+    solid_angle_in = np.bincount(
+        idx_in[has_input],
+        weights=solid_angle[has_input],
+        minlength=int(np.prod(geom_in.data_shape)),
+    )
+
+    valid = has_input & (idx_out >= 0)
+    weights = solid_angle[valid] / solid_angle_in[idx_in[valid]]
+    shape = (int(np.prod(geom_out.data_shape)), int(np.prod(geom_in.data_shape)))
+    return csr_matrix((weights, (idx_out[valid], idx_in[valid])), shape=shape)
+
+
+def _make_matrix(geom_in, geom_out, method, oversample):
+    if method == "flux":
+        return _make_matrix_flux(geom_in, geom_out, oversample)
+
+    coords = geom_out.get_coord()
+
+    if method == "nearest":
+        idx_in, weights = _weights_nearest(geom_in, coords)
+    else:
+        idx_in, weights = _weights_bilinear(geom_in, coords)
+
+    idx_in = idx_in.reshape((len(idx_in), -1))
+    weights = weights.reshape(idx_in.shape)
+    idx_out = np.broadcast_to(np.arange(idx_in.shape[1]), idx_in.shape)
+
+    valid = (idx_in >= 0) & (weights > 0)
+    shape = (idx_in.shape[1], int(np.prod(geom_in.data_shape)))
+    return csr_matrix((weights[valid], (idx_out[valid], idx_in[valid])), shape=shape)
+
+
+def make_reproject_matrix(geom_in, geom_out, method="bilinear", oversample=4):
+    """Make the sparse weight matrix to reproject images between geometries.
+
+    The matrix has shape (n_out, n_in), where n_in and n_out are the number
+    of pixels of the input and output image, and maps the flattened data of
+    an image plane of the input geometry to the output geometry. Matrices are
+    cached in `REPROJECT_CACHE`.
+
+    Parameters
+    ----------
+    geom_in : `~gammapy.maps.WcsGeom` or `~gammapy.maps.HpxGeom`
+        Input geometry.
+    geom_out : `~gammapy.maps.WcsGeom` or `~gammapy.maps.HpxGeom`
+        Output geometry.
+    method : {"nearest", "bilinear", "flux"}
+        Reprojection method. "nearest" and "bilinear" interpolate the input
+        image at the output pixel centers, "flux" preserves the integral of
+        the image by distributing every input pixel on the output pixels
+        proportionally to their overlap.
+    oversample : int
+        Oversampling factor of the input pixels used to compute the overlap
+        for ``method="flux"``.
+
+    Returns
+    -------
+    matrix : `~scipy.sparse.csr_matrix`
+        Weight matrix.
+    """
+    if method not in REPROJECT_METHODS:
+        raise ValueError(f"Invalid reprojection method: {method!r}")
+
+    for geom in [geom_in, geom_out]:
+        if not geom.is_regular:
+            raise ValueError("Reprojection requires regular geometries.")
+
+    geom_in, geom_out = geom_in.to_image(), geom_out.to_image()
+
+    if method != "flux":
+        oversample = None
+
+    key = (geom_in._cache_key, geom_out._cache_key, method, oversample)
+    return REPROJECT_CACHE.get(
+        key, lambda: _make_matrix(geom_in, geom_out, method, oversample)
+    )
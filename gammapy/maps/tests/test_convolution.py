@@ -0,0 +1,103 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import scipy.signal
+from astropy.table import Table
+from gammapy.maps.convolution import ConvolutionCostModel, FFTConvolver
+
+
+@pytest.mark.parametrize("kernel_shape", [(5, 5), (4, 7), (3, 6, 4)])
+def test_fft_convolver(kernel_shape):
+    random_state = np.random.RandomState(0)
+    data = random_state.random_sample((3, 20, 30)).astype(np.float32)
+    kernel = random_state.random_sample(kernel_shape)
+
+    convolver = FFTConvolver()
+    actual = convolver.convolve(data, kernel)
+
+    for idx, image in enumerate(data):
+        kernel_image = kernel if kernel.ndim == 2 else kernel[idx]
+        desired = scipy.signal.fftconvolve(image, kernel_image, mode="same")
+        assert_allclose(actual[idx], desired, rtol=1e-5, atol=1e-6)
+
+    assert actual.dtype == np.float64
+
+
+def test_fft_convolver_cache():
+    data = np.ones((2, 10, 10), dtype=np.float32)
+    kernel = np.ones((3, 3), dtype=np.float32)
+
+    convolver = FFTConvolver(workers=2)
+    actual = convolver.convolve(data, kernel)
+    assert actual.dtype == np.float32
+    assert_allclose(actual[:, 5, 5], 9)
+    assert_allclose(actual[:, 0, 0], 4)
+
+    # kernels are compared by value
+    convolver.convolve(data, kernel.copy(), workers=1)
+    assert convolver.kernel_cache.hits == 1
+
+    convolver.convolve(data[..., :8], kernel)
+    convolver.convolve(data, 2 * kernel)
+    assert convolver.kernel_cache.misses == 3
+
+    kernel_fft = convolver.kernel_fft(kernel, (12, 12))
+    assert not kernel_fft.flags.writeable
+
+
+@pytest.mark.parametrize("method", ["direct", "oa", "auto"])
+@pytest.mark.parametrize("kernel_shape", [(5, 5), (4, 7), (3, 6, 4)])
+def test_convolver_methods(method, kernel_shape):
+    random_state = np.random.RandomState(0)
+    data = random_state.random_sample((3, 40, 30)).astype(np.float32)
+    kernel = random_state.random_sample(kernel_shape).astype(np.float32)
+
+    convolver = FFTConvolver()
+    actual = convolver.convolve(data, kernel, method=method)
+    desired = convolver.convolve(data, kernel, method="fft")
+
+    assert actual.shape == data.shape
+    assert actual.dtype == np.float32
+    assert_allclose(actual, desired, rtol=1e-4, atol=1e-5)
+
+
+def test_convolver_invalid_method():
+    data = np.ones((10, 10))
+    with pytest.raises(ValueError):
+        FFTConvolver().convolve(data, data, method="spam")
+
+
+def test_convolution_cost_model():
+    cost_model = ConvolutionCostModel()
+    assert cost_model.choose((10, 10), (3, 3)) == "direct"
+    assert cost_model.choose((1000, 1000), (51, 51), n_images=10) != "direct"
+
+    ops_fft = cost_model.ops("fft", (1000, 1000), (5, 5))
+    ops_oa = cost_model.ops("oa", (1000, 1000), (5, 5))
+    assert ops_oa < ops_fft
+
+    # a single block is the same as fft
+    assert cost_model.ops("oa", (10, 10), (5, 5)) == cost_model.ops(
+        "fft", (10, 10), (5, 5)
+    )
+
+
+def test_convolution_cost_model_read(tmp_path):
+    rows = [
+        ("direct", 8, 3, 1, 1e-5),
+        ("direct", 16, 3, 1, 2e-5),
+        ("fft", 8, 3, 1, 1e-4),
+        ("fft", 16, 3, 1, 3e-4),
+    ]
+    names = ["method", "image_size", "kernel_size", "n_images", "time"]
+    table = Table(rows=rows, names=names)
+
+    filename = tmp_path / "benchmark.ecsv"
+    table.write(str(filename))
+    cost_model = ConvolutionCostModel.read(filename)
+
+    for method in ["direct", "fft"]:
+        overhead, scale = cost_model.coefficients[method]
+        assert overhead >= 0
+        assert scale >= 0
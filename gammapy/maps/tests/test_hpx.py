@@ -5,7 +5,9 @@ from numpy.testing import assert_allclose
 from astropy.io import fits
 from gammapy.maps import MapAxis, MapCoord
 from gammapy.maps.hpx import (
+    HPX2WCS_CACHE,
     HpxGeom,
+    HpxToWcsMapping,
     get_hpxregion_dir,
     get_hpxregion_size,
     get_pix_size_from_nside,
@@ -640,6 +642,61 @@ def test_make_hpx_to_wcs_mapping():
     )
 
 
+def test_hpx_to_wcs_mapping_cache():
+    HPX2WCS_CACHE.clear()
+
+    hpx = HpxGeom(16, True, "galactic", region="DISK(110.,75.,10.)")
+    hpx2wcs = HpxToWcsMapping.create(hpx, hpx.make_wcs())
+
+    hpx = HpxGeom(16, True, "galactic", region="DISK(110.,75.,10.)")
+    assert HpxToWcsMapping.create(hpx, hpx.make_wcs()) is hpx2wcs
+    assert HPX2WCS_CACHE.hits == 1
+
+    hpx = HpxGeom(32, True, "galactic", region="DISK(110.,75.,10.)")
+    assert HpxToWcsMapping.create(hpx, hpx.make_wcs()) is not hpx2wcs
+    assert HPX2WCS_CACHE.misses == 2
+
+
+def test_hpx_to_wcs_mapping_matrix():
+    axis = MapAxis(np.logspace(0.0, 3.0, 4))
+    hpx = HpxGeom(16, True, "galactic", region="DISK(110.,75.,10.)", axes=[axis])
+    hpx2wcs = HpxToWcsMapping.create(hpx, hpx.make_wcs())
+
+    nx, ny = [int(t.flat[0]) for t in hpx2wcs.npix]
+    assert hpx2wcs.matrix.shape == (nx * ny, hpx.data_shape[-1])
+
+    data = np.random.RandomState(0).uniform(size=hpx.data_shape)
+    wcs_data = np.zeros(data.shape[:-1] + (ny, nx))
+
+    # compare to the per-pixel index mapping
+    ref = HpxToWcsMapping(
+        hpx, hpx2wcs.wcs, hpx2wcs.ipix, hpx2wcs.mult_val, hpx2wcs.npix
+    )
+    ref._matrix = None
+
+    for normalize in [True, False]:
+        actual = hpx2wcs.fill_wcs_map_from_hpx_data(data, wcs_data.copy(), normalize)
+        expected = ref.fill_wcs_map_from_hpx_data(data, wcs_data.copy(), normalize)
+        assert_allclose(actual, expected)
+
+
+def test_hpx_to_wcs_mapping_read_write(tmp_path):
+    axis = MapAxis(np.logspace(0.0, 3.0, 4))
+    hpx = HpxGeom(
+        [4, 8, 16], True, "galactic", region="DISK(110.,75.,10.)", axes=[axis]
+    )
+    hpx2wcs = HpxToWcsMapping.create(hpx, hpx.make_wcs())
+    assert hpx2wcs.matrix is None
+
+    hpx2wcs.write(tmp_path / "hpx2wcs.fits")
+    hpx2wcs_read = HpxToWcsMapping.read(tmp_path / "hpx2wcs.fits")
+
+    assert_allclose(hpx2wcs_read.ipix, hpx2wcs.ipix)
+    assert_allclose(hpx2wcs_read.mult_val, hpx2wcs.mult_val)
+    assert_allclose(hpx2wcs_read.lmap, hpx2wcs.lmap)
+    assert hpx2wcs_read.wcs == hpx2wcs.wcs
+
+
 def test_hpxgeom_from_header():
     pars = {
         "HPX_REG": "DISK(110.,75.,2.)",
@@ -0,0 +1,130 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import astropy.units as u
+from gammapy.maps import HpxChunkedMap, HpxGeom, HpxNDMap, MapAxis
+
+pytest.importorskip("healpy")
+
+
+@pytest.fixture()
+def geom():
+    axis = MapAxis.from_energy_bounds("1 TeV", "10 TeV", nbin=2)
+    return HpxGeom.create(nside=8, nest=True, frame="galactic", axes=[axis])
+
+
+def test_hpx_chunked_map_init(tmp_path):
+    geom = HpxGeom.create(nside=8, nest=True)
+    m = HpxChunkedMap(geom, path=tmp_path, nside_chunk=2)
+
+    assert m.npix_chunk == 16
+    assert m.chunk_shape == (16,)
+    assert list(m.iter_chunks()) == []
+    assert_allclose(m.data, 0)
+
+    with pytest.raises(ValueError):
+        HpxChunkedMap(HpxGeom.create(nside=8, nest=False))
+
+    with pytest.raises(ValueError):
+        HpxChunkedMap(HpxGeom.create(nside=8, nest=True, region="DISK(0, 0, 10)"))
+
+
+def test_hpx_chunked_map_fill_get_set(geom, tmp_path):
+    m = HpxChunkedMap(geom, path=tmp_path, nside_chunk=2)
+    m_ref = HpxNDMap(geom)
+
+    coords = m.geom.get_coord(flat=True)
+    coords = tuple(c[:100] for c in coords)
+    for _ in range(2):
+        m.fill_by_coord(coords, weights=coords[1])
+        m_ref.fill_by_coord(coords, weights=coords[1])
+
+    # only chunks touched by the first 100 pixels per energy bin are created
+    assert len(list(m.iter_chunks())) < 12 * 2 ** 2
+    assert_allclose(m.data, m_ref.data, rtol=1e-5)
+    assert_allclose(m.get_by_coord(coords), 2.0 * coords[1], rtol=1e-5)
+
+    idx = m.geom.get_idx(flat=True)
+    m.set_by_idx(idx, 3.0)
+    assert_allclose(m.get_by_idx(idx), 3.0)
+
+    vals = m.get_by_idx((np.array([0, -1]), np.array([0, 0])))
+    assert_allclose(vals, [3.0, np.nan])
+
+    coords = {"lon": [0, 10], "lat": [0, 5], "energy": [2, 3] * u.TeV}
+    assert_allclose(m.interp_by_coord(coords), 3.0, rtol=1e-5)
+
+
+def test_hpx_chunked_map_from_map(geom, tmp_path):
+    m_ref = HpxNDMap(geom)
+    m_ref.data = np.random.RandomState(0).uniform(size=geom.data_shape)
+
+    m = HpxChunkedMap.from_map(m_ref, path=tmp_path, nside_chunk=2)
+    assert_allclose(m.to_dense().data, m_ref.data, rtol=1e-6)
+
+    # the data is loaded from the chunks and can't be modified in place
+    with pytest.raises(ValueError):
+        m.data[0] = 1
+
+    m_dense = m.to_dense()
+    m_dense.data[0] = 1
+
+    m_copy = m.copy()
+    assert m_copy.path != m.path
+    assert_allclose(m_copy.data, m.data)
+
+    # chunk files are re-used
+    m_reload = HpxChunkedMap(geom, path=tmp_path, nside_chunk=2)
+    assert_allclose(m_reload.data, m.data)
+
+    m_sum = m.sum_over_axes()
+    assert isinstance(m_sum, HpxChunkedMap)
+    assert_allclose(m_sum.data, m_ref.sum_over_axes().data, rtol=1e-5)
+
+
+def test_hpx_chunked_map_to_wcs(geom):
+    m_ref = HpxNDMap(geom)
+    m_ref.data = np.random.RandomState(0).uniform(size=geom.data_shape)
+    m = HpxChunkedMap.from_map(m_ref, nside_chunk=2)
+
+    for normalize in [True, False]:
+        wcs = m.to_wcs(normalize=normalize)
+        wcs_ref = m_ref.to_wcs(normalize=normalize)
+        assert wcs.geom.data_shape == wcs_ref.geom.data_shape
+        assert_allclose(wcs.data, wcs_ref.data, rtol=1e-5)
+
+    wcs = m.to_wcs(sum_bands=True)
+    assert wcs.geom.is_image
+    wcs_ref = m_ref.to_wcs(sum_bands=True)
+    assert_allclose(np.nansum(wcs.data), np.nansum(wcs_ref.data), rtol=1e-5)
+
+
+def test_hpx_chunked_map_up_downsample(geom):
+    m_ref = HpxNDMap(geom)
+    m_ref.data = np.random.RandomState(0).uniform(size=geom.data_shape)
+    m = HpxChunkedMap.from_map(m_ref, nside_chunk=2)
+
+    for preserve_counts in [True, False]:
+        m_up = m.upsample(2, preserve_counts=preserve_counts)
+        assert isinstance(m_up, HpxChunkedMap)
+        m_up_ref = m_ref.upsample(2, preserve_counts=preserve_counts)
+        assert_allclose(m_up.data, m_up_ref.data, rtol=1e-5)
+
+        m_down = m.downsample(2, preserve_counts=preserve_counts)
+        m_down_ref = m_ref.downsample(2, preserve_counts=preserve_counts)
+        assert_allclose(m_down.data, m_down_ref.data, rtol=1e-5)
+
+    # chunks smaller than the pixels of the downsampled map
+    m_down = m.to_ud_graded(1, preserve_counts=True)
+    assert m_down.nside_chunk == 1
+    assert_allclose(m_down.data, m_ref.downsample(8).data, rtol=1e-5)
+
+    m_up = m.to_ud_graded(16)
+    assert_allclose(m_up.data, m_ref.upsample(2, preserve_counts=False).data, rtol=1e-5)
+
+    with pytest.raises(ValueError):
+        m.to_ud_graded(12)
+
+    with pytest.raises(NotImplementedError):
+        m.interp_by_pix((0, 0))
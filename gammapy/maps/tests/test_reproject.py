@@ -0,0 +1,95 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+from gammapy.maps import REPROJECT_CACHE, HpxGeom, Map, MapAxis, WcsGeom
+from gammapy.maps.reproject import make_reproject_matrix
+from gammapy.utils.testing import requires_dependency
+
+
+@pytest.fixture()
+def map_in():
+    axis = MapAxis.from_bounds(1, 10, 3, interp="log", name="energy", unit="TeV")
+    m = Map.create(
+        skydir=(266.4, -28.9), binsz=0.1, width=(4, 3), frame="icrs", axes=[axis]
+    )
+    m.data = np.random.RandomState(0).uniform(size=m.data.shape)
+    return m
+
+
+@pytest.fixture()
+def geom_out():
+    return WcsGeom.create(skydir=(0, 0), binsz=0.05, width=1.6, frame="galactic")
+
+
+def test_reproject_nearest(map_in, geom_out):
+    m = map_in.reproject(geom_out, method="nearest")
+
+    assert m.geom.data_shape == (3, 32, 32)
+    assert m.geom.frame == "galactic"
+
+    coords = m.geom.get_coord()
+    assert_allclose(m.data, map_in.get_by_coord(coords))
+
+
+def test_reproject_bilinear(map_in, geom_out):
+    image = map_in.slice_by_idx({"energy": 0})
+    m = image.reproject(geom_out, method="bilinear")
+
+    coords = m.geom.get_coord()
+    expected = image.interp_by_coord(coords, interp="linear", fill_value=0)
+    assert_allclose(m.data, expected, rtol=1e-5)
+
+
+def test_reproject_flux(map_in):
+    geom = WcsGeom.create(
+        skydir=(266.4, -28.9), binsz=0.2, width=(6, 5), frame="icrs", proj="TAN"
+    )
+    m = map_in.reproject(geom, method="flux")
+
+    assert_allclose(m.data.sum(axis=(1, 2)), map_in.data.sum(axis=(1, 2)), rtol=1e-3)
+
+
+def test_reproject_fill_value(map_in):
+    geom = WcsGeom.create(skydir=(266.4, -28.9), binsz=0.1, width=10, frame="icrs")
+    m = map_in.reproject(geom, method="nearest", fill_value=np.nan)
+
+    assert np.isnan(m.data[0, 0, 0])
+    assert_allclose(np.nansum(m.data), map_in.data.sum(), rtol=1e-5)
+
+
+def test_reproject_cache(map_in, geom_out):
+    REPROJECT_CACHE.clear()
+
+    matrix = make_reproject_matrix(map_in.geom, geom_out)
+    assert matrix.shape == (32 * 32, 40 * 30)
+
+    geom = WcsGeom.create(skydir=(0, 0), binsz=0.05, width=1.6, frame="galactic")
+    assert make_reproject_matrix(map_in.geom.to_image(), geom) is matrix
+    assert REPROJECT_CACHE.hits == 1
+
+    make_reproject_matrix(map_in.geom, geom_out, method="nearest")
+    assert REPROJECT_CACHE.misses == 2
+
+    with pytest.raises(ValueError):
+        make_reproject_matrix(map_in.geom, geom_out, method="cubic")
+
+
+@requires_dependency("healpy")
+def test_reproject_hpx(geom_out):
+    geom = HpxGeom.create(nside=64, skydir=(0, 0), width=5, frame="galactic")
+    m_hpx = Map.from_geom(geom)
+    m_hpx.data = np.random.RandomState(0).uniform(size=m_hpx.data.shape)
+
+    m = m_hpx.reproject(geom_out, method="bilinear")
+    coords = m.geom.get_coord()
+    assert_allclose(m.data, m_hpx.interp_by_coord(coords, interp="linear"), rtol=1e-5)
+
+    m = m_hpx.reproject(geom_out, method="nearest")
+    assert_allclose(m.data, m_hpx.get_by_coord(coords))
+
+    # all WCS pixels are inside the HEALPix geometry
+    m_wcs = Map.from_geom(geom_out)
+    m_wcs.data += 1
+    m = m_wcs.reproject(geom, method="flux")
+    assert_allclose(m.data.sum(), m_wcs.data.sum(), rtol=1e-5)
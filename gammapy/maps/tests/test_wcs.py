@@ -1,4 +1,5 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pickle
 import pytest
 import numpy as np
 from numpy.testing import assert_allclose
@@ -6,7 +7,7 @@ import astropy.units as u
 from astropy.coordinates import Angle, SkyCoord
 from astropy.io import fits
 from gammapy.maps import Map, MapAxis, WcsGeom
-from gammapy.maps.wcs import _check_width
+from gammapy.maps.wcs import GEOM_CACHE, _check_width
 
 axes1 = [MapAxis(np.logspace(0.0, 3.0, 3), interp="log", name="energy")]
 axes2 = [
@@ -276,25 +277,55 @@ def test_wcsgeom_get_coord():
     assert coord.lat[0, 0].unit == "deg"
 
 
-def test_wcsgeom_instance_cache():
+def test_wcsgeom_shared_cache():
+    GEOM_CACHE.clear()
     geom_1 = WcsGeom.create(npix=(3, 3))
     geom_2 = WcsGeom.create(npix=(3, 3))
+    geom_3 = WcsGeom.create(npix=(4, 3))
 
-    coord_1, coord_2 = geom_1.get_coord(), geom_2.get_coord()
+    coord_1 = geom_1.get_coord()
+    assert GEOM_CACHE.misses == 1
 
-    assert geom_1.get_coord.cache_info().misses == 1
-    assert geom_2.get_coord.cache_info().misses == 1
+    # equal geometries share the cached values
+    coord_2 = geom_2.get_coord()
+    assert GEOM_CACHE.hits == 1
+    assert id(coord_1) == id(coord_2)
 
-    coord_1_cached, coord_2_cached = geom_1.get_coord(), geom_2.get_coord()
+    geom_3.get_coord()
+    geom_1.get_coord(mode="edges")
+    assert GEOM_CACHE.misses == 3
+    assert len(GEOM_CACHE) == 3
 
-    assert geom_1.get_coord.cache_info().hits == 1
-    assert geom_2.get_coord.cache_info().hits == 1
+    table = GEOM_CACHE.to_table()
+    assert list(table["type"]) == ["MapCoord"] * 3
+    assert table["nbytes"][0] == 2 * 9 * 8
+    assert GEOM_CACHE.nbytes == table["nbytes"].sum()
 
-    assert geom_1.get_coord.cache_info().currsize == 1
-    assert geom_2.get_coord.cache_info().currsize == 1
 
-    assert id(coord_1) == id(coord_1_cached)
-    assert id(coord_2) == id(coord_2_cached)
+def test_wcsgeom_shared_cache_budget():
+    max_bytes = GEOM_CACHE.max_bytes
+    GEOM_CACHE.clear()
+    try:
+        GEOM_CACHE.max_bytes = 2500
+        for npix in [10, 11, 12]:
+            WcsGeom.create(npix=npix).get_coord()
+
+        # the first geom is evicted
+        assert len(GEOM_CACHE) == 1
+        assert GEOM_CACHE.nbytes == 2 * 144 * 8
+    finally:
+        GEOM_CACHE.max_bytes = max_bytes
+        GEOM_CACHE.clear()
+
+
+def test_wcsgeom_pickle():
+    geom = WcsGeom.create(npix=(3, 3))
+    geom.get_coord()
+
+    geom_unpickled = pickle.loads(pickle.dumps(geom))
+
+    assert geom_unpickled == geom
+    assert_allclose(geom_unpickled.get_coord().lon, geom.get_coord().lon)
 
 
 def test_wcsgeom_squash():
@@ -228,6 +228,55 @@ def qconcatenate(q_1, q_2):
     return u.Quantity(np.concatenate((q_1.value, q_2.value)), unit=q_1.unit)
 
 
+def test_wcsndmap_fill_by_coord_histogram():
+    axis = MapAxis.from_energy_bounds("1 TeV", "10 TeV", nbin=3)
+    geom = WcsGeom.create(npix=(10, 8), binsz=0.1, frame="galactic", axes=[axis])
+
+    rng = np.random.RandomState(0)
+    coords = {
+        "lon": rng.uniform(-0.6, 0.6, 1000),
+        "lat": rng.uniform(-0.5, 0.5, 1000),
+        "energy": 10 ** rng.uniform(-0.1, 1.1, 1000) * u.TeV,
+    }
+    weights = rng.uniform(size=1000)
+
+    expected = WcsNDMap(geom)
+    expected.fill_by_idx(geom.coord_to_idx(coords), weights)
+
+    # dense histogram
+    m = WcsNDMap(geom)
+    m.fill_by_coord(coords, weights)
+    assert_allclose(m.data, expected.data, rtol=1e-5)
+
+    # sparse updates
+    m = WcsNDMap(geom)
+    for idx in range(0, 1000, 10):
+        chunk = {name: values[idx : idx + 10] for name, values in coords.items()}
+        m.fill_by_coord(chunk, weights[idx : idx + 10])
+    assert_allclose(m.data, expected.data, rtol=1e-5)
+
+
+def test_wcsndmap_fill_events_chunk_size():
+    from gammapy.data import EventList
+
+    rng = np.random.RandomState(0)
+    table = Table()
+    table["RA"] = rng.uniform(-1, 1, 100) * u.deg
+    table["DEC"] = rng.uniform(-1, 1, 100) * u.deg
+    table["ENERGY"] = 10 ** rng.uniform(0, 1, 100) * u.TeV
+    events = EventList(table)
+
+    axis = MapAxis.from_energy_bounds("1 TeV", "10 TeV", nbin=3)
+    m = Map.create(npix=(10, 8), binsz=0.2, frame="icrs", axes=[axis])
+    m.fill_events(events)
+
+    m_chunks = Map.create(npix=(10, 8), binsz=0.2, frame="icrs", axes=[axis])
+    m_chunks.fill_events(events, chunk_size=7)
+
+    assert m.data.sum() > 0
+    assert_allclose(m_chunks.data, m.data)
+
+
 @pytest.mark.parametrize(
     ("npix", "binsz", "frame", "proj", "skydir", "axes"), wcs_test_geoms
 )
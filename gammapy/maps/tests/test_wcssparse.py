@@ -0,0 +1,127 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pytest
+import numpy as np
+from numpy.testing import assert_allclose
+import astropy.units as u
+from astropy.coordinates import SkyCoord
+from gammapy.maps import Map, MapAxis, WcsGeom, WcsNDMap, WcsSparseMap
+
+axes = [
+    MapAxis(np.logspace(0.0, 3.0, 3), interp="log", name="energy"),
+    MapAxis(np.logspace(1.0, 3.0, 4), interp="lin", name="spam"),
+]
+
+
+@pytest.fixture()
+def geom():
+    pos = SkyCoord(0, 0, unit="deg", frame="galactic")
+    return WcsGeom.create(
+        npix=(10, 8), binsz=1, skydir=pos, proj="CAR", frame="galactic", axes=axes
+    )
+
+
+@pytest.fixture()
+def maps(geom):
+    random_state = np.random.RandomState(0)
+    data = random_state.poisson(0.2, size=geom.data_shape).astype(np.float32)
+    dense = WcsNDMap(geom, data=data)
+    return dense, WcsSparseMap.from_map(dense)
+
+
+def test_wcssparsemap_init(geom):
+    m = Map.from_geom(geom, map_type="wcs-sparse")
+    assert isinstance(m, WcsSparseMap)
+    assert m.nnz == 0
+    assert m.data.shape == geom.data_shape
+    assert m.data.dtype == np.float32
+
+    m = Map.create(npix=5, map_type="wcs-sparse", unit="m")
+    assert isinstance(m, WcsSparseMap)
+    assert m.unit == "m"
+
+    with pytest.raises(ValueError):
+        m.data[0, 0] = 1
+
+
+def test_wcssparsemap_fill_get_set(geom, maps):
+    dense, sparse = maps
+    assert sparse.nnz == np.count_nonzero(dense.data)
+    assert_allclose(sparse.data, dense.data)
+
+    idx = ([0, 1, 1, 9], [0, 2, 2, 7], [0, 1, 1, 1], [0, 2, 2, 1])
+    dense.fill_by_idx(idx, weights=np.array([1.0, 2.0, 3.0, 4.0]))
+    sparse.fill_by_idx(idx, weights=np.array([1.0, 2.0, 3.0, 4.0]))
+    assert_allclose(sparse.data, dense.data)
+    assert_allclose(sparse.get_by_idx(idx), dense.get_by_idx(idx))
+
+    coords = geom.get_coord()
+    assert_allclose(sparse.get_by_coord(coords), dense.data)
+
+    dense.set_by_idx(idx, 0)
+    sparse.set_by_idx(idx, 0)
+    assert_allclose(sparse.data, dense.data)
+    assert sparse.nnz == np.count_nonzero(dense.data)
+
+    # invalid indices are skipped
+    sparse.fill_by_idx(([-1], [0], [0], [0]))
+    assert sparse.nnz == np.count_nonzero(dense.data)
+    assert np.isnan(sparse.get_by_idx(([-1], [0], [0], [0]))[0])
+
+
+@pytest.mark.parametrize("keepdims", [True, False])
+def test_wcssparsemap_sum_over_axes(maps, keepdims):
+    dense, sparse = maps
+
+    for axes_names in [None, ["energy"], ["spam"]]:
+        actual = sparse.sum_over_axes(axes=axes_names, keepdims=keepdims)
+        desired = dense.sum_over_axes(axes=axes_names, keepdims=keepdims)
+
+        assert isinstance(actual, WcsSparseMap)
+        assert actual.geom == desired.geom
+        assert_allclose(actual.data, desired.data)
+
+
+@pytest.mark.parametrize("mode", ["trim", "partial"])
+def test_wcssparsemap_cutout(maps, mode):
+    dense, sparse = maps
+    position = SkyCoord(4, 2, unit="deg", frame="galactic")
+
+    actual = sparse.cutout(position=position, width=(3, 4) * u.deg, mode=mode)
+    desired = dense.cutout(position=position, width=(3, 4) * u.deg, mode="trim")
+
+    assert isinstance(actual, WcsSparseMap)
+    assert actual.data.shape == actual.geom.data_shape
+    assert_allclose(actual.data.sum(), desired.data.sum())
+
+    if mode == "trim":
+        assert_allclose(actual.data, desired.data)
+
+
+def test_wcssparsemap_stack(maps):
+    dense, sparse = maps
+    position = SkyCoord(4, 2, unit="deg", frame="galactic")
+    cutout = sparse.cutout(position=position, width=(3, 4) * u.deg)
+
+    weights = Map.from_geom(cutout.geom, dtype=bool)
+    weights.data[..., 1:, :] = True
+
+    dense_stacked = dense.copy()
+    dense_stacked.stack(cutout.to_dense(), weights=weights)
+    sparse.stack(cutout, weights=weights)
+    assert_allclose(sparse.data, dense_stacked.data)
+
+    # stack dense map into a sparse map
+    sparse.stack(dense)
+    assert_allclose(sparse.data, dense_stacked.data + dense.data)
+
+
+def test_wcssparsemap_arithmetics(maps):
+    dense, sparse = maps
+
+    actual = sparse * 2
+    assert isinstance(actual, WcsSparseMap)
+    assert_allclose(actual.data, 2 * dense.data)
+
+    actual = sparse.to_dense()
+    assert isinstance(actual, WcsNDMap)
+    assert_allclose(actual.data, dense.data)
@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import copy
-from functools import lru_cache
+import functools
+import hashlib
 import numpy as np
 import astropy.units as u
 from astropy.coordinates import Angle, SkyCoord
@@ -9,6 +10,7 @@ from astropy.nddata import Cutout2D
 from astropy.wcs import WCS
 from astropy.wcs.utils import proj_plane_pixel_scales, wcs_to_celestial_frame, celestial_frame_to_wcs
 from regions import SkyRegion
+from gammapy.utils.cache import LRUCache
 from .geom import (
     Geom,
     MapCoord,
@@ -20,7 +22,26 @@ from .geom import (
 )
 from .utils import INVALID_INDEX, slice_to_str, str_to_slice
 
-__all__ = ["WcsGeom"]
+__all__ = ["WcsGeom", "GEOM_CACHE"]
+
+GEOM_CACHE = LRUCache(max_size=1024, max_bytes=2 ** 30)
+"""Process-wide cache of coordinate arrays and derived geometries of `WcsGeom`.
+
+The cache is shared by all geometries with the same WCS, pixels and axes.
+Use ``GEOM_CACHE.max_bytes`` to adjust the memory budget and
+``GEOM_CACHE.to_table()`` to inspect the cached objects.
+"""
+
+
+def _geom_cached(method):
+    """Cache results of a `WcsGeom` method in `GEOM_CACHE`."""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = (self._cache_key, method.__name__, args, tuple(sorted(kwargs.items())))
+        return GEOM_CACHE.get(key, lambda: method(self, *args, **kwargs))
+
+    return wrapper
 
 
 def _check_width(width):
@@ -125,12 +146,24 @@ class WcsGeom(Geom):
 
         self._crpix = crpix
         self._cutout_info = cutout_info
+        self._cache_key_value = None
 
-        # define cached methods
-        self.get_coord = lru_cache()(self.get_coord)
-        self.solid_angle = lru_cache()(self.solid_angle)
-        self.bin_volume = lru_cache()(self.bin_volume)
-        self.to_image = lru_cache()(self.to_image)
+    @property
+    def _cache_key(self):
+        """Hash of the WCS, pixels, axes and cutout info, used in `GEOM_CACHE`."""
+        if self._cache_key_value is None:
+            sha = hashlib.sha1(self.wcs.to_header_string().encode())
+            for values in [self._npix, self._cdelt, self._crpix]:
+                for value in values:
+                    sha.update(np.asarray(value, dtype=float).tobytes())
+
+            for ax in self.axes:
+                sha.update(f"{ax.name}{ax.node_type}{ax.interp}{ax.unit}".encode())
+                sha.update(np.asarray(ax.edges.value, dtype=float).tobytes())
+
+            sha.update(str(self.cutout_info).encode())
+            self._cache_key_value = sha.hexdigest()
+        return self._cache_key_value
 
     @property
     def data_shape(self):
@@ -538,6 +571,7 @@ class WcsGeom(Geom):
             _[~m] = INVALID_INDEX.float
         return pix
 
+    @_geom_cached
     def get_coord(self, idx=None, flat=False, mode="center", frame=None):
         """Get map coordinates from the geometry.
 
@@ -593,6 +627,43 @@ class WcsGeom(Geom):
 
         return tuple(pix)
 
+    def _coord_to_flat_idx(self, coords):
+        """Convert map coordinates to indices into the flattened data array.
+
+        Only for regular geometries. Spatial pixels are computed in one
+        WCS transformation and the bins of the non-spatial axes from
+        their edges, without intermediate pixel coordinate tuples.
+
+        Returns
+        -------
+        idx : `~numpy.ndarray`
+            Index into the flattened (C-ordered) data array, -1 for
+            coordinates outside of the map.
+        """
+        coords = MapCoord.create(coords, frame=self.frame)
+
+        if coords.size == 0:
+            return np.array([], dtype=np.int64)
+
+        c = self.coord_to_tuple(coords)
+        nx, ny = int(self.npix[0]), int(self.npix[1])
+        x, y = self._wcs.wcs_world2pix(c[0], c[1], 0)
+
+        with np.errstate(invalid="ignore"):
+            ix, iy = np.rint(x), np.rint(y)
+            valid = (ix >= 0) & (ix < nx) & (iy >= 0) & (iy < ny)
+
+        idx = np.where(valid, iy * nx + ix, 0).astype(np.int64)
+        stride = nx * ny
+
+        for coord, ax in zip(c[self._slice_non_spatial_axes], self.axes):
+            idx_ax = ax.coord_to_idx(coord)
+            valid = valid & (idx_ax >= 0) & (idx_ax < ax.nbin)
+            idx = idx + idx_ax * stride
+            stride *= ax.nbin
+
+        return np.where(valid, idx, -1)
+
     def pix_to_coord(self, pix):
         # Variable Bin Size
         if not self.is_regular:
@@ -644,6 +715,7 @@ class WcsGeom(Geom):
         idx = self.coord_to_idx(coords)
         return np.all(np.stack([t != INVALID_INDEX.int for t in idx]), axis=0)
 
+    @_geom_cached
     def to_image(self):
         npix = (np.max(self._npix[0]), np.max(self._npix[1]))
         cdelt = (np.max(self._cdelt[0]), np.max(self._cdelt[1]))
@@ -806,6 +878,7 @@ class WcsGeom(Geom):
             axes=copy.deepcopy(self.axes),
         )
 
+    @_geom_cached
     def solid_angle(self):
         """Solid angle array (`~astropy.units.Quantity` in ``sr``).
 
@@ -843,6 +916,7 @@ class WcsGeom(Geom):
 
         return u.Quantity(area_low_right + area_up_left, "sr", copy=False)
 
+    @_geom_cached
     def bin_volume(self):
         """Bin volume (`~astropy.units.Quantity`)"""
         bin_volume = self.to_image().solid_angle()
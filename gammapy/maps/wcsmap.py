@@ -102,7 +102,9 @@ class WcsMap(Map):
         if map_type == "wcs":
             return WcsNDMap(geom, dtype=dtype, meta=meta, unit=unit)
         elif map_type == "wcs-sparse":
-            raise NotImplementedError
+            from .wcssparse import WcsSparseMap
+
+            return WcsSparseMap(geom, dtype=dtype, meta=meta, unit=unit)
         else:
             raise ValueError(f"Invalid map type: {map_type!r}")
 
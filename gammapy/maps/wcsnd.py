@@ -12,6 +12,7 @@ from gammapy.extern.skimage import block_reduce
 from gammapy.utils.interpolation import ScaledRegularGridInterpolator
 from gammapy.utils.random import InverseCDFSampler, get_random_state
 from gammapy.utils.units import unit_from_fits_image_hdu
+from .convolution import FFT_CONVOLVER
 from .geom import MapCoord, pix_tuple_to_idx
 from .utils import INVALID_INDEX, interp_to_order
 from .wcsmap import WcsGeom, WcsMap
@@ -201,6 +202,30 @@ class WcsNDMap(WcsMap):
         weights = np.bincount(idx_inv, weights=weights).astype(self.data.dtype)
         self.data.T.flat[idx] += weights
 
+    def fill_by_coord(self, coords, weights=None):
+        if not self.geom.is_regular:
+            return super().fill_by_coord(coords, weights)
+
+        idx = self.geom._coord_to_flat_idx(coords)
+
+        if weights is not None:
+            if isinstance(weights, u.Quantity):
+                weights = weights.to_value(self.unit)
+            idx, weights = np.broadcast_arrays(idx, weights)
+
+        valid = idx >= 0
+        idx = idx[valid]
+        weights = None if weights is None else weights[valid]
+
+        if idx.size > self.data.size / 8:
+            # dense histogram, avoids sorting the indices
+            values = np.bincount(idx, weights=weights, minlength=self.data.size)
+            self.data += values.reshape(self.data.shape).astype(self.data.dtype)
+        else:
+            idx, idx_inv = np.unique(idx, return_inverse=True)
+            values = np.bincount(idx_inv, weights=weights).astype(self.data.dtype)
+            self.data.flat[idx] += values
+
     def set_by_idx(self, idx, vals):
         idx = pix_tuple_to_idx(idx)
         self.data.T[idx] = vals
@@ -582,7 +607,7 @@ class WcsNDMap(WcsMap):
             data=data, energy_lo=edges[:-1], energy_hi=edges[1:], unit=self.unit
         )
 
-    def convolve(self, kernel, use_fft=True, **kwargs):
+    def convolve(self, kernel, use_fft=True, workers=None, method="auto", **kwargs):
         """
         Convolve map with a kernel.
 
@@ -590,15 +615,29 @@ class WcsNDMap(WcsMap):
         If the kernel is higher dimensional it must match the map in the number of
         dimensions and the corresponding kernel is selected for every image plane.
 
+        With ``use_fft=True`` all image planes are convolved with a single batched
+        FFT, see `~gammapy.maps.convolution.FFTConvolver`. The kernel FFTs are
+        cached, so repeated convolutions with the same kernel are faster. For
+        small maps, e.g. model cutouts, direct or overlap-add convolution is
+        chosen automatically if it is expected to be faster, see
+        `~gammapy.maps.convolution.ConvolutionCostModel`.
+
         Parameters
         ----------
         kernel : `~gammapy.cube.PSFKernel` or `numpy.ndarray`
             Convolution kernel.
         use_fft : bool
-            Use `scipy.signal.fftconvolve` or `scipy.ndimage.convolve`.
+            Use FFT convolution or `scipy.ndimage.convolve`.
+        workers : int
+            Number of workers for the FFT. By default the value set on
+            `~gammapy.maps.convolution.FFT_CONVOLVER` is used.
+        method : {"auto", "fft", "direct", "oa"}
+            Convolution method used with ``use_fft=True``. With "auto" the
+            method is chosen according to the image and kernel shapes.
         kwargs : dict
             Keyword arguments passed to `scipy.signal.fftconvolve` or
-            `scipy.ndimage.convolve`.
+            `scipy.ndimage.convolve`. For FFT convolution, the batched FFT is
+            only used for the default ``mode="same"`` and no other arguments.
 
         Returns
         -------
@@ -607,11 +646,6 @@ class WcsNDMap(WcsMap):
         """
         from gammapy.cube import PSFKernel
 
-        conv_function = scipy.signal.fftconvolve if use_fft else scipy.ndimage.convolve
-        convolved_data = np.empty(self.data.shape, dtype=np.float32)
-        if use_fft:
-            kwargs.setdefault("mode", "same")
-
         if isinstance(kernel, PSFKernel):
             kmap = kernel.psf_kernel_map
             if not np.allclose(
@@ -620,6 +654,17 @@ class WcsNDMap(WcsMap):
                 raise ValueError("Pixel size of kernel and map not compatible.")
             kernel = kmap.data.astype(np.float32)
 
+        if use_fft and kwargs.get("mode", "same") == "same" and set(kwargs) <= {"mode"}:
+            data = FFT_CONVOLVER.convolve(
+                self.data.astype(np.float32), kernel, workers=workers, method=method
+            )
+            return self._init_copy(data=data.astype(np.float32, copy=False))
+
+        conv_function = scipy.signal.fftconvolve if use_fft else scipy.ndimage.convolve
+        convolved_data = np.empty(self.data.shape, dtype=np.float32)
+        if use_fft:
+            kwargs.setdefault("mode", "same")
+
         for img, idx in self.iter_by_image():
             ikern = Ellipsis if kernel.ndim == 2 else idx
             convolved_data[idx] = conv_function(
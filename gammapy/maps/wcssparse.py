@@ -0,0 +1,366 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import copy
+import numpy as np
+import astropy.units as u
+from .base import Map
+from .geom import pix_tuple_to_idx
+from .utils import INVALID_INDEX
+from .wcsmap import WcsMap
+from .wcsnd import WcsNDMap
+
+__all__ = ["WcsSparseMap"]
+
+
+class WcsSparseMap(WcsMap):
+    """WCS map with sparse data storage.
+
+    Only the non-zero values are stored, together with their flat indices
+    into the data array. This is efficient for maps that are mostly zero,
+    e.g. counts cubes at high energies.
+
+    Filling, getting and setting values, `sum_over_axes`, `cutout` and
+    `stack` work on the sparse representation. Other methods operate on a
+    dense copy of the data, use `to_dense` to get a `WcsNDMap` for methods
+    that are only available there, e.g. plotting or smoothing.
+
+    The `data` property returns a read-only dense array and setting it
+    converts the array to the sparse representation. Pixels outside of the
+    valid region of irregular or all-sky geometries are zero instead of NaN.
+
+    Parameters
+    ----------
+    geom : `~gammapy.maps.WcsGeom`
+        WCS geometry object.
+    data : `~numpy.ndarray`
+        Dense data array. By default the map is empty.
+    dtype : str, optional
+        Data type, default is float32
+    meta : `dict`
+        Dictionary to store meta data.
+    unit : str or `~astropy.units.Unit`
+        The map unit
+    """
+
+    def __init__(self, geom, data=None, dtype="float32", meta=None, unit=""):
+        self._dtype = np.dtype(dtype)
+        super().__init__(geom, data, meta, unit)
+
+    def _init_copy(self, **kwargs):
+        """Init map instance by copying missing init arguments from self."""
+        kwargs.setdefault("geom", copy.deepcopy(self.geom))
+        kwargs.setdefault("meta", copy.deepcopy(self.meta))
+        kwargs.setdefault("unit", self.unit)
+        kwargs.setdefault("dtype", self._dtype)
+
+        copy_data = "data" not in kwargs
+        map_out = self.__class__(**kwargs)
+
+        if copy_data:
+            map_out._idx, map_out._vals = self._idx.copy(), self._vals.copy()
+
+        return map_out
+
+    @property
+    def data(self):
+        """Dense data array (`~numpy.ndarray`, read-only)"""
+        data = np.zeros(self.geom.data_shape, dtype=self._dtype)
+        data.flat[self._idx] = self._vals
+        data.flags.writeable = False
+        return data
+
+    @data.setter
+    def data(self, val):
+        if val is None:
+            self._idx = np.array([], dtype=np.int64)
+            self._vals = np.array([], dtype=self._dtype)
+            return
+
+        if isinstance(val, u.Quantity):
+            raise TypeError("Map data must be a Numpy array. Set unit separately")
+
+        val = np.asarray(val)
+        if val.shape != self.geom.data_shape:
+            raise ValueError(
+                f"Shape {val.shape!r} does not match map data shape {self.geom.data_shape!r}"
+            )
+
+        self._dtype = val.dtype
+        val = val.ravel()
+        self._idx = np.flatnonzero(val)
+        self._vals = val[self._idx]
+
+    @property
+    def nnz(self):
+        """Number of stored non-zero values."""
+        return len(self._idx)
+
+    def get_flat_nonzero(self):
+        """Get flat indices and values of the non-zero entries.
+
+        Returns
+        -------
+        idx : `~numpy.ndarray`
+            Sorted indices into the flattened (C-ordered) data array.
+        vals : `~numpy.ndarray`
+            Values.
+        """
+        return self._idx, self._vals
+
+    @classmethod
+    def from_map(cls, m):
+        """Create a sparse map from a dense map.
+
+        Parameters
+        ----------
+        m : `~gammapy.maps.WcsMap`
+            Input map.
+
+        Returns
+        -------
+        map_out : `WcsSparseMap`
+            Sparse map.
+        """
+        return cls(m.geom, data=m.data, meta=m.meta, unit=m.unit)
+
+    def to_dense(self):
+        """Convert to a dense map.
+
+        Returns
+        -------
+        map_out : `~gammapy.maps.WcsNDMap`
+            Dense map.
+        """
+        return WcsNDMap(
+            self.geom,
+            data=self.data.copy(),
+            meta=copy.deepcopy(self.meta),
+            unit=self.unit,
+        )
+
+    @classmethod
+    def from_hdu(cls, hdu, hdu_bands=None):
+        """Make a WcsSparseMap object from a FITS HDU.
+
+        Parameters
+        ----------
+        hdu : `~astropy.io.fits.BinTableHDU` or `~astropy.io.fits.ImageHDU`
+            The map FITS HDU.
+        hdu_bands : `~astropy.io.fits.BinTableHDU`
+            The BANDS table HDU.
+        """
+        return cls.from_map(WcsNDMap.from_hdu(hdu, hdu_bands))
+
+    def _ravel_idx(self, idx):
+        # idx is ordered (x, y, ...), the data array (..., y, x)
+        return np.ravel_multi_index(tuple(idx[::-1]), self.geom.data_shape)
+
+    def _add(self, idx, vals):
+        """Add values at flat indices, duplicate indices are summed."""
+        idx = np.concatenate([self._idx, np.asarray(idx, dtype=np.int64).ravel()])
+        vals = np.concatenate([self._vals, np.asarray(vals).ravel()])
+
+        idx, idx_inv = np.unique(idx, return_inverse=True)
+        vals = np.bincount(idx_inv, weights=vals).astype(self._dtype)
+
+        nonzero = vals != 0
+        self._idx, self._vals = idx[nonzero], vals[nonzero]
+
+    def get_by_idx(self, idx):
+        idx = pix_tuple_to_idx(idx)
+        idx = np.broadcast_arrays(*idx)
+        valid = np.all(np.stack([t != INVALID_INDEX.int for t in idx]), axis=0)
+        flat = self._ravel_idx([np.where(valid, t, 0) for t in idx])
+
+        vals = np.zeros(flat.shape, dtype=self._dtype)
+        if self.nnz > 0:
+            pos = np.clip(np.searchsorted(self._idx, flat), 0, self.nnz - 1)
+            found = valid & (self._idx[pos] == flat)
+            vals[found] = self._vals[pos[found]]
+
+        if np.issubdtype(self._dtype, np.floating):
+            vals[~valid] = np.nan
+
+        return vals
+
+    def interp_by_coord(self, coords, interp=None, fill_value=None):
+        return self.to_dense().interp_by_coord(coords, interp, fill_value)
+
+    def interp_by_pix(self, pix, interp=None, fill_value=None):
+        return self.to_dense().interp_by_pix(pix, interp, fill_value)
+
+    def fill_by_idx(self, idx, weights=None):
+        idx = pix_tuple_to_idx(idx)
+        msk = np.all(np.stack([t != INVALID_INDEX.int for t in idx]), axis=0)
+        idx = [t[msk] for t in idx]
+
+        if weights is None:
+            weights = np.ones(msk.sum())
+        else:
+            if isinstance(weights, u.Quantity):
+                weights = weights.to_value(self.unit)
+            weights = weights[msk]
+
+        self._add(self._ravel_idx(idx), weights)
+
+    def set_by_idx(self, idx, vals):
+        idx = pix_tuple_to_idx(idx)
+        flat = self._ravel_idx(np.broadcast_arrays(*idx))
+        vals = np.broadcast_to(np.asarray(vals, dtype=self._dtype), flat.shape)
+
+        idx = np.concatenate([self._idx, flat.ravel()])
+        vals = np.concatenate([self._vals, vals.ravel()])
+
+        # keep the last value set for every index
+        idx, idx_last = np.unique(idx[::-1], return_index=True)
+        vals = vals[::-1][idx_last]
+
+        nonzero = vals != 0
+        self._idx, self._vals = idx[nonzero], vals[nonzero]
+
+    def sum_over_axes(self, axes=None, keepdims=False):
+        """To sum map values over all non-spatial axes.
+
+        Parameters
+        ----------
+        keepdims : bool, optional
+            If this is set to true, the axes which are summed over are left in
+            the map with a single bin
+        axes: list
+            Names of MapAxis to reduce over
+            If None, all will summed over
+
+        Returns
+        -------
+        map_out : `~WcsSparseMap`
+            Map with non-spatial axes summed over
+        """
+        if axes is None:
+            axes = [ax.name for ax in self.geom.axes]
+
+        names = [ax.name for ax in reversed(self.geom.axes)]
+        dims = sorted([names.index(name) for name in axes], reverse=True)
+
+        geom = self.geom
+        for name in axes:
+            geom = geom.squash(axis=name) if keepdims else geom.drop(axis=name)
+
+        if np.issubdtype(self._dtype, np.floating):
+            finite = ~np.isnan(self._vals)
+        else:
+            finite = np.ones(self.nnz, dtype=bool)
+
+        idx = list(np.unravel_index(self._idx[finite], self.geom.data_shape))
+
+        for dim in dims:
+            if keepdims:
+                idx[dim] = np.zeros_like(idx[dim])
+            else:
+                del idx[dim]
+
+        map_out = self._init_copy(geom=geom, data=None)
+        idx = np.ravel_multi_index(tuple(idx), geom.data_shape)
+        map_out._add(idx, self._vals[finite])
+        return map_out
+
+    def pad(self, pad_width, mode="constant", cval=0, order=1):
+        return self.from_map(self.to_dense().pad(pad_width, mode, cval, order))
+
+    def crop(self, crop_width):
+        return self.from_map(self.to_dense().crop(crop_width))
+
+    def upsample(self, factor, order=0, preserve_counts=True, axis=None):
+        return self.from_map(
+            self.to_dense().upsample(factor, order, preserve_counts, axis)
+        )
+
+    def downsample(self, factor, preserve_counts=True, axis=None):
+        return self.from_map(self.to_dense().downsample(factor, preserve_counts, axis))
+
+    def cutout(self, position, width, mode="trim"):
+        """
+        Create a cutout around a given position.
+
+        Parameters
+        ----------
+        position : `~astropy.coordinates.SkyCoord`
+            Center position of the cutout region.
+        width : tuple of `~astropy.coordinates.Angle`
+            Angular sizes of the region in (lon, lat) in that specific order.
+            If only one value is passed, a square region is extracted.
+        mode : {'trim', 'partial', 'strict'}
+            Mode option for Cutout2D, for details see `~astropy.nddata.utils.Cutout2D`.
+
+        Returns
+        -------
+        cutout : `~gammapy.maps.WcsSparseMap`
+            Cutout map
+        """
+        geom_cutout = self.geom.cutout(position=position, width=width, mode=mode)
+
+        idx = list(np.unravel_index(self._idx, self.geom.data_shape))
+        idx, selected = _shift_spatial_idx(
+            idx,
+            slices_in=geom_cutout.cutout_info["parent-slices"],
+            slices_out=geom_cutout.cutout_info["cutout-slices"],
+        )
+
+        map_out = self._init_copy(geom=geom_cutout, data=None)
+        map_out._idx = np.ravel_multi_index(tuple(idx), geom_cutout.data_shape)
+        map_out._vals = self._vals[selected]
+        return map_out
+
+    def stack(self, other, weights=None):
+        """Stack cutout into map.
+
+        Parameters
+        ----------
+        other : `WcsSparseMap` or `WcsNDMap`
+            Other map to stack
+        weights : `WcsNDMap` or `~numpy.ndarray`
+            Array to be used as weights.
+        """
+        if isinstance(other, WcsSparseMap):
+            idx = list(np.unravel_index(other._idx, other.geom.data_shape))
+            vals = other._vals
+        else:
+            idx = list(np.nonzero(other.data))
+            vals = other.data[tuple(idx)]
+
+        if weights is not None:
+            if isinstance(weights, Map):
+                weights = weights.get_by_idx(tuple(idx[::-1]))
+            else:
+                weights = np.asarray(weights)[tuple(idx)]
+            vals = vals * weights
+
+        if self.geom == other.geom:
+            pass
+        elif self.geom.is_aligned(other.geom):
+            idx, selected = _shift_spatial_idx(
+                idx,
+                slices_in=other.geom.cutout_info["cutout-slices"],
+                slices_out=other.geom.cutout_info["parent-slices"],
+            )
+            vals = vals[selected]
+        else:
+            raise ValueError(
+                "Can only stack equivalent maps or cutout of the same map."
+            )
+
+        self._add(np.ravel_multi_index(tuple(idx), self.geom.data_shape), vals)
+
+
+def _shift_spatial_idx(idx, slices_in, slices_out):
+    """Select spatial indices within ``slices_in`` and shift them to ``slices_out``.
+
+    The indices are given in data order, with the spatial axes (y, x) last.
+    """
+    selected = np.ones(idx[0].shape, dtype=bool)
+    for idx_spatial, slice_in in zip(idx[-2:], slices_in):
+        selected &= (idx_spatial >= slice_in.start) & (idx_spatial < slice_in.stop)
+
+    idx_out = [t[selected] for t in idx[:-2]]
+    for idx_spatial, slice_in, slice_out in zip(idx[-2:], slices_in, slices_out):
+        idx_out.append(idx_spatial[selected] - slice_in.start + slice_out.start)
+
+    return idx_out, selected
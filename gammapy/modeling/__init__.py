@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Models and fitting."""
 from .datasets import *
+from .executor import *
 from .fit import *
 from .model import *
 from .parameter import *
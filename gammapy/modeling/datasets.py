@@ -1,12 +1,15 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import abc
+import collections
 import collections.abc
 import copy
 import numpy as np
+import astropy.units as u
 from gammapy.utils.scripts import make_path, read_yaml, write_yaml
 from gammapy.utils.table import table_from_row_data
 from ..maps import WcsNDMap
-from .parameter import Parameters
+from .executor import SerialExecutor
+from .parameter import Parameters, _numerical_derivative
 
 __all__ = ["Dataset", "Datasets"]
 
@@ -59,6 +62,112 @@ class Dataset(abc.ABC):
 
         return np.sum(stat, dtype=np.float64)
 
+    def stat_sum_gradient(self, parameters):
+        """Gradient of the total statistic with respect to the parameter values.
+
+        Parameters
+        ----------
+        parameters : list of `~gammapy.modeling.Parameter`
+            Parameters to compute the derivatives for.
+
+        Returns
+        -------
+        gradient : `~numpy.ndarray`
+            Derivative of `stat_sum` per parameter, zero for parameters
+            that are frozen or not used by the dataset.
+        """
+        derivatives = self._stat_sum_derivatives()
+        gradient = [derivatives.get(par, 0) for par in parameters]
+        return np.array(gradient, dtype=np.float64)
+
+    def _stat_sum_derivatives(self):
+        # generic fallback by finite differences, datasets providing
+        # analytical derivatives override this method
+        derivatives = {}
+        for par in self.parameters.free_parameters.unique_parameters:
+            derivatives[par] = _numerical_derivative(self.stat_sum, par)
+        return derivatives
+
+    def stat_sum_batch(self, parameter, values):
+        """Total statistic for a series of values of one parameter.
+
+        For a norm parameter (``is_norm=True``) of a single model component,
+        i.e. not of a model combined in a
+        `~gammapy.modeling.models.CompoundSpectralModel`, the predicted counts
+        are linear in its value as long as it is not negative. Datasets
+        supporting it then evaluate them only twice and compute the statistic
+        for all values at once. Otherwise the values are set one after
+        another. The parameter value is restored afterwards.
+
+        Parameters
+        ----------
+        parameter : `~gammapy.modeling.Parameter`
+            Parameter to vary.
+        values : `~numpy.ndarray` or `~astropy.units.Quantity`
+            Parameter values, in the parameter unit if given as an array.
+
+        Returns
+        -------
+        stats : `~numpy.ndarray`
+            Total statistic per parameter value.
+        """
+        values = np.atleast_1d(u.Quantity(values, parameter.unit).value)
+        factor = parameter.factor
+
+        try:
+            if self._is_linear_norm(parameter, values):
+                stats = self._stat_sum_norm_batch(parameter, values)
+            else:
+                stats = self._stat_sum_loop(parameter, values)
+        finally:
+            parameter.factor = factor
+
+        return stats
+
+    def _is_linear_norm(self, parameter, values):
+        # negative predicted counts are clipped, e.g. after the PSF convolution
+        if not parameter.is_norm or parameter.value < 0 or np.any(values < 0):
+            return False
+
+        components = [getattr(self, "background_model", None)]
+        for model in getattr(self, "models", None) or []:
+            if hasattr(model, "spectral_model"):
+                components += [model.spatial_model, model.spectral_model]
+            else:
+                components.append(model)
+
+        norms = _linear_norm_parameters(components)
+        return any(par is parameter for par in norms)
+
+    def _stat_sum_loop(self, parameter, values):
+        stats = []
+        for value in values:
+            parameter.value = value
+            stats.append(self.stat_sum())
+        return np.array(stats, dtype=np.float64)
+
+    def _stat_sum_norm_batch(self, parameter, values):
+        # datasets that can compute the statistic for a batch of
+        # linearly scaled predicted counts override this method
+        return self._stat_sum_loop(parameter, values)
+
+    @staticmethod
+    def _stat_sum_linear(stat, offset, slope, values, max_size=10000000):
+        """Sum of ``stat(offset + value * slope)`` for each value.
+
+        The values are broadcast along a new first axis in chunks of at most
+        ``max_size`` elements, so ``stat`` must sum over the last axis.
+        """
+        offset, slope = offset.ravel(), slope.ravel()
+        n_values = max(1, max_size // max(offset.size, 1))
+
+        stats = np.empty(len(values))
+        for idx in range(0, len(values), n_values):
+            chunk = values[idx : idx + n_values, np.newaxis]
+            stats[idx : idx + n_values] = stat(offset + chunk * slope)
+
+        return stats
+
     @abc.abstractmethod
     def stat_array(self):
         """Statistic array, one value per data point."""
@@ -84,6 +193,29 @@ class Dataset(abc.ABC):
         return residuals
 
 
+def _linear_norm_parameters(components):
+    """Norm parameters in which the given model components are linear.
+
+    Only norms declared by the component class itself are included, e.g. not
+    the norms of models combined in a
+    `~gammapy.modeling.models.CompoundSpectralModel`, nor parameters that are
+    used more than once.
+    """
+    components = [_ for _ in components if _ is not None]
+    counts = collections.Counter(
+        id(par) for component in components for par in component.parameters
+    )
+
+    norms = []
+    for component in components:
+        for name in type(component).default_parameters.names:
+            par = getattr(component, name)
+            if par.is_norm and counts[id(par)] == 1:
+                norms.append(par)
+
+    return norms
+
+
 class Datasets(collections.abc.Sequence):
     """Dataset collection.
 
@@ -91,16 +223,28 @@ class Datasets(collections.abc.Sequence):
     ----------
     datasets : `Dataset` or list of `Dataset`
         Datasets
+    executor : `~gammapy.modeling.SerialExecutor`
+        Executor used to evaluate the joint likelihood, e.g.
+        `~gammapy.modeling.ThreadExecutor` or `~gammapy.modeling.ProcessExecutor`.
+        By default the datasets are evaluated one after another. When
+        ``datasets`` is a `Datasets` object its executor is used.
     """
 
-    def __init__(self, datasets):
+    def __init__(self, datasets, executor=None):
         if isinstance(datasets, Datasets):
             self._datasets = list(datasets)
+            if executor is None:
+                executor = datasets.executor
         elif isinstance(datasets, list):
             self._datasets = datasets
         else:
             raise TypeError(f"Invalid type: {datasets!r}")
 
+        if executor is None:
+            executor = SerialExecutor()
+
+        self.executor = executor
+
     @property
     def parameters(self):
         """Unique parameters (`~gammapy.modeling.Parameters`).
@@ -123,11 +267,47 @@ class Datasets(collections.abc.Sequence):
 
     def stat_sum(self):
         """Compute joint likelihood"""
-        stat_sum = 0
-        # TODO: add parallel evaluation of likelihoods
-        for dataset in self:
-            stat_sum += dataset.stat_sum()
-        return stat_sum
+        return self.executor.stat_sum(self)
+
+    def stat_sum_gradient(self, parameters=None):
+        """Gradient of the joint likelihood with respect to the free parameter values.
+
+        Parameters
+        ----------
+        parameters : `~gammapy.modeling.Parameters`
+            Parameters to compute the derivatives for, only the free
+            parameters are used. By default `Datasets.parameters`.
+
+        Returns
+        -------
+        gradient : `~numpy.ndarray`
+            Derivative of `stat_sum` per free parameter.
+        """
+        if parameters is None:
+            parameters = self.parameters
+
+        parameters = list(parameters.free_parameters)
+        return self.executor.stat_sum_gradient(self, parameters)
+
+    def stat_sum_batch(self, parameter, values):
+        """Joint likelihood for a series of values of one parameter.
+
+        See `Dataset.stat_sum_batch`.
+
+        Parameters
+        ----------
+        parameter : `~gammapy.modeling.Parameter`
+            Parameter to vary.
+        values : `~numpy.ndarray` or `~astropy.units.Quantity`
+            Parameter values, in the parameter unit if given as an array.
+
+        Returns
+        -------
+        stats : `~numpy.ndarray`
+            Joint likelihood per parameter value.
+        """
+        values = np.atleast_1d(u.Quantity(values, parameter.unit).value)
+        return self.executor.stat_sum_batch(self, parameter, values)
 
     def __str__(self):
         str_ = self.__class__.__name__ + "\n"
@@ -0,0 +1,317 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Executors for the evaluation of the joint likelihood of `Datasets`."""
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+__all__ = ["SerialExecutor", "ThreadExecutor", "ProcessExecutor"]
+
+
+class SerialExecutor:
+    """Evaluate the likelihood of the datasets one after another.
+
+    This is the default used by `~gammapy.modeling.Datasets.stat_sum`.
+    """
+
+    def stat_sum(self, datasets):
+        """Compute joint likelihood.
+
+        Parameters
+        ----------
+        datasets : `~gammapy.modeling.Datasets`
+            Datasets
+
+        Returns
+        -------
+        stat_sum : float
+            Sum of the per-dataset statistics.
+        """
+        return _sum(dataset.stat_sum() for dataset in datasets)
+
+    def stat_sum_gradient(self, datasets, parameters):
+        """Compute the gradient of the joint likelihood.
+
+        Parameters
+        ----------
+        datasets : `~gammapy.modeling.Datasets`
+            Datasets
+        parameters : list of `~gammapy.modeling.Parameter`
+            Parameters to compute the derivatives for.
+
+        Returns
+        -------
+        gradient : `~numpy.ndarray`
+            Sum of the per-dataset gradients.
+        """
+        gradients = (dataset.stat_sum_gradient(parameters) for dataset in datasets)
+        return _sum(gradients, start=np.zeros(len(parameters)))
+
+    def stat_sum_batch(self, datasets, parameter, values):
+        """Compute the joint likelihood for a series of values of one parameter.
+
+        Parameters
+        ----------
+        datasets : `~gammapy.modeling.Datasets`
+            Datasets
+        parameter : `~gammapy.modeling.Parameter`
+            Parameter to vary.
+        values : `~numpy.ndarray`
+            Parameter values.
+
+        Returns
+        -------
+        stats : `~numpy.ndarray`
+            Sum of the per-dataset statistics per parameter value.
+        """
+        stats = (dataset.stat_sum_batch(parameter, values) for dataset in datasets)
+        return _sum(stats, start=np.zeros(len(values)))
+
+    def close(self):
+        """Release the resources held by the executor."""
+
+    def __getstate__(self):
+        # running pools and worker processes are not copied or pickled,
+        # they are re-created on the next call
+        return {}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+class ThreadExecutor(SerialExecutor):
+    """Evaluate the likelihood of the datasets in a pool of threads.
+
+    The datasets and parameters are shared with the threads, so nothing has
+    to be transferred on a call. Speed-ups are limited to the parts of the
+    computation that release the GIL.
+
+    Gradients and `stat_sum_batch` are computed serially, because the
+    datasets temporarily modify the parameter values for them, which would
+    change the result of other datasets sharing these parameters.
+
+    Parameters
+    ----------
+    n_jobs : int
+        Number of threads.
+    """
+
+    def __init__(self, n_jobs=2):
+        self.n_jobs = n_jobs
+        self._pool = None
+
+    def stat_sum(self, datasets):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.n_jobs)
+
+        stats = self._pool.map(lambda dataset: dataset.stat_sum(), datasets)
+        return _sum(stats)
+
+    def __getstate__(self):
+        return {"n_jobs": self.n_jobs}
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class ProcessExecutor(SerialExecutor):
+    """Evaluate the likelihood of the datasets in a set of worker processes.
+
+    On the first call the datasets are split into ``n_jobs`` contiguous chunks
+    and each chunk is transferred once to its own worker process, where it
+    stays for the lifetime of the executor. On every subsequent call only the
+    parameters whose factor, scale or frozen state changed since the previous
+    call are sent to the workers, which makes the executor suited for repeated
+    evaluation by an optimiser.
+
+    The per-dataset statistics are summed in the main process in the order
+    of the datasets, so the result is identical to the `SerialExecutor`.
+
+    Gradients are computed by the workers with respect to all parameters of
+    the datasets and reduced to the requested parameters in the main process.
+
+    Any change to the datasets other than parameter values (e.g. new models
+    or masks) is not seen by the workers. In that case call `close` and the
+    workers are re-created on the next call.
+
+    Parameters
+    ----------
+    n_jobs : int
+        Number of worker processes.
+    """
+
+    def __init__(self, n_jobs=2):
+        self.n_jobs = n_jobs
+        self._datasets = None
+        self._parameters = None
+        self._state = None
+        self._workers = []
+
+    def _start(self, datasets):
+        self.close()
+        parameters = list(datasets.parameters)
+        chunks = np.array_split(np.arange(len(datasets)), self.n_jobs)
+
+        for chunk in chunks:
+            if len(chunk) == 0:
+                continue
+
+            connection, child_connection = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_worker,
+                args=(child_connection, [datasets[int(_)] for _ in chunk], parameters),
+                daemon=True,
+            )
+            process.start()
+            child_connection.close()
+            self._workers.append((process, connection))
+
+        self._datasets = datasets
+        self._parameters = parameters
+        self._state = _parameter_state(parameters)
+
+    def stat_sum(self, datasets):
+        return _sum(self._run(datasets, "stat_sum"))
+
+    def stat_sum_gradient(self, datasets, parameters):
+        gradients = self._run(datasets, "stat_sum_gradient")
+        gradient = _sum(gradients, start=np.zeros(len(self._parameters)))
+
+        # parameters not used by the datasets have a derivative of zero
+        values = [
+            gradient[self._parameters.index(par)] if par in self._parameters else 0
+            for par in parameters
+        ]
+        return np.array(values, dtype=np.float64)
+
+    def stat_sum_batch(self, datasets, parameter, values):
+        update = self._sync(datasets)
+
+        if parameter not in self._parameters:
+            stat_sum = _sum(self._call("stat_sum", update))
+            return np.full(len(values), stat_sum)
+
+        args = (self._parameters.index(parameter), values)
+        stats = self._call("stat_sum_batch", update, args)
+        return _sum(stats, start=np.zeros(len(values)))
+
+    def _run(self, datasets, method):
+        """Call ``method`` on all datasets in the workers."""
+        return self._call(method, self._sync(datasets))
+
+    def _sync(self, datasets):
+        """Start the workers or get the parameter update to send to them."""
+        if self._datasets is None or not self._is_same(datasets):
+            self._start(datasets)
+            return None
+
+        state = _parameter_state(self._parameters)
+        (idx,) = np.nonzero(np.any(state != self._state, axis=1))
+        self._state = state
+        return idx, state[idx]
+
+    def _call(self, method, update, args=()):
+        for _, connection in self._workers:
+            connection.send((method, update, args))
+
+        stats = []
+        errors = []
+        for _, connection in self._workers:
+            status, result = connection.recv()
+            if status == "ok":
+                stats.extend(result)
+            else:
+                errors.append(result)
+
+        if errors:
+            # the worker state might be out of sync now
+            self.close()
+            raise errors[0]
+
+        return stats
+
+    def __getstate__(self):
+        return {"n_jobs": self.n_jobs}
+
+    def _is_same(self, datasets):
+        return len(datasets) == len(self._datasets) and all(
+            a is b for a, b in zip(datasets, self._datasets)
+        )
+
+    def close(self):
+        for process, connection in self._workers:
+            try:
+                connection.send("close")
+            except (BrokenPipeError, OSError):
+                pass
+            connection.close()
+            process.join()
+
+        self._workers = []
+        self._datasets = None
+        self._parameters = None
+        self._state = None
+
+    def __del__(self):
+        self.close()
+
+
+def _sum(stats, start=0):
+    # keep the summation order of the plain loop, so that all executors
+    # give bit-identical results
+    stat_sum = start
+    for stat in stats:
+        stat_sum += stat
+    return stat_sum
+
+
+def _parameter_state(parameters):
+    state = [(_.factor, _.scale, _.frozen) for _ in parameters]
+    return np.array(state, dtype=np.float64)
+
+
+def _worker(connection, datasets, parameters):
+    """Worker process loop holding a pinned chunk of datasets."""
+    while True:
+        try:
+            message = connection.recv()
+        except EOFError:
+            break
+
+        if message == "close":
+            break
+
+        method, update, args = message
+
+        try:
+            if update is not None:
+                for idx, (factor, scale, frozen) in zip(*update):
+                    parameters[idx].scale = scale
+                    parameters[idx].factor = factor
+                    parameters[idx].frozen = bool(frozen)
+
+            if method == "stat_sum_gradient":
+                values = [dataset.stat_sum_gradient(parameters) for dataset in datasets]
+            elif method == "stat_sum_batch":
+                idx, batch = args
+                values = [
+                    dataset.stat_sum_batch(parameters[idx], batch)
+                    for dataset in datasets
+                ]
+            else:
+                values = [dataset.stat_sum() for dataset in datasets]
+
+            result = ("ok", values)
+        except Exception as exc:
+            result = ("error", exc)
+
+        connection.send(result)
+
+    connection.close()
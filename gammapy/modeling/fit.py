@@ -1,5 +1,6 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import logging
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 from astropy.utils import lazyproperty
 from .datasets import Datasets
@@ -112,13 +113,19 @@ class Fit:
 
         return optimize_result
 
-    def optimize(self, backend="minuit", **kwargs):
+    def optimize(self, backend="minuit", gradient=False, **kwargs):
         """Run the optimization.
 
         Parameters
         ----------
         backend : str
             Which backend to use (see ``gammapy.modeling.registry``)
+        gradient : bool
+            Pass the gradient of the likelihood, see
+            `~gammapy.modeling.Datasets.stat_sum_gradient`, to the optimizer.
+            Supported by the "minuit" and "scipy" backends, for the latter only
+            used by gradient based methods. Datasets and models without
+            analytical derivatives fall back to finite differences.
         **kwargs : dict
             Keyword arguments passed to the optimizer. For the `"minuit"` backend
             see https://iminuit.readthedocs.io/en/latest/api.html#iminuit.Minuit
@@ -150,6 +157,9 @@ class Fit:
         if parameters.covariance is None:
             parameters.autoscale()
 
+        if gradient:
+            kwargs["gradient"] = lambda: self.datasets.stat_sum_gradient(parameters)
+
         compute = registry.get("optimize", backend)
         # TODO: change this calling interface!
         # probably should pass a fit statistic, which has a model, which has parameters
@@ -276,6 +286,50 @@ class Fit:
         result["errn"] *= parameter.scale
         return result
 
+    def confidence_all(self, parameters=None, n_jobs=1, **kwargs):
+        """Estimate confidence intervals for several parameters.
+
+        With ``n_jobs > 1`` the parameters are distributed over a pool of
+        worker processes. Each worker receives a copy of the datasets once,
+        at its start. For the "minuit" backend every worker re-runs the
+        optimization, starting from the current best-fit values, to set up
+        its own MINUIT state.
+
+        Parameters
+        ----------
+        parameters : list of `~gammapy.modeling.Parameter` or str
+            Parameters of interest, by default all free parameters.
+        n_jobs : int
+            Number of worker processes.
+        **kwargs : dict
+            Keyword arguments passed to `Fit.confidence`.
+
+        Returns
+        -------
+        results : list of dict
+            Result of `Fit.confidence` per parameter, in the input order.
+        """
+        fit_parameters = self._parameters
+
+        if parameters is None:
+            parameters = fit_parameters.free_parameters
+
+        parameters = [fit_parameters[par] for par in parameters]
+
+        if n_jobs == 1:
+            return [self.confidence(par, **kwargs) for par in parameters]
+
+        backend = kwargs.get("backend", "minuit")
+        if backend == "minuit" and not hasattr(self, "minuit"):
+            raise RuntimeError("To use minuit, you must first optimize.")
+
+        optimize_opts = {"backend": backend} if backend == "minuit" else None
+        idx = [fit_parameters._get_idx(par) for par in parameters]
+
+        with self._process_pool(n_jobs, optimize_opts) as pool:
+            results = pool.map(_confidence_worker, idx, [kwargs] * len(idx))
+            return list(results)
+
     def stat_profile(
         self,
         parameter,
@@ -284,6 +338,7 @@ class Fit:
         nvalues=11,
         reoptimize=False,
         optimize_opts=None,
+        n_jobs=1,
     ):
         """Compute fit statistic profile.
 
@@ -308,6 +363,14 @@ class Fit:
             Number of parameter grid points to use.
         reoptimize : bool
             Re-optimize other parameters, when computing the fit statistic profile.
+            Otherwise the profile is computed with `Datasets.stat_sum_batch`,
+            in a single pass for norm parameters.
+        optimize_opts : dict
+            Options passed to `Fit.optimize` when re-optimizing.
+        n_jobs : int
+            Number of worker processes the parameter values are distributed
+            over when re-optimizing. Each worker receives a copy of the
+            datasets once, at its start.
 
         Returns
         -------
@@ -329,17 +392,28 @@ class Fit:
 
             values = np.linspace(parmin, parmax, nvalues)
 
+        if not reoptimize:
+            stats = self.datasets.stat_sum_batch(parameter, values)
+            return {"values": values, "stat": stats}
+
+        if n_jobs > 1:
+            idx = parameters._get_idx(parameter)
+            with self._process_pool(n_jobs) as pool:
+                stats = pool.map(
+                    _stat_profile_worker,
+                    [idx] * len(values),
+                    values,
+                    [optimize_opts] * len(values),
+                )
+                return {"values": values, "stat": np.array(list(stats))}
+
         stats = []
         with parameters.restore_values:
             for value in values:
                 parameter.value = value
-                if reoptimize:
-                    parameter.frozen = True
-                    result = self.optimize(**optimize_opts)
-                    stat = result.total_stat
-                else:
-                    stat = self.datasets.stat_sum()
-                stats.append(stat)
+                parameter.frozen = True
+                result = self.optimize(**optimize_opts)
+                stats.append(result.total_stat)
 
         return {"values": values, "stat": np.array(stats)}
 
@@ -409,6 +483,14 @@ class Fit:
             "y_info": result["y_info"],
         }
 
+    def _process_pool(self, n_jobs, optimize_opts=None):
+        """Pool of worker processes, each holding a copy of this fit."""
+        return ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(self.datasets, self._parameters.covariance, optimize_opts),
+        )
+
 
 class FitResult:
     """Fit result base class"""
@@ -484,3 +566,39 @@ class OptimizeResult(FitResult):
         str_ += f"\tnfev       : {self.nfev}\n"
         str_ += f"\ttotal stat : {self.total_stat:.2f}\n"
         return str_
+
+
+# fit of the current worker process, see `Fit._process_pool`
+_WORKER_FIT = None
+
+
+def _init_worker(datasets, covariance, optimize_opts):
+    global _WORKER_FIT
+    # the datasets of a worker are evaluated serially
+    fit = Fit(Datasets(list(datasets)))
+
+    if covariance is not None:
+        fit._parameters.covariance = covariance
+
+    if optimize_opts is not None:
+        fit.optimize(**optimize_opts)
+
+    _WORKER_FIT = fit
+
+
+def _confidence_worker(idx, kwargs):
+    fit = _WORKER_FIT
+    return fit.confidence(fit._parameters[idx], **kwargs)
+
+
+def _stat_profile_worker(idx, value, optimize_opts):
+    fit = _WORKER_FIT
+    parameters = fit._parameters
+    parameter = parameters[idx]
+
+    with parameters.restore_values:
+        parameter.value = value
+        parameter.frozen = True
+        result = fit.optimize(**optimize_opts)
+
+    return result.total_stat
@@ -16,8 +16,12 @@ class MinuitLikelihood(Likelihood):
         self.parameters.set_parameter_factors(factors)
         return self.function()
 
+    def grad(self, *factors):
+        self.parameters.set_parameter_factors(factors)
+        return self._gradient_factors()
+
 
-def optimize_iminuit(parameters, function, **kwargs):
+def optimize_iminuit(parameters, function, gradient=None, **kwargs):
     """iminuit optimization
 
     Parameters
@@ -26,6 +30,9 @@ def optimize_iminuit(parameters, function, **kwargs):
         Parameters with starting values
     function : callable
         Likelihood function
+    gradient : callable, optional
+        Gradient of the likelihood function with respect to the free
+        parameter values, passed to `iminuit.Minuit` as ``grad``.
     **kwargs : dict
         Options passed to `iminuit.Minuit` constructor. If there is an entry 'migrad_opts', those options
         will be passed to `iminuit.Minuit.migrad()`.
@@ -43,12 +50,16 @@ def optimize_iminuit(parameters, function, **kwargs):
     kwargs.setdefault("print_level", 0)
     kwargs.update(make_minuit_par_kwargs(parameters))
 
-    minuit_func = MinuitLikelihood(function, parameters)
+    minuit_func = MinuitLikelihood(function, parameters, gradient)
 
     kwargs = kwargs.copy()
     migrad_opts = kwargs.pop("migrad_opts", {})
     strategy = kwargs.pop("strategy", 1)
     tol = kwargs.pop("tol", 0.1)
+
+    if gradient is not None:
+        kwargs["grad"] = minuit_func.grad
+
     minuit = Minuit(minuit_func.fcn, **kwargs)
     minuit.migrad(**migrad_opts)
     minuit.tol = tol
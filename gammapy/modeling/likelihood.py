@@ -1,4 +1,5 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import numpy as np
 
 __all__ = ["Likelihood"]
 
@@ -21,12 +22,24 @@ class Likelihood:
         Parameters with starting values
     function : callable
         Likelihood function
+    gradient : callable, optional
+        Gradient of the likelihood function with respect to the values
+        of the free parameters.
     """
 
-    def __init__(self, function, parameters):
+    def __init__(self, function, parameters, gradient=None):
         self.function = function
         self.parameters = parameters
+        self.gradient = gradient
 
     def fcn(self, factors):
         self.parameters.set_parameter_factors(factors)
         return self.function()
+
+    def grad(self, factors):
+        self.parameters.set_parameter_factors(factors)
+        return self._gradient_factors()
+
+    def _gradient_factors(self):
+        scales = [par.scale for par in self.parameters.free_parameters]
+        return self.gradient() * np.array(scales)
@@ -1,7 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 import copy
 import astropy.units as u
-from .parameter import Parameter, Parameters
+from .parameter import Parameter, Parameters, _numerical_derivative
 
 __all__ = ["Model"]
 
@@ -58,6 +58,25 @@ class Model:
         """A deep copy."""
         return copy.deepcopy(self)
 
+    def _get_derivatives(self, function, analytic=None):
+        """Derivatives of ``function()`` with respect to the free parameters.
+
+        Derivatives of parameters missing in the ``analytic`` dict, keyed
+        by parameter name, are computed by finite differences.
+        """
+        analytic = analytic or {}
+
+        derivatives = {}
+        for parameter in self.parameters.free_parameters:
+            if parameter.name in analytic:
+                derivative = analytic[parameter.name]
+            else:
+                derivative = _numerical_derivative(function, parameter)
+                derivative = derivative / parameter.unit
+            derivatives[parameter] = derivative
+
+        return derivatives
+
     def __str__(self):
         return f"{self.__class__.__name__}\n\n{self.parameters.to_table()}"
 
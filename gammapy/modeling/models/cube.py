@@ -7,6 +7,7 @@ import numpy as np
 import astropy.units as u
 import yaml
 from gammapy.maps import Map
+from gammapy.maps.utils import interp_to_order
 from gammapy.modeling import Model, Parameter, Parameters
 from gammapy.utils.scripts import make_path
 
@@ -305,11 +306,13 @@ class SkyDiffuseCube(SkyModelBase):
         Meta information, meta['filename'] will be used for serialization
     interp_kwargs : dict
         Interpolation keyword arguments passed to `gammapy.maps.Map.interp_by_coord`.
-        Default arguments are {'interp': 'linear', 'fill_value': 0}.
+        Default arguments are {'interp': 'linear', 'fill_value': 0}. For linear
+        and nearest interpolation with ``fill_value=0``, `evaluate_geom`
+        reprojects the map with `gammapy.maps.Map.reproject` instead.
     """
 
     tag = "SkyDiffuseCube"
-    norm = Parameter("norm", 1)
+    norm = Parameter("norm", 1, is_norm=True)
     tilt = Parameter("tilt", 0, unit="", frozen=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
 
@@ -343,6 +346,8 @@ class SkyDiffuseCube(SkyModelBase):
         #  remove this again
         self._cached_value = None
         self._cached_coordinates = (None, None, None)
+        self._cached_geom = None
+        self._cached_geom_value = None
 
         super().__init__(norm=norm, tilt=tilt, reference=reference)
 
@@ -394,6 +399,59 @@ class SkyDiffuseCube(SkyModelBase):
         val = norm * self._cached_value * tilt_factor.value
         return u.Quantity(val, self.map.unit, copy=False)
 
+    @property
+    def _reproject_method(self):
+        """Reprojection method matching the interpolation arguments, or None."""
+        kwargs = dict(self._interp_kwargs)
+        order = interp_to_order(kwargs.pop("interp"))
+
+        if kwargs.pop("fill_value") != 0 or kwargs or len(self.map.geom.axes) > 1:
+            return None
+
+        return {0: "nearest", 1: "bilinear"}.get(order)
+
+    def _reproject(self, geom, method):
+        """Reproject the map on the spatial pixels of the geometry and
+        interpolate it linearly in energy pixel coordinates."""
+        m = self.map.reproject(geom, method=method)
+
+        energy = geom.get_axis_by_name("energy").center
+        nbin = self.map.geom.get_axis_by_name("energy").nbin
+        pix = self.map.geom.get_axis_by_name("energy").coord_to_pix(energy)
+
+        valid = (pix >= 0) & (pix <= nbin - 1)
+        idx = np.clip(np.floor(pix), 0, max(nbin - 2, 0)).astype(int)
+        weight = pix - idx
+
+        if method == "nearest":
+            weight = (weight > 0.5).astype(float)
+
+        weight = np.where(valid, weight, 0)[:, np.newaxis, np.newaxis]
+        idx_upper = np.minimum(idx + 1, nbin - 1)
+        data = (1 - weight) * m.data[idx] + weight * m.data[idx_upper]
+        data[~valid] = 0
+        return data
+
+    def evaluate_geom(self, geom):
+        """Evaluate model on `~gammapy.maps.Geom`."""
+        method = self._reproject_method
+        if method is None:
+            return super().evaluate_geom(geom)
+
+        if self._cached_geom is not geom:
+            self._cached_geom = geom
+            self._cached_geom_value = self._reproject(geom, method)
+
+        norm = self.parameters["norm"].value
+
+        tilt = self.parameters["tilt"].value
+        reference = self.parameters["reference"].quantity
+        energy = geom.get_axis_by_name("energy").center[:, np.newaxis, np.newaxis]
+        tilt_factor = np.power((energy / reference).to(""), -tilt)
+
+        val = norm * self._cached_geom_value * tilt_factor.value
+        return u.Quantity(val, self.map.unit, copy=False)
+
     def copy(self):
         """A shallow copy"""
         return copy.copy(self)
@@ -447,7 +505,7 @@ class BackgroundModel(Model):
     """
 
     tag = "BackgroundModel"
-    norm = Parameter("norm", 1, unit="", min=0)
+    norm = Parameter("norm", 1, unit="", min=0, is_norm=True)
     tilt = Parameter("tilt", 0, unit="", frozen=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
 
@@ -491,6 +549,31 @@ class BackgroundModel(Model):
         back_values = norm * self.map.data * tilt_factor.value
         return self.map.copy(data=back_values)
 
+    def derivatives(self):
+        """Derivatives of the background model with respect to the free parameters.
+
+        Returns
+        -------
+        derivatives : dict of `~gammapy.maps.Map`
+            Derivative per free `~gammapy.modeling.Parameter`, per unit
+            of the parameter.
+        """
+        norm = self.parameters["norm"].value
+        tilt = self.parameters["tilt"].value
+        reference = self.parameters["reference"].value
+        energy = self.energy_center.to_value(self.parameters["reference"].unit)
+
+        values = self.map.data * np.power(energy / reference, -tilt)
+        analytic = {
+            "norm": values,
+            "tilt": -norm * values * np.log(energy / reference),
+            "reference": norm * values * tilt / reference,
+        }
+        return {
+            par: self.map.copy(data=analytic[par.name])
+            for par in self.parameters.free_parameters
+        }
+
     def to_dict(self):
         data = {}
         data["name"] = self.name
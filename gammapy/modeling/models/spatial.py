@@ -105,6 +105,32 @@ class SpatialModel(Model):
         coords = geom.get_coord(frame=self.frame)
         return self(coords.lon, coords.lat)
 
+    def derivatives_geom(self, geom):
+        """Derivatives of `evaluate_geom` with respect to the free parameters.
+
+        Models defining a static ``evaluate_derivatives`` method provide
+        analytical derivatives, for all other parameters the derivatives
+        are computed by finite differences.
+
+        Parameters
+        ----------
+        geom : `~gammapy.maps.Geom`
+            Geometry to evaluate the derivatives on.
+
+        Returns
+        -------
+        derivatives : dict of `~astropy.units.Quantity`
+            Derivative per free `~gammapy.modeling.Parameter`, in units of
+            the model divided by the parameter unit.
+        """
+        analytic = None
+        if hasattr(self, "evaluate_derivatives"):
+            coords = geom.get_coord(frame=self.frame)
+            kwargs = {par.name: par.quantity for par in self.parameters}
+            analytic = self.evaluate_derivatives(coords.lon, coords.lat, **kwargs)
+
+        return self._get_derivatives(lambda: self.evaluate_geom(geom), analytic)
+
     def to_dict(self):
         """Create dict for YAML serilisation"""
         data = super().to_dict()
@@ -253,6 +279,35 @@ class GaussianSpatialModel(SpatialModel):
         exponent = -0.5 * ((1 - np.cos(sep)) / a)
         return u.Quantity(norm * np.exp(exponent).value, "sr-1", copy=False)
 
+    @staticmethod
+    def evaluate_derivatives(lon, lat, lon_0, lat_0, sigma, e, phi):
+        """Evaluate model derivatives.
+
+        Analytical derivatives are only available for the symmetric Gaussian.
+        """
+        if e != 0:
+            return {}
+
+        value = GaussianSpatialModel.evaluate(lon, lat, lon_0, lat_0, sigma, e, phi)
+        sep = angular_separation(lon, lat, lon_0, lat_0)
+        a = 1.0 - np.cos(sigma)
+        b = np.exp(-1.0 / a)
+
+        # derivatives of the cosine of the separation to the center
+        dcos_dlon = np.cos(lat) * np.cos(lat_0) * np.sin(lon - lon_0)
+        dcos_dlat = np.sin(lat) * np.cos(lat_0) - np.cos(lat) * np.sin(
+            lat_0
+        ) * np.cos(lon - lon_0)
+
+        # derivative of the log of the model with respect to a
+        dlog_da = (1 - np.cos(sep)) / (2 * a ** 2) - 1 / a + b / (a ** 2 * (1 - b))
+
+        return {
+            "lon_0": value * dcos_dlon / (2 * a) / u.rad,
+            "lat_0": value * dcos_dlat / (2 * a) / u.rad,
+            "sigma": value * dlog_da * np.sin(sigma) / u.rad,
+        }
+
     def to_region(self, **kwargs):
         """Model outline (`~regions.EllipseSkyRegion`)."""
         minor_axis = Angle(self.sigma.quantity * np.sqrt(1 - self.e.quantity ** 2))
@@ -510,7 +565,7 @@ class TemplateSpatialModel(SpatialModel):
     """
 
     tag = "TemplateSpatialModel"
-    norm = Parameter("norm", 1)
+    norm = Parameter("norm", 1, is_norm=True)
 
     def __init__(
         self,
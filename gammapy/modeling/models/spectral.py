@@ -91,6 +91,52 @@ class SpectralModel(Model):
         q = self(energy)
         return u.Quantity([q.value, f_err], unit=q.unit)
 
+    def derivatives(self, energy):
+        """Derivatives of the model with respect to the free parameters.
+
+        Models defining a static ``evaluate_derivatives`` method provide
+        analytical derivatives, for all other parameters the derivatives
+        are computed by finite differences.
+
+        Parameters
+        ----------
+        energy : `~astropy.units.Quantity`
+            Energy at which to evaluate
+
+        Returns
+        -------
+        derivatives : dict of `~astropy.units.Quantity`
+            Derivative per free `~gammapy.modeling.Parameter`, in units of
+            the model divided by the parameter unit.
+        """
+        analytic = None
+        if hasattr(self, "evaluate_derivatives"):
+            kwargs = {par.name: par.quantity for par in self.parameters}
+            kwargs = self._convert_evaluate_unit(kwargs, energy)
+            analytic = self.evaluate_derivatives(energy, **kwargs)
+
+        return self._get_derivatives(lambda: self(energy), analytic)
+
+    def integral_derivatives(self, emin, emax, **kwargs):
+        """Derivatives of the integral flux with respect to the free parameters.
+
+        The derivatives are computed by finite differences of `integral`.
+
+        Parameters
+        ----------
+        emin, emax : `~astropy.units.Quantity`
+            Lower and upper bound of integration range.
+        **kwargs : dict
+            Keyword arguments passed to `integral`
+
+        Returns
+        -------
+        derivatives : dict of `~astropy.units.Quantity`
+            Derivative per free `~gammapy.modeling.Parameter`, in units of
+            the integral flux divided by the parameter unit.
+        """
+        return self._get_derivatives(lambda: self.integral(emin, emax, **kwargs))
+
     def integral(self, emin, emax, **kwargs):
         r"""Integrate spectral model numerically.
 
@@ -348,13 +394,18 @@ class ConstantSpectralModel(SpectralModel):
     """
 
     tag = "ConstantSpectralModel"
-    const = Parameter("const", "1e-12 cm-2 s-1 TeV-1")
+    const = Parameter("const", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
 
     @staticmethod
     def evaluate(energy, const):
         """Evaluate the model (static function)."""
         return np.ones(np.atleast_1d(energy).shape) * const
 
+    @staticmethod
+    def evaluate_derivatives(energy, const):
+        """Evaluate the model derivatives (static function)."""
+        return {"const": u.Quantity(np.ones(np.atleast_1d(energy).shape))}
+
 
 class CompoundSpectralModel(SpectralModel):
     """Arithmetic combination of two spectral models.
@@ -413,7 +464,7 @@ class PowerLawSpectralModel(SpectralModel):
 
     tag = "PowerLawSpectralModel"
     index = Parameter("index", 2.0)
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
 
     @staticmethod
@@ -421,6 +472,17 @@ class PowerLawSpectralModel(SpectralModel):
         """Evaluate the model (static function)."""
         return amplitude * np.power((energy / reference), -index)
 
+    @staticmethod
+    def evaluate_derivatives(energy, index, amplitude, reference):
+        """Evaluate the model derivatives (static function)."""
+        pwl = np.power((energy / reference), -index)
+        value = amplitude * pwl
+        return {
+            "index": -value * np.log(energy / reference),
+            "amplitude": pwl,
+            "reference": value * index / reference,
+        }
+
     @staticmethod
     def evaluate_integral(emin, emax, index, amplitude, reference):
         """Evaluate the model integral (static function)."""
@@ -543,7 +605,7 @@ class PowerLaw2SpectralModel(SpectralModel):
 
     tag = "PowerLaw2SpectralModel"
 
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1", is_norm=True)
     index = Parameter("index", 2)
     emin = Parameter("emin", "0.1 TeV", frozen=True)
     emax = Parameter("emax", "100 TeV", frozen=True)
@@ -628,7 +690,7 @@ class ExpCutoffPowerLawSpectralModel(SpectralModel):
     tag = "ExpCutoffPowerLawSpectralModel"
 
     index = Parameter("index", 1.5)
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
     lambda_ = Parameter("lambda_", "0.1 TeV-1")
     alpha = Parameter("alpha", "1.0", frozen=True)
@@ -684,7 +746,7 @@ class ExpCutoffPowerLaw3FGLSpectralModel(SpectralModel):
 
     tag = "ExpCutoffPowerLaw3FGLSpectralModel"
     index = Parameter("index", 1.5)
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
     ecut = Parameter("ecut", "10 TeV")
 
@@ -720,7 +782,7 @@ class SuperExpCutoffPowerLaw3FGLSpectralModel(SpectralModel):
     """
 
     tag = "SuperExpCutoffPowerLaw3FGLSpectralModel"
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
     ecut = Parameter("ecut", "10 TeV")
     index_1 = Parameter("index_1", 1.5)
@@ -764,7 +826,7 @@ class SuperExpCutoffPowerLaw4FGLSpectralModel(SpectralModel):
     """
 
     tag = "SuperExpCutoffPowerLaw4FGLSpectralModel"
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
     expfactor = Parameter("expfactor", "1e-2")
     index_1 = Parameter("index_1", 1.5)
@@ -813,7 +875,7 @@ class LogParabolaSpectralModel(SpectralModel):
     """
 
     tag = "LogParabolaSpectralModel"
-    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1")
+    amplitude = Parameter("amplitude", "1e-12 cm-2 s-1 TeV-1", is_norm=True)
     reference = Parameter("reference", "10 TeV", frozen=True)
     alpha = Parameter("alpha", 2)
     beta = Parameter("beta", 1)
@@ -831,6 +893,20 @@ class LogParabolaSpectralModel(SpectralModel):
         exponent = -alpha - beta * np.log(xx)
         return amplitude * np.power(xx, exponent)
 
+    @staticmethod
+    def evaluate_derivatives(energy, amplitude, reference, alpha, beta):
+        """Evaluate the model derivatives (static function)."""
+        xx = energy / reference
+        log_xx = np.log(xx)
+        exponent = -alpha - beta * log_xx
+        value = amplitude * np.power(xx, exponent)
+        return {
+            "amplitude": np.power(xx, exponent),
+            "reference": value * (alpha + 2 * beta * log_xx) / reference,
+            "alpha": -value * log_xx,
+            "beta": -value * log_xx ** 2,
+        }
+
     @property
     def e_peak(self):
         r"""Spectral energy distribution peak energy (`~astropy.units.Quantity`).
@@ -877,7 +953,7 @@ class TemplateSpectralModel(SpectralModel):
     """
 
     tag = "TemplateSpectralModel"
-    norm = Parameter("norm", 1, unit="")
+    norm = Parameter("norm", 1, unit="", is_norm=True)
     tilt = Parameter("tilt", 0, unit="", frozen=True)
     reference = Parameter("reference", "1 TeV", frozen=True)
 
@@ -995,7 +1071,7 @@ class ScaleSpectralModel(SpectralModel):
     """
 
     tag = "ScaleSpectralModel"
-    norm = Parameter("norm", 1, unit="")
+    norm = Parameter("norm", 1, unit="", is_norm=True)
 
     def __init__(self, model, norm=norm.quantity):
         self.model = model
@@ -1337,7 +1413,7 @@ class GaussianSpectralModel(SpectralModel):
     """
 
     tag = "GaussianSpectralModel"
-    norm = Parameter("norm", 1e-12 * u.Unit("cm-2 s-1"))
+    norm = Parameter("norm", 1e-12 * u.Unit("cm-2 s-1"), is_norm=True)
     mean = Parameter("mean", 1 * u.TeV)
     sigma = Parameter("sigma", 2 * u.TeV)
 
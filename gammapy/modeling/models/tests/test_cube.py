@@ -287,6 +287,22 @@ class TestSkyDiffuseCube:
         assert q.shape == (5, 3, 4)
         assert_allclose(q.value.mean(), 42)
 
+    @staticmethod
+    @pytest.mark.parametrize("interp", ["linear", "nearest"])
+    def test_evaluate_geom(geom, interp):
+        axis = MapAxis.from_nodes(
+            [0.1, 1, 100], name="energy", unit="TeV", interp="log"
+        )
+        m = Map.create(
+            skydir=(266.4, -28.9), npix=(6, 5), binsz=1, axes=[axis], frame="icrs"
+        )
+        m.data = np.arange(m.data.size, dtype=float).reshape(m.data.shape)
+        model = SkyDiffuseCube(m, interp_kwargs={"interp": interp})
+
+        coords = geom.get_coord(frame="icrs")
+        expected = model.evaluate(coords.lon, coords.lat, coords["energy"])
+        assert_allclose(model.evaluate_geom(geom), expected, rtol=1e-5)
+
     @staticmethod
     @requires_data()
     def test_read():
@@ -404,6 +420,49 @@ class TestSkyModelMapEvaluator:
         assert_allclose(out.data.sum(), 2.253073467739508e-06, rtol=1e-5)
         assert_allclose(out.data[0, 0, 0], 2.407252e-08, rtol=1e-5)
 
+    @staticmethod
+    def test_compute_npred_cached_template(sky_model, exposure, psf, edisp):
+        model = sky_model.copy()
+        evaluator = MapEvaluator(model, exposure, psf=psf, edisp=edisp)
+
+        def compute_npred_direct():
+            flux = evaluator.compute_flux()
+            npred = evaluator.apply_psf(evaluator.apply_exposure(flux))
+            return evaluator.apply_edisp(npred)
+
+        evaluator.compute_npred()
+        template = evaluator._spatial_template_cache.value
+
+        model.spectral_model.index.value = 2.5
+        model.spectral_model.amplitude.value = 3e-11
+        out = evaluator.compute_npred()
+        assert evaluator._spatial_template_cache.value is template
+        assert_allclose(out.data, compute_npred_direct().data, rtol=1e-5)
+
+        model.spatial_model.sigma.value = 2
+        out = evaluator.compute_npred()
+        assert evaluator._spatial_template_cache.value is not template
+        assert_allclose(out.data, compute_npred_direct().data, rtol=1e-5)
+
+    @staticmethod
+    def test_compute_npred_cached(sky_model, exposure, psf, edisp):
+        model = sky_model.copy()
+        evaluator = MapEvaluator(model, exposure, psf=psf, edisp=edisp)
+
+        npred = evaluator.compute_npred()
+        assert evaluator.compute_npred() is npred
+
+        model.spectral_model.amplitude.frozen = True
+        assert evaluator.compute_npred() is npred
+
+        model.spectral_model.amplitude.value = 2e-11
+        out = evaluator.compute_npred()
+        assert out is not npred
+        assert_allclose(out.data, 2 * npred.data, rtol=1e-5)
+
+        evaluator.psf = None
+        assert evaluator.compute_npred() is not out
+
 
 def test_sky_point_source():
     # Test special case of point source. Regression test for GH 2367.
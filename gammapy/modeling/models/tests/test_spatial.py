@@ -102,6 +102,27 @@ def test_sky_gaussian():
     assert isinstance(model.to_region(), EllipseSkyRegion)
 
 
+def test_sky_gaussian_derivatives():
+    geom = WcsGeom.create(skydir=(5, 15), binsz=0.1, width=2, frame="galactic")
+    model = GaussianSpatialModel(
+        lon_0="5.1 deg", lat_0="14.8 deg", sigma="0.3 deg", frame="galactic"
+    )
+
+    actual = model.derivatives_geom(geom)
+    desired = model._get_derivatives(lambda: model.evaluate_geom(geom))
+
+    assert len(actual) == 3
+    for par, value in desired.items():
+        value = value.to_value("sr-1 deg-1")
+        atol = 1e-4 * np.abs(value).max()
+        assert_allclose(actual[par].to_value("sr-1 deg-1"), value, atol=atol)
+
+    # the elongated Gaussian falls back to finite differences
+    model.parameters["e"].value = 0.5
+    model.parameters["e"].frozen = False
+    assert len(model.derivatives_geom(geom)) == 4
+
+
 def test_sky_disk():
     # Test the disk case (e=0)
     r_0 = 2 * u.deg
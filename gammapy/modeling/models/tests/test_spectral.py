@@ -398,6 +398,29 @@ def test_pwl_pivot_energy():
     assert_quantity_allclose(pwl.pivot_energy, 3.3540034240210987 * u.TeV)
 
 
+@pytest.mark.parametrize(
+    "model",
+    [
+        PowerLawSpectralModel(index=2.3, reference="2 TeV"),
+        LogParabolaSpectralModel(alpha=2.3, beta=0.4, reference="2 TeV"),
+        ConstantSpectralModel(),
+        ExpCutoffPowerLawSpectralModel(),
+    ],
+)
+def test_model_derivatives(model):
+    for par in model.parameters:
+        par.frozen = False
+
+    energy = [300, 1000, 5000, 30000] * u.GeV
+
+    actual = model.derivatives(energy)
+    desired = model._get_derivatives(lambda: model(energy))
+
+    assert list(actual) == list(model.parameters.free_parameters)
+    for par, value in desired.items():
+        assert_allclose(actual[par].to_value(value.unit), value.value, rtol=1e-6)
+
+
 def test_TemplateSpectralModel_evaluate_tiny():
     energy = np.array([1.00000000e06, 1.25892541e06, 1.58489319e06, 1.99526231e06])
     values = np.array([4.39150790e-38, 1.96639562e-38, 8.80497507e-39, 3.94262401e-39])
@@ -31,6 +31,48 @@ def _get_parameters_str(parameters):
     return str_
 
 
+def _numerical_derivative(function, parameter, epsilon=1e-4):
+    """Central finite difference of ``function()`` with respect to the parameter value.
+
+    The step is ``epsilon`` times the parameter factor, or ``epsilon`` for a
+    factor of zero, and the parameter factor is restored afterwards.
+    """
+    factor = parameter.factor
+    step = epsilon * abs(factor) if factor != 0 else epsilon
+
+    try:
+        parameter.factor = factor + step
+        upper = function()
+        parameter.factor = factor - step
+        lower = function()
+    finally:
+        parameter.factor = factor
+
+    return (upper - lower) / (2 * step * parameter.scale)
+
+
+def _linear_coefficients(function, parameter):
+    """Offset and slope of ``function()``, which is linear in the parameter value.
+
+    ``function()`` is evaluated at zero and at the current parameter value,
+    or at a factor of one if the value is zero, and the parameter factor is
+    restored afterwards.
+    """
+    factor = parameter.factor
+
+    try:
+        if factor == 0:
+            parameter.factor = 1
+        value = parameter.value
+        upper = function()
+        parameter.factor = 0
+        offset = function()
+    finally:
+        parameter.factor = factor
+
+    return offset, (upper - offset) / value
+
+
 class Parameter:
     """A model parameter.
 
@@ -64,11 +106,27 @@ class Parameter:
         Maximum (sometimes used in fitting)
     frozen : bool, optional
         Frozen? (used in fitting)
+    is_norm : bool, optional
+        Whether the parameter is a normalisation, i.e. the model component
+        declaring it is proportional to its value. Used to evaluate likelihood
+        profiles for many non-negative values at once, see
+        `~gammapy.modeling.Datasets.stat_sum_batch`.
     """
 
     def __init__(
-        self, name, factor, unit="", scale=1, min=np.nan, max=np.nan, frozen=False
+        self,
+        name,
+        factor,
+        unit="",
+        scale=1,
+        min=np.nan,
+        max=np.nan,
+        frozen=False,
+        is_norm=False,
     ):
+        # counter incremented on every change of the value or unit, used by
+        # the model evaluators to detect changed parameters
+        self._version = 0
         self.name = name
         self.scale = scale
 
@@ -85,6 +143,7 @@ class Parameter:
         self.min = min
         self.max = max
         self.frozen = frozen
+        self.is_norm = is_norm
 
     def __get__(self, instance, owner):
         if instance is None:
@@ -120,6 +179,7 @@ class Parameter:
     @factor.setter
     def factor(self, val):
         self._factor = float(val)
+        self._version += 1
 
     @property
     def scale(self):
@@ -129,6 +189,7 @@ class Parameter:
     @scale.setter
     def scale(self, val):
         self._scale = float(val)
+        self._version += 1
 
     @property
     def unit(self):
@@ -138,6 +199,7 @@ class Parameter:
     @unit.setter
     def unit(self, val):
         self._unit = u.Unit(val)
+        self._version += 1
 
     @property
     def min(self):
@@ -192,6 +254,7 @@ class Parameter:
     @value.setter
     def value(self, val):
         self._factor = float(val) / self._scale
+        self._version += 1
 
     @property
     def quantity(self):
@@ -11,8 +11,23 @@ __all__ = [
     "stat_profile_ul_scipy",
 ]
 
+# `scipy.optimize.minimize` methods that use the gradient
+_GRADIENT_METHODS = [
+    "cg",
+    "bfgs",
+    "newton-cg",
+    "l-bfgs-b",
+    "tnc",
+    "slsqp",
+    "dogleg",
+    "trust-ncg",
+    "trust-krylov",
+    "trust-exact",
+    "trust-constr",
+]
+
 
-def optimize_scipy(parameters, function, **kwargs):
+def optimize_scipy(parameters, function, gradient=None, **kwargs):
     method = kwargs.pop("method", "Nelder-Mead")
     pars = [par.factor for par in parameters.free_parameters]
 
@@ -22,7 +37,11 @@ def optimize_scipy(parameters, function, **kwargs):
         parmax = par.factor_max if not np.isnan(par.factor_max) else None
         bounds.append((parmin, parmax))
 
-    likelihood = Likelihood(function, parameters)
+    likelihood = Likelihood(function, parameters, gradient)
+
+    if gradient is not None and str(method).lower() in _GRADIENT_METHODS:
+        kwargs["jac"] = likelihood.grad
+
     result = scipy.optimize.minimize(
         likelihood.fcn, pars, bounds=bounds, method=method, **kwargs
     )
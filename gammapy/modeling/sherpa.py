@@ -24,7 +24,7 @@ class SherpaLikelihood(Likelihood):
         return self.function(), 0
 
 
-def optimize_sherpa(parameters, function, **kwargs):
+def optimize_sherpa(parameters, function, gradient=None, **kwargs):
     """Sherpa optimization wrapper method.
 
     Parameters
@@ -33,6 +33,8 @@ def optimize_sherpa(parameters, function, **kwargs):
         Parameter list with starting values.
     function : callable
         Likelihood function
+    gradient : callable, optional
+        Not used, the Sherpa optimizers do not support gradients.
     **kwargs : dict
         Options passed to the optimizer instance.
 
@@ -1,10 +1,31 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
+import time
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
-from gammapy.modeling import Datasets
+from gammapy.modeling import (
+    Dataset,
+    Datasets,
+    Parameter,
+    Parameters,
+    ProcessExecutor,
+    ThreadExecutor,
+)
 from .test_fit import MyDataset
 
 
+class MySharedDataset(Dataset):
+    def __init__(self, parameters, name=""):
+        self.name = name
+        self.parameters = parameters
+
+    def stat_sum(self):
+        x = self.parameters["x"].value
+        # give other threads the chance to modify the shared parameter
+        time.sleep(1e-3)
+        return (x - 2) ** 2 + self.parameters["x"].value - x
+
+
 @pytest.fixture(scope="session")
 def datasets():
     return Datasets([MyDataset(name="test-1"), MyDataset(name="test-2")])
@@ -34,3 +55,84 @@ def test_datasets_str(datasets):
 def test_datasets_getitem(datasets):
     assert datasets["test-1"].name == "test-1"
     assert datasets["test-2"].name == "test-2"
+
+
+@pytest.mark.parametrize("executor", [ThreadExecutor, ProcessExecutor])
+def test_datasets_likelihood_executor(executor):
+    datasets = [MyDataset(name=f"test-{idx}") for idx in range(3)]
+    datasets[1].parameters["x"].value = 3
+
+    with executor(n_jobs=2) as ex:
+        datasets = Datasets(datasets, executor=ex)
+        assert_allclose(datasets.stat_sum(), 1)
+
+        # only changed parameters are sent to the workers
+        datasets[2].parameters["y"].value = 302
+        datasets[2].parameters["z"].scale = 10
+        datasets[2].parameters["z"].value = 4e-2
+        assert_allclose(datasets.stat_sum(), 5)
+
+        assert Datasets(datasets).executor is ex
+        assert isinstance(datasets.copy().executor, executor)
+
+
+@pytest.mark.parametrize("executor", [ThreadExecutor, ProcessExecutor])
+def test_datasets_gradient_executor(executor):
+    datasets = [MyDataset(name=f"test-{idx}") for idx in range(3)]
+    datasets[1].parameters["x"].value = 3
+    datasets[2].parameters["y"].frozen = True
+
+    desired = Datasets(datasets).stat_sum_gradient()
+    assert_allclose(desired[:3], [0, 0, 0])
+    assert_allclose(desired[3], 2)
+
+    with executor(n_jobs=2) as ex:
+        datasets = Datasets(datasets, executor=ex)
+        assert_allclose(datasets.stat_sum_gradient(), desired)
+
+        # frozen state changes are sent to the workers
+        datasets[2].parameters["y"].frozen = False
+        datasets[2].parameters["y"].value = 301
+        gradient = datasets.stat_sum_gradient()
+        assert len(gradient) == len(desired) + 1
+        assert_allclose(gradient[-2], 2)
+
+        other = Parameters([Parameter("other", 1), datasets[1].parameters["x"]])
+        assert_allclose(datasets.stat_sum_gradient(other), [0, 2])
+
+
+@pytest.mark.parametrize("executor", [ThreadExecutor, ProcessExecutor])
+def test_datasets_stat_sum_batch_executor(executor):
+    datasets = Datasets([MyDataset(name=f"test-{idx}") for idx in range(3)])
+    parameter = datasets[1].parameters["x"]
+    values = [1, 2, 4]
+
+    desired = datasets.stat_sum_batch(parameter, values)
+    assert_allclose(desired, [1, 0, 4])
+    assert_allclose(parameter.value, 2)
+
+    with executor(n_jobs=2) as ex:
+        datasets = Datasets(datasets, executor=ex)
+        assert_allclose(datasets.stat_sum_batch(parameter, values), desired)
+
+        other = Parameter("other", 1)
+        assert_allclose(datasets.stat_sum_batch(other, values), 0)
+
+
+def test_datasets_shared_parameters_thread_executor():
+    parameters = Parameters([Parameter("x", 3)])
+    datasets = [MySharedDataset(parameters, name=f"test-{idx}") for idx in range(4)]
+    parameter = parameters["x"]
+    values = np.linspace(1, 3, 5)
+
+    desired_gradient = Datasets(datasets).stat_sum_gradient()
+    desired_stats = Datasets(datasets).stat_sum_batch(parameter, values)
+    assert_allclose(desired_gradient, [8], rtol=1e-6)
+    assert_allclose(desired_stats, 4 * (values - 2) ** 2)
+
+    with ThreadExecutor(n_jobs=4) as ex:
+        datasets = Datasets(datasets, executor=ex)
+        assert_allclose(datasets.stat_sum_gradient(), desired_gradient)
+        assert_allclose(datasets.stat_sum_batch(parameter, values), desired_stats)
+
+    assert_allclose(parameter.value, 3)
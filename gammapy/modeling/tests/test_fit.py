@@ -1,6 +1,7 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 """Unit tests for the Fit class"""
 import pytest
+import numpy as np
 from numpy.testing import assert_allclose
 from gammapy.modeling import Fit, Parameter, Parameters
 from gammapy.utils.testing import requires_dependency
@@ -22,6 +23,22 @@ class MyDataset:
         x_opt, y_opt, z_opt = 2, 3e2, 4e-2
         return (x - x_opt) ** 2 + (y - y_opt) ** 2 + (z - z_opt) ** 2
 
+    def stat_sum_gradient(self, parameters):
+        x, y, z = [p.value for p in self.parameters]
+        x_opt, y_opt, z_opt = 2, 3e2, 4e-2
+        derivatives = dict(
+            zip(self.parameters, [2 * (x - x_opt), 2 * (y - y_opt), 2 * (z - z_opt)])
+        )
+        return np.array([derivatives.get(par, 0) for par in parameters])
+
+    def stat_sum_batch(self, parameter, values):
+        stats = []
+        with self.parameters.restore_values:
+            for value in values:
+                parameter.value = value
+                stats.append(self.stat_sum())
+        return np.array(stats)
+
     def fcn(self):
         x, y, z = [p.value for p in self.parameters]
         x_opt, y_opt, z_opt = 2, 3e5, 4e-5
@@ -73,6 +90,31 @@ def test_optimize(backend):
     assert_allclose(pars["z"].value, 4e-2, rtol=1e-3)
 
 
+@pytest.mark.parametrize(
+    "backend, kwargs",
+    [
+        ("minuit", {}),
+        ("scipy", {"method": "L-BFGS-B"}),
+        # the gradient is not passed to methods that do not use it
+        ("scipy", {"method": "Nelder-Mead"}),
+    ],
+)
+def test_optimize_gradient(backend, kwargs):
+    dataset = MyDataset()
+    dataset.parameters["x"].value = 1
+    dataset.parameters["y"].frozen = True
+    fit = Fit([dataset])
+
+    assert_allclose(fit.datasets.stat_sum_gradient(), [-2, 0])
+
+    result = fit.optimize(backend=backend, gradient=True, **kwargs)
+    pars = dataset.parameters
+
+    assert result.success is True
+    assert_allclose(pars["x"].value, 2, rtol=1e-3)
+    assert_allclose(pars["z"].value, 4e-2, rtol=1e-3)
+
+
 # TODO: add some extra covariance tests, in addition to run
 # Probably mainly if error message is OK if optimize didn't run first.
 # def test_covariance():
@@ -106,6 +148,37 @@ def test_confidence_frozen(backend):
     assert_allclose(result["errn"], 1)
 
 
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_confidence_all(n_jobs):
+    dataset = MyDataset()
+    dataset.parameters["z"].frozen = True
+    fit = Fit([dataset])
+    fit.optimize()
+    results = fit.confidence_all(n_jobs=n_jobs)
+
+    assert len(results) == 2
+    for result in results:
+        assert result["success"] is True
+        assert_allclose(result["errp"], 1)
+        assert_allclose(result["errn"], 1)
+
+    # Check that original value state wasn't changed
+    assert_allclose(dataset.parameters["x"].value, 2)
+
+
+@requires_dependency("scipy")
+def test_confidence_all_scipy():
+    dataset = MyDataset()
+    fit = Fit([dataset])
+    # the covariance is passed on to the workers to bracket the intervals
+    fit.run()
+    results = fit.confidence_all(["x", "y"], n_jobs=2, backend="scipy")
+
+    assert len(results) == 2
+    assert_allclose(results[1]["errp"], 1, rtol=1e-3)
+    assert_allclose(results[1]["errn"], 1, rtol=1e-3)
+
+
 def test_stat_profile():
     dataset = MyDataset()
     fit = Fit([dataset])
@@ -131,6 +204,19 @@ def test_stat_profile_reoptimize():
     assert_allclose(result["stat"], [4, 0, 4], atol=1e-7)
 
 
+def test_stat_profile_reoptimize_parallel():
+    dataset = MyDataset()
+    fit = Fit([dataset])
+    fit.run()
+
+    result = fit.stat_profile("x", nvalues=3, reoptimize=True, n_jobs=2)
+
+    assert_allclose(result["values"], [0, 2, 4], atol=1e-7)
+    assert_allclose(result["stat"], [4, 0, 4], atol=1e-7)
+    assert_allclose(dataset.parameters["x"].value, 2)
+    assert not dataset.parameters["x"].frozen
+
+
 def test_minos_contour():
     dataset = MyDataset()
     dataset.parameters["x"].frozen = True
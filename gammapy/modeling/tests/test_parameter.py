@@ -56,6 +56,20 @@ def test_parameter_quantity():
     assert par.unit == "deg"
 
 
+def test_parameter_version():
+    par = Parameter("spam", 42, "deg")
+    version = par._version
+
+    par.frozen = True
+    par.min = 0
+    assert par._version == version
+
+    for attr, value in [("factor", 2), ("scale", 3), ("value", 4), ("unit", "rad")]:
+        setattr(par, attr, value)
+        assert par._version > version
+        version = par._version
+
+
 def test_parameter_repr():
     par = Parameter("spam", 42, "deg")
     assert repr(par).startswith("Parameter(name=")
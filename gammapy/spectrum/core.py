@@ -386,6 +386,30 @@ class SpectrumEvaluator:
         true_counts = self.apply_aeff(integral_flux)
         return self.apply_edisp(true_counts)
 
+    def compute_npred_derivatives(self):
+        """Derivatives of the predicted counts with respect to the free parameters.
+
+        The derivatives of the integral flux are propagated through the
+        effective area and energy dispersion.
+
+        Returns
+        -------
+        derivatives : dict of `CountsSpectrum`
+            Derivative per free `~gammapy.modeling.Parameter`, per unit of
+            the parameter.
+        """
+        e_true = self.aeff.energy.edges
+        derivatives = self.model.spectral_model.integral_derivatives(
+            emin=e_true[:-1], emax=e_true[1:], intervals=True
+        )
+
+        npred_derivatives = {}
+        for par, value in derivatives.items():
+            true_counts = self.apply_aeff(value * par.unit)
+            npred_derivatives[par] = self.apply_edisp(true_counts)
+
+        return npred_derivatives
+
     def apply_aeff(self, integral_flux):
         if self.aeff is not None:
             cts = integral_flux * self.aeff.data.data
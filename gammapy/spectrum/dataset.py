@@ -7,8 +7,17 @@ from astropy.table import Table
 from gammapy.data import GTI
 from gammapy.irf import EffectiveAreaTable, EDispKernel, IRFStacker
 from gammapy.modeling import Dataset, Parameters
+from gammapy.modeling.parameter import _linear_coefficients
 from gammapy.modeling.models import SkyModel, SkyModels
-from gammapy.stats import cash, significance_on_off, wstat
+from gammapy.stats import (
+    cash,
+    cash_derivative,
+    cash_sum_cython,
+    significance_on_off,
+    wstat,
+    wstat_derivative,
+    wstat_sum_cython,
+)
 from gammapy.utils.fits import energy_axis_to_ebounds
 from gammapy.utils.random import get_random_state
 from gammapy.utils.scripts import make_path
@@ -257,6 +266,39 @@ class SpectrumDataset(Dataset):
         """Likelihood per bin given the current model parameters"""
         return cash(n_on=self.counts.data, mu_on=self.npred().data)
 
+    def stat_sum(self):
+        """Total likelihood given the current model parameters."""
+        return cash_sum_cython(
+            counts=self.counts.data, npred=self.npred().data, mask=self.mask
+        )
+
+    def _stat_sum_norm_batch(self, parameter, values):
+        mask = slice(None) if self.mask is None else self.mask
+        offset, slope = _linear_coefficients(lambda: self.npred().data[mask], parameter)
+        counts = self.counts.data[mask].ravel()
+
+        def stat(npred):
+            return np.sum(cash(n_on=counts, mu_on=npred), axis=-1)
+
+        return self._stat_sum_linear(stat, offset, slope, values)
+
+    def _stat_sum_derivatives(self):
+        dstat = cash_derivative(n_on=self.counts.data, mu_on=self.npred().data)
+        return self._npred_derivatives_sum(dstat)
+
+    def _npred_derivatives_sum(self, dstat):
+        """Sum of the statistic derivatives times the npred derivatives."""
+        if self.mask is not None:
+            dstat = np.where(self.mask, dstat, 0)
+
+        derivatives = {}
+        for evaluator in self._evaluators:
+            for par, value in evaluator.compute_npred_derivatives().items():
+                derivative = np.sum(dstat * value.data)
+                derivatives[par] = derivatives.get(par, 0) + derivative
+
+        return derivatives
+
     def _as_counts_spectrum(self, data):
         energy = self._energy_axis.edges
         return CountsSpectrum(data=data, energy_lo=energy[:-1], energy_hi=energy[1:])
@@ -653,6 +695,40 @@ class SpectrumDatasetOnOff(SpectrumDataset):
         )
         return np.nan_to_num(on_stat_)
 
+    def stat_sum(self):
+        """Total likelihood given the current model parameters."""
+        return wstat_sum_cython(
+            n_on=self.counts.data,
+            n_off=self.counts_off.data,
+            alpha=self.alpha,
+            mu_sig=self.npred_sig().data,
+            mask=self.mask,
+        )
+
+    def _stat_sum_norm_batch(self, parameter, values):
+        mask = slice(None) if self.mask is None else self.mask
+        offset, slope = _linear_coefficients(
+            lambda: self.npred_sig().data[mask], parameter
+        )
+        n_on = self.counts.data[mask].ravel()
+        n_off = self.counts_off.data[mask].ravel()
+        alpha = np.broadcast_to(self.alpha, self.counts.data.shape)[mask].ravel()
+
+        def stat(mu_sig):
+            stat = wstat(n_on=n_on, n_off=n_off, alpha=alpha, mu_sig=mu_sig)
+            return np.sum(np.nan_to_num(stat), axis=-1)
+
+        return self._stat_sum_linear(stat, offset, slope, values)
+
+    def _stat_sum_derivatives(self):
+        dstat = wstat_derivative(
+            n_on=self.counts.data,
+            n_off=self.counts_off.data,
+            alpha=self.alpha,
+            mu_sig=self.npred_sig().data,
+        )
+        return self._npred_derivatives_sum(np.nan_to_num(dstat))
+
     def fake(self, background_model, random_state="random-seed"):
         """Simulate fake counts for the current model and reduced irfs.
 
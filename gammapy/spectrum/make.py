@@ -69,8 +69,10 @@ class SpectrumDatasetMaker:
         counts = CountsSpectrum(
             energy_hi=edges[1:], energy_lo=edges[:-1], region=region
         )
-        events_region = observation.events.select_region(
-            region, wcs=self.geom_ref(region).wcs
+        events_region = observation.get_events(
+            columns=["RA", "DEC", "ENERGY"],
+            region=region,
+            wcs=self.geom_ref(region).wcs,
         )
         counts.fill_events(events_region)
         return counts
@@ -106,6 +106,22 @@ class TestSpectrumDataset:
         assert int(real_dataset.counts.data.sum()) == 907010
         assert self.dataset.counts.data.sum() == 907331
 
+    @pytest.mark.parametrize("name", ["amplitude", "index"])
+    def test_stat_sum_batch(self, name):
+        parameter = self.dataset.parameters[name]
+        value = parameter.value
+        values = value * np.array([0.5, 1, 2])
+
+        desired = []
+        for val in values:
+            parameter.value = val
+            desired.append(self.dataset.stat_sum())
+        parameter.value = value
+
+        actual = self.dataset.stat_sum_batch(parameter, values)
+        assert_allclose(actual, desired, rtol=1e-7)
+        assert_allclose(parameter.value, value)
+
     def test_incorrect_mask(self):
         mask_fit = np.ones(self.nbins, dtype=np.dtype("float"))
         with pytest.raises(ValueError):
@@ -435,6 +451,21 @@ class TestSpectrumOnOff:
         assert "SpectrumDatasetOnOff" in str(dataset)
         assert "wstat" in str(dataset)
 
+    def test_stat_sum_batch(self):
+        self.dataset.models = SkyModel(spectral_model=PowerLawSpectralModel())
+        amplitude = self.dataset.parameters["amplitude"]
+        values = np.array([0, 1e-12, 3e-12])
+
+        desired = []
+        for value in values:
+            amplitude.value = value
+            desired.append(self.dataset.stat_sum())
+        amplitude.value = 1e-12
+
+        actual = self.dataset.stat_sum_batch(amplitude, values)
+        assert_allclose(actual, desired)
+        assert_allclose(amplitude.value, 1e-12)
+
     def test_fake(self):
         """Test the fake dataset"""
         source_model = SkyModel(spectral_model=PowerLawSpectralModel())
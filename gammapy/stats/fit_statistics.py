@@ -5,7 +5,15 @@ see :ref:`fit-statistics`
 """
 import numpy as np
 
-__all__ = ["cash", "cstat", "wstat", "get_wstat_mu_bkg", "get_wstat_gof_terms"]
+__all__ = [
+    "cash",
+    "cash_derivative",
+    "cstat",
+    "wstat",
+    "wstat_derivative",
+    "get_wstat_mu_bkg",
+    "get_wstat_gof_terms",
+]
 
 N_ON_MIN = 1e-25
 
@@ -52,6 +60,36 @@ def cash(n_on, mu_on):
     return stat
 
 
+def cash_derivative(n_on, mu_on):
+    r"""Derivative of the Cash statistic with respect to the expected counts.
+
+    .. math::
+        \frac{\partial C}{\partial \mu_{on}} = 2 \left( 1 -
+            \frac{n_{on}}{\mu_{on}} \right)
+
+    and zero where :math:`\mu <= 0`, consistent with `cash`.
+
+    Parameters
+    ----------
+    n_on : array_like
+        Observed counts
+    mu_on : array_like
+        Expected counts
+
+    Returns
+    -------
+    derivative : ndarray
+        Derivative per bin
+    """
+    n_on = np.asanyarray(n_on)
+    mu_on = np.asanyarray(mu_on)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derivative = 2 * (1 - n_on / mu_on)
+        derivative = np.where(mu_on > 0, derivative, 0)
+    return derivative
+
+
 def cstat(n_on, mu_on, n_on_min=N_ON_MIN):
     r"""C statistic, for Poisson data.
 
@@ -181,6 +219,45 @@ def wstat(n_on, n_off, alpha, mu_sig, mu_bkg=None, extra_terms=True):
     return stat
 
 
+def wstat_derivative(n_on, n_off, alpha, mu_sig):
+    r"""Derivative of the W statistic with respect to the expected signal counts.
+
+    Because the background is profiled, the derivative of `wstat` is the
+    partial derivative at the background estimate ``mu_bkg`` given by
+    `get_wstat_mu_bkg`:
+
+    .. math::
+        \frac{\partial W}{\partial \mu_{sig}} = 2 \left( 1 -
+            \frac{n_{on}}{\mu_{sig} + \alpha \mu_{bkg}} \right)
+
+    Parameters
+    ----------
+    n_on : array_like
+        Total observed counts
+    n_off : array_like
+        Total observed background counts
+    alpha : array_like
+        Exposure ratio between on and off region
+    mu_sig : array_like
+        Signal expected counts
+
+    Returns
+    -------
+    derivative : ndarray
+        Derivative per bin
+    """
+    n_on = np.atleast_1d(np.asanyarray(n_on, dtype=np.float64))
+    alpha = np.atleast_1d(np.asanyarray(alpha, dtype=np.float64))
+    mu_sig = np.atleast_1d(np.asanyarray(mu_sig, dtype=np.float64))
+
+    mu_bkg = get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        derivative = 2 * (1 - n_on / (mu_sig + alpha * mu_bkg))
+
+    return np.where(n_on == 0, 2, derivative)
+
+
 def get_wstat_mu_bkg(n_on, n_off, alpha, mu_sig):
     """Background estimate ``mu_bkg`` for WSTAT.
 
@@ -1,31 +1,290 @@
 # Licensed under a 3-clause BSD style license - see LICENSE.rst
 # cython: language_level=3
+"""Compiled summed fit statistics.
+
+The kernels release the GIL and compute the statistic in double precision.
+The arrays are summed in blocks of ``BLOCK_SIZE`` elements and the partial
+sums of the blocks are added in a fixed order, so the result does not depend
+on the number of threads. Arrays with at least ``PARALLEL_MIN_SIZE`` elements
+are summed in parallel with OpenMP, if the extension was compiled with OpenMP
+support. Smaller arrays are summed serially, because there the thread
+start-up time dominates.
+"""
 import numpy as np
-cimport numpy as np
 cimport cython
+from cython.parallel cimport prange
+from libc.float cimport DBL_MAX
+from libc.math cimport INFINITY, log, sqrt
+from .fit_statistics import N_ON_MIN
+
+__all__ = ["cash_sum_cython", "cstat_sum_cython", "wstat_sum_cython"]
+
+# minimum number of elements to use the parallel loop
+cdef Py_ssize_t PARALLEL_MIN_SIZE = 100000
+
+# number of elements summed serially per block
+cdef Py_ssize_t BLOCK_SIZE = 4096
+
+
+def _as_double(array):
+    return np.ascontiguousarray(array, dtype=np.float64).ravel()
+
+
+def _as_mask(mask, size):
+    if mask is None:
+        return None
+    mask = np.ascontiguousarray(mask, dtype=bool).ravel()
+    if mask.size != size:
+        raise ValueError(f"Mask size {mask.size} does not match data size {size}")
+    return mask.view(np.uint8)
+
+
+def _check_sizes(*arrays):
+    size = arrays[0].size
+    for array in arrays[1:]:
+        if array.size != size:
+            raise ValueError(f"Array sizes do not match: {size} and {array.size}")
+    return size
+
+
+cdef inline double _nan_to_num(double x) nogil:
+    # same as `np.nan_to_num` for a scalar
+    if x != x:
+        return 0
+    if x == INFINITY:
+        return DBL_MAX
+    if x == -INFINITY:
+        return -DBL_MAX
+    return x
+
+
+cdef inline double _cash(double n_on, double mu_on) nogil:
+    # also true for NaN, as `np.where(mu_on > 0, stat, 0)` in the NumPy version
+    if not mu_on > 0:
+        return 0
+    if n_on > 0:
+        return mu_on - n_on * log(mu_on)
+    return mu_on
+
+
+cdef inline double _cstat(double n_on, double mu_on, double n_on_min) nogil:
+    # also true for NaN, as `np.where(mu_on > 0, stat, 0)` in the NumPy version
+    if not mu_on > 0:
+        return 0
+    if n_on <= n_on_min:
+        n_on = n_on_min
+    return mu_on - n_on + n_on * (log(n_on) - log(mu_on))
+
+
+cdef inline double _wstat(
+    double n_on, double n_off, double alpha, double mu_sig
+) nogil:
+    cdef double c, d, mu_bkg, stat
+
+    c = alpha * (n_on + n_off) - (1 + alpha) * mu_sig
+    d = sqrt(c * c + 4 * alpha * (alpha + 1) * n_off * mu_sig)
+    mu_bkg = (c + d) / (2 * alpha * (alpha + 1))
+
+    stat = mu_sig + (1 + alpha) * mu_bkg
+
+    # the goodness of fit terms are included, as in `wstat(extra_terms=True)`
+    if n_on != 0:
+        stat += -n_on * log(mu_sig + alpha * mu_bkg) - n_on * (1 - log(n_on))
+
+    if n_off != 0:
+        stat += -n_off * log(mu_bkg) - n_off * (1 - log(n_off))
+
+    return _nan_to_num(2 * stat)
+
+
+cdef struct _Data:
+    # pointers to the input arrays of a kernel, ``mask`` is NULL if not given
+    const double *x0
+    const double *x1
+    const double *x2
+    const double *x3
+    const unsigned char *mask
+    double n_on_min
+
+
+ctypedef double (*_block_sum_t)(
+    const _Data *data, Py_ssize_t start, Py_ssize_t stop
+) nogil
+
+
+cdef double _cash_block(const _Data *data, Py_ssize_t start, Py_ssize_t stop) nogil:
+    cdef double sum = 0
+    cdef Py_ssize_t i
+
+    for i in range(start, stop):
+        if data.mask == NULL or data.mask[i]:
+            sum += _cash(data.x0[i], data.x1[i])
+
+    return sum
+
+
+cdef double _cstat_block(const _Data *data, Py_ssize_t start, Py_ssize_t stop) nogil:
+    cdef double sum = 0
+    cdef Py_ssize_t i
+
+    for i in range(start, stop):
+        if data.mask == NULL or data.mask[i]:
+            sum += _cstat(data.x0[i], data.x1[i], data.n_on_min)
+
+    return sum
+
+
+cdef double _wstat_block(const _Data *data, Py_ssize_t start, Py_ssize_t stop) nogil:
+    cdef double sum = 0
+    cdef Py_ssize_t i
+
+    for i in range(start, stop):
+        if data.mask == NULL or data.mask[i]:
+            sum += _wstat(data.x0[i], data.x1[i], data.x2[i], data.x3[i])
+
+    return sum
+
+
+def _n_blocks(size):
+    return (size + BLOCK_SIZE - 1) // BLOCK_SIZE
 
-cdef extern from "math.h":
-    float log(float x)
 
-@cython.cdivision(True)
 @cython.boundscheck(False)
-def cash_sum_cython(np.ndarray[np.float_t, ndim=1] counts,
-                    np.ndarray[np.float_t, ndim=1] npred):
+@cython.wraparound(False)
+cdef double _blocked_sum(
+    _block_sum_t block_sum, const _Data *data, Py_ssize_t n, double[::1] partial
+) nogil:
+    # the blocks are summed in parallel for large arrays, their partial sums
+    # are always added serially in the same order
+    cdef double sum = 0
+    cdef Py_ssize_t i, n_blocks = partial.shape[0]
+
+    if n < PARALLEL_MIN_SIZE:
+        for i in range(n_blocks):
+            partial[i] = block_sum(data, i * BLOCK_SIZE, min(n, (i + 1) * BLOCK_SIZE))
+    else:
+        for i in prange(n_blocks, schedule="static"):
+            partial[i] = block_sum(data, i * BLOCK_SIZE, min(n, (i + 1) * BLOCK_SIZE))
+
+    for i in range(n_blocks):
+        sum += partial[i]
+
+    return sum
+
+
+def cash_sum_cython(counts, npred, mask=None):
     """Summed cash fit statistics.
 
+    Same as ``cash(counts, npred)[mask].sum()``.
+
+    Parameters
+    ----------
+    counts : `~numpy.ndarray`
+        Counts array.
+    npred : `~numpy.ndarray`
+        Predicted counts array.
+    mask : `~numpy.ndarray`, optional
+        Boolean mask of the bins to sum, by default all bins.
+    """
+    counts, npred = _as_double(counts), _as_double(npred)
+    size = _check_sizes(counts, npred)
+
+    cdef const double[::1] counts_ = counts, npred_ = npred
+    cdef const unsigned char[::1] mask_ = _as_mask(mask, size)
+    cdef double[::1] partial = np.empty(_n_blocks(size))
+    cdef _Data data
+    cdef double stat
+
+    if size == 0:
+        return 0.0
+
+    data.x0 = &counts_[0]
+    data.x1 = &npred_[0]
+    data.mask = NULL if mask_ is None else &mask_[0]
+
+    with nogil:
+        stat = _blocked_sum(_cash_block, &data, size, partial)
+    return 2 * stat
+
+
+def cstat_sum_cython(counts, npred, mask=None, n_on_min=N_ON_MIN):
+    """Summed cstat fit statistics.
+
+    Same as ``cstat(counts, npred, n_on_min)[mask].sum()``.
+
     Parameters
     ----------
     counts : `~numpy.ndarray`
         Counts array.
     npred : `~numpy.ndarray`
         Predicted counts array.
+    mask : `~numpy.ndarray`, optional
+        Boolean mask of the bins to sum, by default all bins.
+    n_on_min : float
+        Minimum ``counts`` value.
     """
-    cdef np.float_t sum = 0
-    cdef unsigned int i, ni
-    ni = counts.shape[0]
-    for i in range(ni):
-        if npred[i] > 0:
-            sum += npred[i]
-            if counts[i] > 0:
-                sum -= counts[i] * log(npred[i])
-    return 2 * sum
+    counts, npred = _as_double(counts), _as_double(npred)
+    size = _check_sizes(counts, npred)
+
+    cdef const double[::1] counts_ = counts, npred_ = npred
+    cdef const unsigned char[::1] mask_ = _as_mask(mask, size)
+    cdef double[::1] partial = np.empty(_n_blocks(size))
+    cdef _Data data
+    cdef double stat
+
+    if size == 0:
+        return 0.0
+
+    data.x0 = &counts_[0]
+    data.x1 = &npred_[0]
+    data.mask = NULL if mask_ is None else &mask_[0]
+    data.n_on_min = n_on_min
+
+    with nogil:
+        stat = _blocked_sum(_cstat_block, &data, size, partial)
+    return 2 * stat
+
+
+def wstat_sum_cython(n_on, n_off, alpha, mu_sig, mask=None):
+    """Summed wstat fit statistics, including the goodness of fit terms.
+
+    Same as ``np.nan_to_num(wstat(n_on, n_off, alpha, mu_sig))[mask].sum()``.
+
+    Parameters
+    ----------
+    n_on : `~numpy.ndarray`
+        Total observed counts.
+    n_off : `~numpy.ndarray`
+        Total observed background counts.
+    alpha : `~numpy.ndarray` or float
+        Exposure ratio between on and off region, broadcast to the shape of
+        ``n_on``.
+    mu_sig : `~numpy.ndarray`
+        Signal expected counts.
+    mask : `~numpy.ndarray`, optional
+        Boolean mask of the bins to sum, by default all bins.
+    """
+    alpha = np.broadcast_to(alpha, np.shape(n_on))
+    n_on, n_off = _as_double(n_on), _as_double(n_off)
+    alpha, mu_sig = _as_double(alpha), _as_double(mu_sig)
+    size = _check_sizes(n_on, n_off, alpha, mu_sig)
+
+    cdef const double[::1] n_on_ = n_on, n_off_ = n_off
+    cdef const double[::1] alpha_ = alpha, mu_sig_ = mu_sig
+    cdef const unsigned char[::1] mask_ = _as_mask(mask, size)
+    cdef double[::1] partial = np.empty(_n_blocks(size))
+    cdef _Data data
+    cdef double stat
+
+    if size == 0:
+        return 0.0
+
+    data.x0 = &n_on_[0]
+    data.x1 = &n_off_[0]
+    data.x2 = &alpha_[0]
+    data.x3 = &mu_sig_[0]
+    data.mask = NULL if mask_ is None else &mask_[0]
+
+    with nogil:
+        stat = _blocked_sum(_wstat_block, &data, size, partial)
+    return stat
@@ -118,6 +118,112 @@ def test_cash_sum_cython(test_data):
     assert_allclose(stat, ref)
 
 
+def test_cash_sum_cython_mask(test_data):
+    mask = np.array(test_data["n_off"]) > 4
+    stat = stats.cash_sum_cython(test_data["n_on"], test_data["mu_sig"], mask=mask)
+    ref = stats.cash(test_data["n_on"], test_data["mu_sig"])[mask].sum()
+    assert_allclose(stat, ref)
+
+    with pytest.raises(ValueError):
+        stats.cash_sum_cython(test_data["n_on"], test_data["mu_sig"], mask=mask[1:])
+
+
+def test_cash_sum_cython_large():
+    # summed in parallel blocks, the result does not depend on the threads
+    random_state = np.random.RandomState(0)
+    npred = random_state.uniform(0.1, 10, size=300000)
+    counts = random_state.poisson(npred).astype(float)
+
+    stat = stats.cash_sum_cython(counts, npred)
+    assert_allclose(stat, stats.cash(counts, npred).sum())
+    assert all(stats.cash_sum_cython(counts, npred) == stat for _ in range(5))
+
+    assert stats.cash_sum_cython(counts[:0], npred[:0]) == 0
+
+
+def test_cstat_sum_cython(test_data):
+    mask = np.array(test_data["n_off"]) > 4
+    stat = stats.cstat_sum_cython(test_data["n_on"], test_data["mu_sig"], mask=mask)
+    ref = stats.cstat(test_data["n_on"], test_data["mu_sig"])[mask].sum()
+    assert_allclose(stat, ref)
+
+
+def test_wstat_sum_cython(test_data, reference_values):
+    stat = stats.wstat_sum_cython(
+        n_on=test_data["n_on"],
+        n_off=test_data["n_off"],
+        alpha=test_data["alpha"],
+        mu_sig=test_data["mu_sig"],
+    )
+    assert_allclose(stat, np.sum(reference_values["wstat"]))
+
+    mask = np.array(test_data["n_off"]) > 4
+    stat = stats.wstat_sum_cython(
+        n_on=test_data["n_on"],
+        n_off=test_data["n_off"],
+        alpha=0.2,
+        mu_sig=test_data["mu_sig"],
+        mask=mask,
+    )
+    ref = stats.wstat(
+        n_on=test_data["n_on"],
+        n_off=test_data["n_off"],
+        alpha=0.2,
+        mu_sig=test_data["mu_sig"],
+    )
+    assert_allclose(stat, ref[mask].sum())
+
+
+def test_stat_sum_cython_parallel():
+    # large enough to use the parallel loops
+    random_state = np.random.RandomState(0)
+    mu_sig = random_state.uniform(0, 5, size=(10, 100, 300))
+    n_on = random_state.poisson(mu_sig + 1)
+    n_off = random_state.poisson(5, size=mu_sig.shape)
+    mask = random_state.uniform(size=mu_sig.shape) > 0.3
+
+    stat = stats.cash_sum_cython(n_on, mu_sig, mask=mask)
+    assert_allclose(stat, stats.cash(n_on, mu_sig)[mask].sum())
+
+    stat = stats.cstat_sum_cython(n_on, mu_sig, mask=mask)
+    assert_allclose(stat, stats.cstat(n_on, mu_sig)[mask].sum())
+
+    stat = stats.wstat_sum_cython(n_on, n_off, 0.2, mu_sig, mask=mask)
+    ref = stats.wstat(n_on, n_off, 0.2, mu_sig)
+    assert_allclose(stat, np.nan_to_num(ref)[mask].sum())
+
+
+def test_cash_derivative(test_data):
+    n_on = np.array(test_data["n_on"], dtype=float)
+    mu_sig = np.array(test_data["mu_sig"], dtype=float)
+    eps = 1e-6
+
+    actual = stats.cash_derivative(n_on=n_on, mu_on=mu_sig)
+    desired = stats.cash(n_on, mu_sig + eps) - stats.cash(n_on, mu_sig - eps)
+    assert_allclose(actual, desired / (2 * eps), rtol=1e-5)
+
+    assert_allclose(stats.cash_derivative(n_on=[1, 0], mu_on=[0, 0]), 0)
+
+
+def test_wstat_derivative(test_data):
+    kwargs = {
+        "n_on": np.array(test_data["n_on"], dtype=float),
+        "n_off": np.array(test_data["n_off"], dtype=float),
+        "alpha": np.array(test_data["alpha"], dtype=float),
+    }
+    mu_sig = np.array(test_data["mu_sig"], dtype=float)
+    eps = 1e-6
+
+    actual = stats.wstat_derivative(mu_sig=mu_sig, **kwargs)
+    desired = stats.wstat(mu_sig=mu_sig + eps, **kwargs)
+    desired -= stats.wstat(mu_sig=mu_sig - eps, **kwargs)
+    assert_allclose(actual, desired / (2 * eps), rtol=1e-5)
+
+    # n_off = 0 and mu_sig < n_on * (alpha / alpha + 1)
+    actual = stats.wstat_derivative(n_on=9, n_off=0, alpha=0.5, mu_sig=2.3)
+    assert_allclose(actual, -2 / 0.5)
+
+
 def test_wstat_corner_cases():
     """test WSTAT formulae for corner cases"""
     n_on = 0
@@ -0,0 +1,204 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+"""Caching utility functions and classes."""
+import threading
+from collections import OrderedDict
+import numpy as np
+from astropy.table import Table
+
+__all__ = ["LRUCache", "sizeof"]
+
+
+def sizeof(obj, _seen=None):
+    """Approximate memory size of an object in bytes.
+
+    Uses the ``nbytes`` attribute of arrays and quantities and sums over the
+    items of containers and the attributes of other objects. Objects without
+    any arrays count as zero bytes.
+
+    Parameters
+    ----------
+    obj : object
+        Object.
+
+    Returns
+    -------
+    nbytes : int
+        Size in bytes.
+    """
+    # objects referenced more than once are only counted once
+    _seen = set() if _seen is None else _seen
+    if id(obj) in _seen:
+        return 0
+    _seen.add(id(obj))
+
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, (int, np.integer)):
+        return int(nbytes)
+
+    if isinstance(obj, dict):
+        values = obj.values()
+    elif isinstance(obj, (list, tuple)):
+        values = obj
+    elif hasattr(obj, "__dict__") and not isinstance(obj, type):
+        values = vars(obj).values()
+    else:
+        return 0
+
+    return sum(sizeof(value, _seen) for value in values)
+
+
+class LRUCache:
+    """Least recently used cache with hit and miss statistics.
+
+    Keeps up to ``max_size`` objects, when a new object is added to a full
+    cache, the least recently used one is evicted. Optionally the total size
+    of the cached objects is limited to ``max_bytes``. The cached objects are
+    shared between all callers and should be treated as read-only.
+
+    The cache can be used from several threads. The lock is not held while an
+    object is computed, so concurrent misses for the same key compute the
+    object more than once and the last one is kept.
+
+    Parameters
+    ----------
+    max_size : int or None
+        Maximum number of cached objects. Use 0 to disable caching and None
+        to not limit the number of objects.
+    max_bytes : int
+        Maximum total size of the cached objects in bytes, as computed by
+        `sizeof`. By default the size is not limited.
+
+    Examples
+    --------
+    ::
+
+        from gammapy.utils.cache import LRUCache
+
+        cache = LRUCache(max_size=2)
+        value = cache.get("key", lambda: 42)
+        print(cache)
+    """
+
+    def __init__(self, max_size=128, max_bytes=None):
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.clear()
+
+    def __str__(self):
+        entries = f"{len(self._data)}"
+        if self.max_size is not None:
+            entries += f" / {self.max_size}"
+
+        ss = (
+            f"{self.__class__.__name__}\n\n"
+            f"\tentries  : {entries}\n"
+            f"\thits     : {self.hits}\n"
+            f"\tmisses   : {self.misses}\n"
+        )
+        if self.max_bytes is not None:
+            ss += f"\tnbytes   : {self.nbytes} / {self.max_bytes}\n"
+        return ss
+
+    def __getstate__(self):
+        # cached objects are not copied or pickled, they are re-computed
+        # on demand
+        return {"max_size": self.max_size, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @property
+    def nbytes(self):
+        """Total size of the cached objects in bytes."""
+        return self._total_nbytes
+
+    def keys(self):
+        """Keys of the cached objects, from least to most recently used."""
+        with self._lock:
+            return list(self._data.keys())
+
+    def to_table(self):
+        """Summary table of the cached objects.
+
+        Returns
+        -------
+        table : `~astropy.table.Table`
+            Table with columns "key", "type" and "nbytes", ordered from least
+            to most recently used.
+        """
+        with self._lock:
+            rows = [
+                (str(key), type(value).__name__, self._nbytes[key])
+                for key, value in self._data.items()
+            ]
+        return Table(
+            rows=rows, names=["key", "type", "nbytes"], dtype=[str, str, np.int64]
+        )
+
+    def clear(self):
+        """Remove all cached objects and reset the counters."""
+        with self._lock:
+            self._data = OrderedDict()
+            self._nbytes = {}
+            self._total_nbytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def get(self, key, compute):
+        """Get cached object, compute and cache it if it is missing.
+
+        Parameters
+        ----------
+        key : hashable
+            Key of the object.
+        compute : callable
+            Function without arguments computing the object.
+
+        Returns
+        -------
+        value : object
+            Cached or computed object.
+        """
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+
+            self.misses += 1
+
+        value = compute()
+
+        if self.max_size != 0:
+            nbytes = sizeof(value)
+            with self._lock:
+                if key in self._data:
+                    # computed concurrently by another thread
+                    self._total_nbytes -= self._nbytes[key]
+                self._data[key] = value
+                self._data.move_to_end(key)
+                self._nbytes[key] = nbytes
+                self._total_nbytes += nbytes
+                self._evict()
+
+        return value
+
+    def _evict(self):
+        # must be called with the lock held
+        while self._is_over_limit():
+            key, _ = self._data.popitem(last=False)
+            self._total_nbytes -= self._nbytes.pop(key)
+
+    def _is_over_limit(self):
+        if self.max_size is not None and len(self._data) > self.max_size:
+            return True
+        return (
+            self.max_bytes is not None and self._data and self.nbytes > self.max_bytes
+        )
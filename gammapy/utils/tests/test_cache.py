@@ -0,0 +1,97 @@
+# Licensed under a 3-clause BSD style license - see LICENSE.rst
+import pickle
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from gammapy.utils.cache import LRUCache, sizeof
+
+
+def test_lru_cache():
+    cache = LRUCache(max_size=2)
+
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("b", lambda: 2) == 2
+    assert cache.get("a", lambda: 3) == 1
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+    # "b" is the least recently used one
+    assert cache.get("c", lambda: 4) == 4
+    assert cache.keys() == ["a", "c"]
+    assert "b" not in cache
+    assert "entries  : 2 / 2" in str(cache)
+
+    cache = pickle.loads(pickle.dumps(cache))
+    assert len(cache) == 0
+    assert cache.max_size == 2
+
+
+def test_lru_cache_disabled():
+    cache = LRUCache(max_size=0)
+    assert cache.get("a", lambda: 1) == 1
+    assert cache.get("a", lambda: 2) == 2
+    assert len(cache) == 0
+    assert cache.misses == 2
+
+
+def test_lru_cache_max_bytes():
+    cache = LRUCache(max_size=10, max_bytes=200)
+
+    cache.get("a", lambda: np.zeros(10))
+    cache.get("b", lambda: {"x": np.zeros(10), "y": "spam"})
+    assert cache.nbytes == 160
+    assert "nbytes   : 160 / 200" in str(cache)
+
+    # "a" is evicted to stay within the budget
+    cache.get("c", lambda: np.zeros(6))
+    assert cache.keys() == ["b", "c"]
+    assert cache.nbytes == 128
+
+    # objects larger than the budget are not kept
+    value = cache.get("d", lambda: np.zeros(100))
+    assert value.shape == (100,)
+    assert len(cache) == 0
+    assert cache.nbytes == 0
+
+    table = cache.to_table()
+    assert len(table) == 0
+    assert table.colnames == ["key", "type", "nbytes"]
+
+
+def test_lru_cache_max_size_none():
+    cache = LRUCache(max_size=None, max_bytes=80)
+    for key in range(100):
+        cache.get(key, lambda: key)
+    assert len(cache) == 100
+    assert "entries  : 100\n" in str(cache)
+
+    cache.get("a", lambda: np.zeros(10))
+    assert cache.nbytes == 80
+    cache.get("b", lambda: np.zeros(1))
+    assert cache.keys()[-1] == "b"
+    assert "a" not in cache
+
+
+def test_lru_cache_threads():
+    cache = LRUCache(max_size=5, max_bytes=400)
+
+    def get(idx):
+        key = idx % 8
+        return cache.get(key, lambda: np.full(key + 1, key, dtype=float))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        values = list(executor.map(get, range(2000)))
+
+    for idx, value in enumerate(values):
+        assert value[0] == idx % 8
+
+    assert cache.hits + cache.misses == 2000
+    assert len(cache) <= 5
+    assert cache.nbytes <= 400
+    assert cache.nbytes == sum(cache.to_table()["nbytes"])
+
+
+def test_sizeof():
+    data = np.zeros(10)
+    assert sizeof(data) == 80
+    assert sizeof([data, data, (data.copy(), 1)]) == 160
+    assert sizeof("spam") == 0
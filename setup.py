@@ -16,19 +16,27 @@ from distutils.extension import Extension
 import numpy as np
 
 
-def make_cython_extension(filename):
+def make_cython_extension(filename, openmp=False):
+    kwargs = {}
+    # OpenMP is only enabled where the default compiler supports it, without
+    # it the parallel loops of the extension run serially
+    if openmp and sys.platform.startswith("linux"):
+        kwargs["extra_compile_args"] = ["-fopenmp"]
+        kwargs["extra_link_args"] = ["-fopenmp"]
+
     return Extension(
         filename.strip(".pyx").replace("/", "."),
         [filename],
         include_dirs=[np.get_include()],
+        **kwargs,
     )
 
 
-cython_files = [
-    "gammapy/detect/_test_statistics_cython.pyx",
-    "gammapy/stats/fit_statistics_cython.pyx",
-]
-
-ext_modules = cythonize([make_cython_extension(_) for _ in cython_files])
+ext_modules = cythonize(
+    [
+        make_cython_extension("gammapy/detect/_test_statistics_cython.pyx"),
+        make_cython_extension("gammapy/stats/fit_statistics_cython.pyx", openmp=True),
+    ]
+)
 
 setuptools.setup(use_scm_version=True, ext_modules=ext_modules)